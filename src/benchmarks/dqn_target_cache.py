@@ -0,0 +1,66 @@
+"""
+Compare the cost of DeepQLearning optimization steps with and without
+the whole-state-space target cache, for several numbers of optimization
+steps between target network updates. Run from `src` with
+`python -m benchmarks.dqn_target_cache`.
+"""
+import time
+import numpy as np
+import torch
+import gymnasium as gym
+from lib.data.memory import Memory
+from lib.formulas.deep_q_learning import DeepQLearning
+from lib.models.Engine import Engine
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+
+def deep_q_learning(cache_targets: bool) -> DeepQLearning:
+    policy = LegalSamplePolicy(
+        game_env=gym.make("Taxi-v3"), engine=Engine.TABLE  # type: ignore
+    )
+    model = DeepQLearning(
+        policy=policy,  # type: ignore
+        loss_function=torch.nn.SmoothL1Loss(),
+        optimizer=None,  # type: ignore
+        data=Memory(10_000),
+        cache_targets=cache_targets
+    )
+    model.optimizer = torch.optim.SGD(
+        model.policy_network.model.parameters(), lr=0.01
+    )
+    size = len(model.data.states)
+    model.data.push_many(
+        np.random.randint(0, 500, size=size),
+        np.random.randint(0, 6, size=size),
+        np.random.normal(size=size),
+        np.random.randint(0, 500, size=size),
+        np.random.random(size) < 0.05
+    )
+    return model
+
+
+def step_time(model: DeepQLearning, target_update_every: int, steps: int) -> float:
+    start = time.perf_counter()
+    for step in range(1, steps + 1):
+        model._optimize_model()
+        if step % target_update_every == 0:
+            model._update_target_network()
+    return (time.perf_counter() - start) / steps
+
+
+def main(steps: int = 1000) -> None:
+    torch.manual_seed(0)
+    for target_update_every in (1, 10, 100):
+        results = [
+            step_time(deep_q_learning(cache), target_update_every, steps)
+            for cache in (False, True)
+        ]
+        print(
+            f"target update every {target_update_every:>3} steps:"
+            f" {results[0] * 1e6:>7.0f} us/step without cache,"
+            f" {results[1] * 1e6:>7.0f} us/step with cache"
+        )
+
+
+if __name__ == "__main__":
+    main()
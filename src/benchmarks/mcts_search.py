@@ -0,0 +1,104 @@
+"""
+Compare the returns and the number of simulated transitions per
+decision of the breadth-first MonteCarloPolicy and of the UCT/PUCT
+MonteCarloTreeSearchPolicy, the prior being a Q-Table computed by a few
+sweeps of value iteration. The greedy policy of each prior is played
+alone as a reference. Run from `src` with
+`python -m benchmarks.mcts_search`.
+
+Plain UCT simulates 16k to 60k transitions per decision, against about
+47 for the breadth-first search, for a lower return. PUCT only needs
+fewer transitions than the breadth-first search with a solver-derived
+prior. Over 12 sweeps, whose greedy policy returns -94.7, it returns
+5.75 with 20 transitions against 7.35 with 47 at depth 8.
+"""
+import random
+import time
+import numpy as np
+import gymnasium as gym
+from typing import Callable
+from lib.formulas.distillation import Distillation
+from lib.formulas.dynamic_programming import DynamicProgramming
+from lib.formulas.monte_carlo_tree_seach import MonteCarloTreeSearchFormula
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.models.Metrics import SearchMetrics
+from lib.policies.DistilledPolicy import DistilledPolicy
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+from lib.policies.MonteCarloTreeSearchPolicy import MonteCarloTreeSearchPolicy
+
+
+def play(make_policy: Callable, seeds: int) -> dict:
+    returns, visited = [], []
+    decisions = 0
+    start = time.perf_counter()
+    for seed in range(1, seeds + 1):
+        random.seed(seed)
+        policy = make_policy(seed)
+        total = 0.0
+        for _ in range(200):
+            result = policy.next_action()
+            total += result.reward
+            decisions += 1
+            visited.append(policy.search_metrics.visited_node)
+            if result.game_status is not GameStatus.RUNNING:
+                break
+        returns.append(total)
+    return {
+        "return": float(np.mean(returns)),
+        "visited": float(np.mean(visited)),
+        "latency": (time.perf_counter() - start) / decisions
+    }
+
+
+def greedy(q_table, seed: int) -> DistilledPolicy:
+    policy = Distillation(
+        gym.make("Taxi-v3"), engine=Engine.TABLE  # type: ignore
+    ).from_q_table(q_table)
+    policy.seed = seed
+    policy.reset_hyperparameters(reset_env=True)
+    policy.search_metrics = SearchMetrics(  # type: ignore
+        depth=0, visited_node=0, elapsed=0.0, interrupted=False
+    )
+    return policy
+
+
+def main(seeds: int = 20) -> None:
+    env = gym.make("Taxi-v3")
+    candidates = {
+        f"BFS depth {depth}": lambda seed, depth=depth: MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=depth, seed=seed,  # type: ignore
+            engine=Engine.TABLE
+        )
+        for depth in (8, 12)
+    }
+    for iterations in (200, 1000):
+        candidates[f"UCT {iterations} iterations"] = \
+            lambda seed, iterations=iterations: MonteCarloTreeSearchPolicy(
+                gym.make("Taxi-v3"), iterations=iterations,  # type: ignore
+                seed=seed, engine=Engine.TABLE
+            )
+    for sweeps in (12, 14):
+        solver = DynamicProgramming(env, gamma=0.95, max_iterations=sweeps)  # type: ignore
+        solver.value_iteration()
+        candidates[f"Greedy prior {sweeps} sweeps"] = \
+            lambda seed, q=solver.data: greedy(q, seed)
+        for iterations in (10, 25):
+            candidates[f"PUCT {sweeps} sweeps {iterations} iterations"] = \
+                lambda seed, q=solver.data, iterations=iterations: \
+                MonteCarloTreeSearchPolicy(
+                    gym.make("Taxi-v3"), iterations=iterations,  # type: ignore
+                    data=q, rollout=MonteCarloTreeSearchFormula.Rollout.VALUE,
+                    rollout_depth=20, seed=seed, engine=Engine.TABLE
+                )
+    for name, make_policy in candidates.items():
+        result = play(make_policy, seeds)
+        print(
+            f"{name:<30}: return {result['return']:>7.2f},"
+            f" {result['visited']:>8.0f} transitions/decision,"
+            f" {result['latency'] * 1e3:>6.2f} ms/decision"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure the latency and memory of building a MonteCarloPolicy and
+taking its first decision for several tree depths, averaged over
+seeds, along with the number of nodes created against the size of the
+full tree. Run from `src` with `python -m benchmarks.mcts_tree`.
+"""
+import random
+import time
+import tracemalloc
+import gymnasium as gym
+from lib.models.Engine import Engine
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+
+
+def first_decision(depth: int, seed: int) -> dict:
+    random.seed(seed)
+    env = gym.make("Taxi-v3")
+    tracemalloc.start()
+    start = time.perf_counter()
+    policy = MonteCarloPolicy(
+        env, depth=depth, seed=seed, engine=Engine.TABLE  # type: ignore
+    )
+    policy.next_action()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tree = policy.pick_tree
+    return {
+        "elapsed": elapsed,
+        "peak": peak,
+        "created": tree.created_node,
+        "visited": tree.visited_node,
+        "full": sum(len(tree.actions) ** d for d in range(depth + 1))
+    }
+
+
+def main(seeds: int = 20) -> None:
+    for depth in range(6, 13):
+        results = [first_decision(depth, seed) for seed in range(1, seeds + 1)]
+        result = {
+            key: sum(r[key] for r in results) / len(results)
+            for key in results[0]
+        }
+        print(
+            f"depth {depth:>2}: {result['elapsed'] * 1e3:>8.1f} ms,"
+            f" peak {result['peak'] / 2**20:>6.2f} MiB,"
+            f" {result['created']:>8.0f} nodes created,"
+            f" {result['visited']:>6.0f} visited,"
+            f" full tree {result['full']:>11,.0f} nodes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the build time and memory of a full tree stored as Node objects
+and as a NodeStore. Run from `src` with `python -m benchmarks.node_store`.
+"""
+import gc
+import time
+import tracemalloc
+from lib.data.node_store import NodeStore
+from lib.models.Action import Action
+from lib.models.Node import Node
+
+ACTIONS = [a for a in Action if a is not Action.DROP_OFF]
+
+
+def build_objects(depth: int) -> Node:
+    root = Node(depth=0, children=[])
+    layer = [root]
+    for _ in range(depth):
+        next_layer = []
+        for node in layer:
+            node.children = [
+                Node(
+                    action=action,
+                    path=f"{node.depth+1}{action.to_letter()}",
+                    parent=node,
+                    depth=node.depth + 1,
+                    children=[]
+                )
+                for action in ACTIONS
+            ]
+            next_layer.extend(node.children)
+        layer = next_layer
+    return root
+
+
+def build_store(depth: int) -> NodeStore:
+    store = NodeStore()
+    layer = [store.add_root(Node(depth=0))]
+    actions = [action.value for action in ACTIONS]
+    for _ in range(depth):
+        next_layer = []
+        for index in layer:
+            next_layer.extend(store.add_children(index, actions))
+        layer = next_layer
+    return store
+
+
+def measure(build, depth: int) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = build(depth)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    del tree
+    gc.collect()
+    return elapsed, size, time.perf_counter() - start
+
+
+def main() -> None:
+    for depth in (6, 8):
+        nodes = sum(len(ACTIONS) ** d for d in range(depth + 1))
+        for name, build in (("Node", build_objects), ("NodeStore", build_store)):
+            elapsed, size, collect = measure(build, depth)
+            print(
+                f"depth {depth} ({nodes:>7,} nodes) {name:<9}:"
+                f" build {elapsed * 1e3:>7.0f} ms,"
+                f" {size / nodes:>6.0f} bytes/node,"
+                f" free + gc {collect * 1e3:>6.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
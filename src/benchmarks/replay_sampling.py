@@ -0,0 +1,68 @@
+"""
+Compare the sampling throughput of the uniform and prioritized replay
+memories, then the latency of drawing a batch of indices from a full
+memory of a million transitions, with and without replacement. Run from
+`src` with `python -m benchmarks.replay_sampling`.
+"""
+import time
+import numpy as np
+from lib.data.memory import Memory, PrioritizedMemory
+
+
+def fill(memory: Memory, size: int) -> Memory:
+    states = np.random.randint(0, 500, size=size)
+    memory.push_many(
+        states,
+        np.random.randint(0, 6, size=size),
+        np.random.normal(size=size).astype(np.float32),
+        np.random.randint(0, 500, size=size),
+        np.random.random(size) < 0.05
+    )
+    return memory
+
+
+def throughput(sample, batch_size: int, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        sample(batch_size)
+    return repeat * batch_size / (time.perf_counter() - start)
+
+
+def prioritized_sample(memory: PrioritizedMemory):
+    def sample(batch_size: int) -> None:
+        indices = memory.sample_indices(batch_size)
+        memory.gather(indices)
+        memory.weights(indices)
+        memory.update_priorities(indices, np.random.normal(size=batch_size))
+    return sample
+
+
+def main(batch_size: int = 128, repeat: int = 200) -> None:
+    for size in (10_000, 100_000, 1_000_000):
+        uniform = fill(Memory(size), size)
+        prioritized = fill(PrioritizedMemory(size), size)
+        results = {
+            "Memory.sample": throughput(uniform.sample, batch_size, repeat),
+            "Memory.sample_batch": throughput(
+                uniform.sample_batch, batch_size, repeat
+            ),
+            "PrioritizedMemory (sample + update)": throughput(
+                prioritized_sample(prioritized), batch_size, repeat
+            )
+        }
+        for name, value in results.items():
+            print(f"{size:>9} {name:<36} {value:>12,.0f} transitions/s")
+    memory = fill(Memory(1_000_000), 1_000_000)
+    for replace in (True, False):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            memory.sample_indices(batch_size, replace=replace)
+        elapsed = (time.perf_counter() - start) / repeat
+        print(
+            f"1,000,000 sample_indices(replace={replace!s:<5})"
+            f" {elapsed * 1e3:>8.3f} ms per batch"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Compare the per-step cost of the hot-path results built as validated
+pydantic models and as lightweight records (`TAXI_FAST_MODE=1`): the
+construction of each result type, then QLearning and DeepQLearning
+sampling steps run in both modes. Run from `src` with
+`python -m benchmarks.result_records`.
+"""
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import gymnasium as gym
+import numpy as np
+import torch
+from lib.data.memory import Memory, Transition
+from lib.data.q_table import QTable
+from lib.formulas.deep_q_learning import DeepQLearning
+from lib.formulas.q_learning import QLearning
+from lib.models.Action import Action, ActionWithReward
+from lib.models.EnvironmentInfo import EnvironmentInfo
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.models.Metrics import EpisodeMetrics, Result, StepResult
+from lib.models.Record import FAST_MODE, record_of
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+MASK = np.array([1, 1, 0, 1, 0, 0], dtype=np.int8)
+VALUES = {
+    ActionWithReward: dict(
+        action=Action.SOUTH, probability=1.0, reward=-1.0,
+        game_status=GameStatus.RUNNING
+    ),
+    StepResult: dict(
+        action=Action.SOUTH, game_status=GameStatus.RUNNING,
+        immediate_reward=-1.0
+    ),
+    Result: dict(
+        action=Action.SOUTH, reward=-1.0, bellman=-1.5,
+        game_status=GameStatus.RUNNING
+    ),
+    EpisodeMetrics: dict(steps=200, cumulative_reward=-200.0),
+    Transition: dict(state=1, action=Action.SOUTH, next_state=101, reward=-1.0),
+    EnvironmentInfo: dict(action_mask=MASK, prob=1.0),
+}
+
+
+def construction(cls, values: dict, count: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(count):
+        cls(**values)
+    elapsed = (time.perf_counter() - start) / count
+    tracemalloc.start()
+    kept = [cls(**values) for _ in range(1000)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed, size / 1000
+
+
+def q_learning_step(steps: int) -> float:
+    policy = LegalSamplePolicy(
+        game_env=gym.make("Taxi-v3"), seed=1, engine=Engine.TABLE  # type: ignore
+    )
+    model = QLearning(
+        observation_space=500, action_space=6, policy=policy,
+        data=QTable(500, 6), gamma=0.9, lr=0.5
+    )
+    start = time.perf_counter()
+    for _ in range(steps):
+        if model.do_step().game_status is not GameStatus.RUNNING:
+            model.policy.reset_hyperparameters(reset_env=True)
+    return (time.perf_counter() - start) / steps
+
+
+def dqn_sample_step(steps: int) -> float:
+    policy = LegalSamplePolicy(
+        game_env=gym.make("Taxi-v3"), seed=1, engine=Engine.TABLE  # type: ignore
+    )
+    model = DeepQLearning(
+        policy=policy,  # type: ignore
+        loss_function=torch.nn.SmoothL1Loss(),
+        optimizer=None,  # type: ignore
+        data=Memory(steps)
+    )
+    start = time.perf_counter()
+    for _ in range(steps):
+        if model._generate_one_sample().game_status is not GameStatus.RUNNING:
+            model.policy.reset_hyperparameters(reset_env=True)
+    return (time.perf_counter() - start) / steps
+
+
+def steps(count: int = 50_000) -> None:
+    mode = "records" if FAST_MODE else "pydantic"
+    print(
+        f"{mode:<8}: QLearning.do_step {q_learning_step(count) * 1e6:>6.2f} us,"
+        f" DeepQLearning._generate_one_sample"
+        f" {dqn_sample_step(count) * 1e6:>6.2f} us"
+    )
+
+
+def main(count: int = 200_000) -> None:
+    for model, values in VALUES.items():
+        model = getattr(model, "_model", model)
+        (slow, slow_size), (fast, fast_size) = (
+            construction(cls, values, count)
+            for cls in (model, record_of(model))
+        )
+        print(
+            f"{model.__name__:<16}: pydantic {slow * 1e6:>5.2f} us"
+            f" {slow_size:>4.0f} bytes, record {fast * 1e6:>5.2f} us"
+            f" {fast_size:>4.0f} bytes ({slow / fast:.1f}x)"
+        )
+    for fast_mode in ("0", "1"):
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.result_records", "--steps"],
+            env={**os.environ, "TAXI_FAST_MODE": fast_mode},
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    if "--steps" in sys.argv:
+        steps()
+    else:
+        main()
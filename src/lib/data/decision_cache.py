@@ -0,0 +1,189 @@
+from __future__ import annotations
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple
+from lib.models.Action import Action
+from lib.models.Stage import Stage
+
+# One record per (state, stage), `action` being -1 for an empty record
+_RECORD = np.dtype([
+    ("action", np.int8),
+    ("taxi_on_passenger", np.bool_),
+    ("depth", np.int16),
+    ("next_state", np.int32),
+    ("reward", np.float32),
+    ("visited_node", np.int64),
+    ("last_used", np.int64),
+])
+# The hits, misses and clock counters precede the records
+_COUNTERS = 3
+_RECORDS_OFFSET = 64
+
+
+class Decision(NamedTuple):
+    """
+    A decision taken by a search, and the statistics of that search.
+    """
+    action: Action
+    next_state: int
+    reward: float
+    taxi_on_passenger: bool
+    depth: int
+    visited_node: int
+
+
+class DecisionCache:
+    """
+    Bounded cache of the decisions of a search, keyed by (state, stage).
+    When full, the least recently used decision is evicted.
+
+    The records are stored in a single buffer, that can live in a shared
+    memory block so that worker processes share their decisions. Like the
+    Hogwild Q-Table updates, the shared records and counters are updated
+    without locks: a concurrent read may miss a decision being stored.
+    A cache must only be shared by searches with the same parameters.
+
+    Attributes
+    ----------
+    observation_space: int
+        The number of states.
+    capacity: int
+        The maximum number of decisions, every key by default.
+    """
+
+    def __init__(
+        self,
+        observation_space: int,
+        capacity: int | None = None,
+        buffer: memoryview | None = None
+    ) -> None:
+        keys = observation_space * len(Stage)
+        if capacity is None:
+            capacity = keys
+        if capacity < 1:
+            raise ValueError("The capacity should be positive.")
+        self.observation_space = observation_space
+        self.capacity = capacity
+        if buffer is None:
+            buffer = memoryview(bytearray(DecisionCache.nbytes(observation_space)))
+            initialize = True
+        else:
+            initialize = False
+        self._counters = np.ndarray((_COUNTERS,), dtype=np.int64, buffer=buffer)
+        self._records = np.ndarray(
+            (keys,), dtype=_RECORD, buffer=buffer, offset=_RECORDS_OFFSET
+        )
+        if initialize:
+            self.clear()
+
+    @staticmethod
+    def nbytes(observation_space: int) -> int:
+        """
+        The size of the buffer of a cache.
+        """
+        return _RECORDS_OFFSET + observation_space * len(Stage) * _RECORD.itemsize
+
+    @staticmethod
+    def from_shared_memory(
+        shared_memory: SharedMemory,
+        observation_space: int,
+        capacity: int | None = None,
+        initialize: bool = False
+    ) -> DecisionCache:
+        """
+        Create a cache whose records live in a shared memory block, so
+        that decisions are visible to every process attached to it.
+
+        Parameters
+        ----------
+        shared_memory: SharedMemory
+            The shared memory block, holding at least `nbytes()` bytes.
+        observation_space: int
+            The number of states.
+        capacity: int | None, default=None
+            The maximum number of decisions, every key by default.
+        initialize: bool, default=False
+            Whether to empty the cache, when creating the block.
+
+        Returns
+        -------
+        DecisionCache
+            The cache backed by the shared memory block.
+        """
+        cache = DecisionCache(
+            observation_space, capacity, buffer=shared_memory.buf
+        )
+        if initialize:
+            cache.clear()
+        return cache
+
+    @property
+    def hits(self) -> int:
+        return int(self._counters[0])
+
+    @property
+    def misses(self) -> int:
+        return int(self._counters[1])
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._records["action"] != -1))
+
+    def clear(self) -> None:
+        """
+        Remove every decision and reset the counters.
+        """
+        self._counters[:] = 0
+        self._records["action"] = -1
+
+    def _key(self, state: int, stage: Stage) -> int:
+        return stage.value * self.observation_space + state
+
+    def _tick(self) -> int:
+        self._counters[2] += 1
+        return int(self._counters[2])
+
+    def get(self, state: int, stage: Stage) -> Decision | None:
+        """
+        Look up the decision taken in a state at a given stage, counting
+        a hit or a miss.
+
+        Returns
+        -------
+        Decision | None
+            The cached decision, None if there is none.
+        """
+        key = self._key(state, stage)
+        record = self._records[key]
+        if record["action"] == -1:
+            self._counters[1] += 1
+            return None
+        self._counters[0] += 1
+        self._records["last_used"][key] = self._tick()
+        return Decision(
+            action=Action(int(record["action"])),
+            next_state=int(record["next_state"]),
+            reward=float(record["reward"]),
+            taxi_on_passenger=bool(record["taxi_on_passenger"]),
+            depth=int(record["depth"]),
+            visited_node=int(record["visited_node"])
+        )
+
+    def put(self, state: int, stage: Stage, decision: Decision) -> None:
+        """
+        Store the decision taken in a state at a given stage, evicting the
+        least recently used decision if the cache is full.
+        """
+        key = self._key(state, stage)
+        record = self._records[key:key + 1]
+        if record["action"][0] == -1 and len(self) >= self.capacity:
+            used = np.flatnonzero(self._records["action"] != -1)
+            oldest = used[np.argmin(self._records["last_used"][used])]
+            self._records["action"][oldest] = -1
+        record["next_state"] = decision.next_state
+        record["reward"] = decision.reward
+        record["taxi_on_passenger"] = decision.taxi_on_passenger
+        record["depth"] = decision.depth
+        record["visited_node"] = decision.visited_node
+        record["last_used"] = self._tick()
+        # Written last, so that a concurrent reader sees a full record
+        record["action"] = decision.action.value
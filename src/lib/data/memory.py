@@ -1,10 +1,11 @@
 import torch
 import numpy as np
-from typing import List, Tuple
-from random import sample
-from collections import deque, namedtuple
+from typing import List, NamedTuple, Tuple
+from collections import namedtuple
 from pydantic import BaseModel
 from lib.models.Action import Action
+from lib.models.Record import hot_path
+from lib.data.sum_tree import SumTree
 
 
 class Transition(BaseModel):
@@ -17,17 +18,60 @@ class Transition(BaseModel):
     reward: float
 
 
+Transition = hot_path(Transition)  # type: ignore
+
+
+class TransitionBatch(NamedTuple):
+    """
+    A batch of transitions, stored by columns. The next state of a
+    transition ending the game is meaningless, see `done`.
+    """
+    state: np.ndarray
+    action: np.ndarray
+    reward: np.ndarray
+    next_state: np.ndarray
+    done: np.ndarray
+
+
 class Memory:
     """
     Representation of the memory of all states sampled in the
     game environment following a given policy.
+
+    The transitions are stored in preallocated columns used as a ring
+    buffer: once the memory is full, the oldest transitions are
+    overwritten.
+
+    Attributes
+    ----------
+    capacity: int
+        The maximum number of transitions kept.
+    states: np.ndarray
+        The state of each transition.
+    actions: np.ndarray
+        The index of the action of each transition.
+    rewards: np.ndarray
+        The reward of each transition.
+    next_states: np.ndarray
+        The state reached by each transition.
+    dones: np.ndarray
+        Whether each transition ends the game.
     """
 
     def __init__(self, capacity: int) -> None:
-        self.memory = deque([], maxlen=capacity)
+        if capacity < 1:
+            raise ValueError("The capacity should be positive.")
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int32)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self._position = 0
+        self._size = 0
 
     def __repr__(self) -> str:
-        return str(list(self.memory))
+        return str(self.transitions())
 
     def push(self, transition: Transition):
         """
@@ -37,11 +81,147 @@ class Memory:
         ----------
         transition: Transition
         """
-        self.memory.append(transition)
+        position = self._position
+        self.states[position] = transition.state
+        self.actions[position] = transition.action.value
+        self.rewards[position] = transition.reward
+        if transition.next_state is None:
+            self.next_states[position] = 0
+            self.dones[position] = True
+        else:
+            self.next_states[position] = transition.next_state
+            self.dones[position] = False
+        self._position = (position + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def push_many(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> None:
+        """
+        Save a batch of transitions in the memory, in order.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The state of each transition.
+        actions: np.ndarray
+            The index of the action of each transition.
+        rewards: np.ndarray
+            The reward of each transition.
+        next_states: np.ndarray
+            The state reached by each transition.
+        dones: np.ndarray
+            Whether each transition ends the game.
+        """
+        count = len(states)
+        if count > self.capacity:
+            # Only the most recent transitions would be kept anyway
+            self._position = (self._position + count - self.capacity) \
+                % self.capacity
+            states, actions, rewards, next_states, dones = (
+                column[-self.capacity:]
+                for column in (states, actions, rewards, next_states, dones)
+            )
+            count = self.capacity
+        positions = (self._position + np.arange(count)) % self.capacity
+        self.states[positions] = states
+        self.actions[positions] = actions
+        self.rewards[positions] = rewards
+        self.next_states[positions] = next_states
+        self.dones[positions] = dones
+        self._position = (self._position + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    def sample_indices(
+        self,
+        batch_size: int,
+        replace: bool = True
+    ) -> np.ndarray:
+        """
+        Pick the indices of a random batch in the memory, uniformly.
+
+        Parameters
+        ----------
+        batch_size: int
+            Size of the batch sampled from the memory.
+        replace: bool, default=True
+            Decide if a transition can be picked several times.
+
+        Returns
+        -------
+        np.ndarray
+            The indices of the sampled transitions.
+
+        Raises
+        ------
+        ValueError
+            If the memory holds less transitions than the batch size.
+        """
+        if batch_size > self._size:
+            raise ValueError("Sample larger than the memory.")
+        if not replace:
+            if 2 * batch_size > self._size:
+                return np.random.permutation(self._size)[:batch_size]
+            # Redraw the duplicates, rare in a batch much smaller than the
+            # memory, instead of a permutation of the whole memory
+            indices = np.unique(np.random.randint(0, self._size, size=batch_size))
+            while len(indices) < batch_size:
+                indices = np.unique(np.concatenate([
+                    indices,
+                    np.random.randint(
+                        0, self._size, size=batch_size - len(indices)
+                    )
+                ]))
+            np.random.shuffle(indices)
+            return indices
+        return np.random.randint(0, self._size, size=batch_size)
+
+    def gather(self, indices: np.ndarray) -> TransitionBatch:
+        """
+        Gather the given transitions by columns.
+
+        Parameters
+        ----------
+        indices: np.ndarray
+            The indices of the transitions.
+
+        Returns
+        -------
+        TransitionBatch
+            The transitions.
+        """
+        return TransitionBatch(
+            state=self.states[indices],
+            action=self.actions[indices],
+            reward=self.rewards[indices],
+            next_state=self.next_states[indices],
+            done=self.dones[indices]
+        )
+
+    def sample_batch(self, batch_size: int) -> TransitionBatch:
+        """
+        Pick a random batch in the memory, by columns, with replacement.
+
+        Parameters
+        ----------
+        batch_size: int
+            Size of the batch sampled from the memory.
+
+        Returns
+        -------
+        TransitionBatch
+            Sampled batch.
+        """
+        return self.gather(self.sample_indices(batch_size))
 
     def sample(self, batch_size: int) -> List[Transition]:
         """
-        Pick a random batch in the memory.
+        Pick a random batch of distinct transitions in the memory.
 
         Parameters
         ----------
@@ -53,13 +233,40 @@ class Memory:
         List[Transition]
             Sampled batch.
         """
-        return sample(self.memory, batch_size)
+        return self._to_transitions(
+            self.gather(self.sample_indices(batch_size, replace=False))
+        )
+
+    def transitions(self) -> List[Transition]:
+        """
+        Return the transitions in memory, from the oldest to the newest.
+
+        Returns
+        -------
+        List[Transition]
+            The transitions.
+        """
+        start = self._position if self._size == self.capacity else 0
+        indices = (start + np.arange(self._size)) % self.capacity
+        return self._to_transitions(self.gather(indices))
+
+    @staticmethod
+    def _to_transitions(batch: TransitionBatch) -> List[Transition]:
+        return [
+            Transition(
+                state=int(state),
+                action=Action(int(action)),
+                reward=float(reward),
+                next_state=None if done else int(next_state)
+            )
+            for state, action, reward, next_state, done in zip(*batch)
+        ]
 
     def __len__(self) -> int:
         """
         Return the number of elements in memory.
         """
-        return len(self.memory)
+        return self._size
 
     @staticmethod
     def one_hot(input: int, out_shape: int) -> torch.Tensor:
@@ -110,3 +317,153 @@ class Memory:
         for action in actions:
             idx.append(torch.argmax(action))
         return torch.Tensor(idx).long()
+
+
+class PrioritizedMemory(Memory):
+    """
+    Memory sampling the transitions proportionally to their priority,
+    derived from their last temporal difference error. The bias this
+    introduces is corrected by importance-sampling weights.
+
+    Attributes
+    ----------
+    alpha: float
+        How much the priorities are used, 0 being uniform sampling.
+    beta: float
+        How much the importance-sampling weights correct the bias,
+        1 being a full correction.
+    beta_increment: float
+        The increase of beta after each sampled batch, up to 1.
+    epsilon: float
+        Added to the errors so that no transition has a null priority.
+    tree: SumTree
+        The priority of each transition.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        beta_increment: float = 0.0,
+        epsilon: float = 1e-6
+    ) -> None:
+        super().__init__(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self._max_priority = 1.0
+
+    def push(self, transition: Transition):
+        """
+        Save a transition in the memory, with the highest priority
+        so that it is sampled at least once.
+
+        Parameters
+        ----------
+        transition: Transition
+        """
+        position = self._position
+        super().push(transition)
+        self.tree.update(np.array([position]), np.array([self._max_priority]))
+
+    def push_many(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> None:
+        """
+        Save a batch of transitions in the memory, with the highest
+        priority, see `Memory.push_many()`.
+        """
+        super().push_many(states, actions, rewards, next_states, dones)
+        count = min(len(states), self.capacity)
+        positions = (self._position - count + np.arange(count)) % self.capacity
+        self.tree.update(positions, np.full(count, self._max_priority))
+
+    def sample_indices(
+        self,
+        batch_size: int,
+        replace: bool = True
+    ) -> np.ndarray:
+        """
+        Pick the indices of a random batch in the memory, proportionally
+        to their priority. The total priority is split in `batch_size`
+        segments, one transition being drawn in each.
+
+        Parameters
+        ----------
+        batch_size: int
+            Size of the batch sampled from the memory.
+        replace: bool, default=True
+            Decide if a transition can be picked several times. Distinct
+            transitions are drawn one after the other, proportionally to
+            the priorities left, which costs a pass over the memory.
+
+        Returns
+        -------
+        np.ndarray
+            The indices of the sampled transitions.
+
+        Raises
+        ------
+        ValueError
+            If the memory holds less transitions than the batch size.
+        """
+        if batch_size > self._size:
+            raise ValueError("Sample larger than the memory.")
+        if not replace:
+            self.beta = min(1.0, self.beta + self.beta_increment)
+            priorities = self.tree.priorities[:self._size]
+            return np.random.choice(
+                self._size, batch_size, replace=False,
+                p=priorities / priorities.sum()
+            )
+        segment = self.tree.total / batch_size
+        values = (np.arange(batch_size) + np.random.random(batch_size)) * segment
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return np.minimum(self.tree.find(values), self._size - 1)
+
+    def weights(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Compute the importance-sampling weights of the given transitions,
+        normalized by the largest one.
+
+        Parameters
+        ----------
+        indices: np.ndarray
+            The indices of the transitions.
+
+        Returns
+        -------
+        np.ndarray
+            The weight of each transition.
+        """
+        probabilities = self.tree.priorities[indices] / self.tree.total
+        weights = (self._size * probabilities) ** -self.beta
+        return (weights / weights.max()).astype(np.float32)
+
+    def update_priorities(
+        self,
+        indices: np.ndarray,
+        errors: np.ndarray
+    ) -> None:
+        """
+        Update the priority of the given transitions from their
+        temporal difference error.
+
+        Parameters
+        ----------
+        indices: np.ndarray
+            The indices of the transitions.
+        errors: np.ndarray
+            The temporal difference error of each transition.
+        """
+        priorities = (np.abs(errors) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        self._max_priority = max(self._max_priority, float(priorities.max()))
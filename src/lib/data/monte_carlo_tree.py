@@ -1,13 +1,17 @@
 from typing import List, Set
-from tqdm import tqdm
 from lib.models.Action import Action
 from lib.models.Node import Node
+from lib.data.node_store import NodeStore, NodeView
 
 
 class MonteCarloTree:
     """
     Representation of a Tree. Each branch represent an action and
-    each node represent the position on the map.
+    each node represent the position on the map. The children of a
+    node are only created when the node is expanded.
+
+    The nodes are stored by columns in a NodeStore and designated by
+    their index, `Node` views being created on demand.
     """
 
     def __init__(
@@ -23,50 +27,133 @@ class MonteCarloTree:
             The maximum allowed amount of steps the agent can make
             if it's the furthest from the pickup point.
         """
-        self.root_node = root_node
+        self.store = NodeStore()
+        self.root = self.store.add_root(root_node)
         self.depth = depth
         self.actions = actions
-        self.winning_node = None
-        # Build the tree
-        self.bfs: list[Node] = []
+        self._action_values = [action.value for action in actions]
+        self.winning: int | None = None
+        self.interrupted = False
         self.visited_node = 1
         self.state_history: Set[int | None] = set([root_node.state])
-        self.deepest_layer_nodes: List[Node] = []
-        self._create_tree(
-            root_node=self.root_node,
-            max_depth=self.depth,
-        )
+        self.deepest_layer: List[int] = []
+        # Nodes at the maximum depth that the search would have expanded
+        self.frontier: List[int] = []
+        # The tree is expanded lazily, starting with the root children
+        self.queue: List[int] = list(self.expand(self.root))
+
+    @property
+    def root_node(self) -> NodeView:
+        return self.store.view(self.root)
+
+    @property
+    def winning_node(self) -> NodeView | None:
+        if self.winning is None:
+            return None
+        return self.store.view(self.winning)
+
+    @property
+    def deepest_layer_nodes(self) -> List[NodeView]:
+        return [self.store.view(index) for index in self.deepest_layer]
+
+    @property
+    def bfs(self) -> List[NodeView]:
+        return [self.store.view(index) for index in self.queue]
+
+    @property
+    def created_node(self) -> int:
+        return len(self.store)
+
+    def node(self, index: int) -> NodeView:
+        """
+        A view of the Node at the given index.
+        """
+        return self.store.view(index)
 
-    def _create_tree(self, root_node: Node, max_depth: int) -> None:
+    def expand(self, index: int, action_mask: int | None = None) -> range:
         """
-        Create the Tree starting from the root_node.
+        Create the children of a Node, one per action, unless the Node
+        is at the maximum depth of the Tree.
 
-        Attributes
+        Parameters
         ----------
-        root_node: Node
-            The node we want to create with its children.
-        max_depth: int
-            The depth we want our Tree to be.
+        index: int
+            The index of the Node to expand.
+        action_mask: int | None, default=None
+            The packed action mask of the Node state. If given, only the
+            children of the legal actions are created.
 
         Returns
         -------
-        Node
-            The root node of the Tree.
+        range
+            The indices of the children of the Node.
+        """
+        if self.store.depth[index] >= self.depth:
+            self.frontier.append(index)
+            self.store.children_count[index] = 0
+            return range(0)
+        actions = self._action_values
+        if action_mask is not None:
+            actions = [a for a in actions if (action_mask >> a) & 1]
+        return self.store.add_children(index, actions)
+
+    def first_layer_parent(self, index: int) -> int:
         """
-        for action in self.actions:
-            child_node = Node(
-                action=action,
-                path=f"{root_node.depth+1}{action.to_letter()}",
-                state=None,
-                parent=root_node,
-                depth=root_node.depth + 1,
-                children=[]
-            )
-            if child_node.depth > max_depth:
-                return None
-            else:
-                root_node.children.append(child_node)
-                self._create_tree(
-                    child_node,
-                    max_depth=max_depth,
+        Find the ancestor of a Node that is a child of the root Node.
+
+        Parameters
+        ----------
+        index: int
+            The index of a descendant of the root Node.
+
+        Returns
+        -------
+        int
+            The index of the ancestor at the first layer of the Tree.
+        """
+        return self.store.first_layer_parent(index, self.root)
+
+    def reroot(self, index: int, depth: int) -> bool:
+        """
+        Make a child of the root Node the new root, keeping its explored
+        descendants, and prepare the search of one more layer below the
+        frontier. The rest of the Tree is dropped.
+
+        Parameters
+        ----------
+        index: int
+            The index of a child of the root Node.
+        depth: int
+            The depth of the search below the new root.
+
+        Returns
+        -------
+        bool
+            False if there is nothing to reuse below the new root.
+        """
+        winning = self.winning
+        if winning is not None and self.first_layer_parent(winning) != index:
+            winning = None
+        frontier = [
+            node for node in self.frontier
+            if self.first_layer_parent(node) == index
+        ]
+        if winning is None and len(frontier) == 0:
+            return False
+        self.store, mapping = self.store.subtree(index)
+        self.root = 0
+        self.depth = int(self.store.depth[self.root]) + depth
+        self.winning = None if winning is None else int(mapping[winning])
+        self.interrupted = False
+        self.visited_node = 1
+        explored = self.store.state[:len(self.store)]
+        self.state_history = set(explored[explored != -1].tolist())
+        self.deepest_layer = []
+        self.frontier = []
+        self.queue = []
+        if self.winning is None:
+            for node in mapping[frontier].tolist():
+                self.queue.extend(
+                    self.expand(node, int(self.store.action_mask[node]))
                 )
+        return True
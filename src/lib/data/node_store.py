@@ -0,0 +1,331 @@
+from __future__ import annotations
+import numpy as np
+from typing import List, Tuple
+from lib.environment.state_index import ENVIRONMENT_INFO
+from lib.models.Action import Action
+from lib.models.EnvironmentInfo import EnvironmentInfo
+from lib.models.Node import Node
+
+# Bit `i` of a packed action mask is set if action `i` is legal
+_MASK_BITS = 1 << np.arange(len(Action), dtype=np.uint8)
+
+
+def pack_action_mask(action_mask: np.ndarray) -> int:
+    """
+    Pack an action mask into an integer, bit `i` being set if action `i`
+    is legal.
+    """
+    return int(_MASK_BITS[np.asarray(action_mask) == 1].sum())
+
+
+class NodeStore:
+    """
+    Struct-of-arrays storage of the Nodes of a Tree. Each Node is an
+    index into parallel columns, and the children of a Node, created
+    together, are stored contiguously.
+
+    Attributes
+    ----------
+    parent: np.ndarray
+        The index of the parent of each Node, -1 for a root.
+    action: np.ndarray
+        The index of the action leading to each Node, -1 for a root.
+    state: np.ndarray
+        The state of each Node, -1 until it is known.
+    action_mask: np.ndarray
+        The packed action mask of the state of each Node.
+    reward: np.ndarray
+        The reward obtained by taking the action of each Node.
+    cumul_reward: np.ndarray
+        The cumulative reward from the root to each Node.
+    depth: np.ndarray
+        The depth of each Node.
+    first_child: np.ndarray
+        The index of the first child of each Node.
+    children_count: np.ndarray
+        The number of children of each Node.
+    taxi_on_passenger: np.ndarray
+        Whether the passenger was picked up when reaching each Node.
+    """
+
+    _COLUMNS: Tuple[Tuple[str, type, int], ...] = (
+        ("parent", np.int32, -1),
+        ("action", np.int8, -1),
+        ("state", np.int32, -1),
+        ("action_mask", np.uint8, 0),
+        ("reward", np.float32, 0),
+        ("cumul_reward", np.float32, 0),
+        ("depth", np.int16, 0),
+        ("first_child", np.int32, 0),
+        ("children_count", np.int8, 0),
+        ("taxi_on_passenger", bool, False),
+    )
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._size = 0
+        for name, dtype, fill in NodeStore._COLUMNS:
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The memory used per Node times the number of Nodes.
+        """
+        return sum(
+            getattr(self, name)[:self._size].nbytes
+            for name, _, _ in NodeStore._COLUMNS
+        )
+
+    def _reserve(self, count: int) -> None:
+        capacity = len(self.parent)
+        if self._size + count <= capacity:
+            return
+        while self._size + count > capacity:
+            capacity *= 2
+        for name, dtype, fill in NodeStore._COLUMNS:
+            column = np.full(capacity, fill, dtype=dtype)
+            column[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, column)
+
+    def add_root(self, node: Node) -> int:
+        """
+        Store a Node as a root, copying its fields.
+
+        Parameters
+        ----------
+        node: Node
+            The Node to store.
+
+        Returns
+        -------
+        int
+            The index of the root.
+        """
+        self._reserve(1)
+        index = self._size
+        self._size += 1
+        self.parent[index] = -1
+        self.action[index] = -1 if node.action is None else node.action.value
+        self.state[index] = -1 if node.state is None else node.state
+        if node.env_info is not None:
+            self.action_mask[index] = pack_action_mask(node.env_info.action_mask)
+        self.reward[index] = node.reward or 0.0
+        self.cumul_reward[index] = node.cumul_reward or 0.0
+        self.depth[index] = node.depth
+        self.taxi_on_passenger[index] = node.taxi_on_passenger
+        return index
+
+    def add_children(self, parent: int, actions: List[int]) -> range:
+        """
+        Create the children of a Node, one per action.
+
+        Parameters
+        ----------
+        parent: int
+            The index of the parent.
+        actions: List[int]
+            The index of the action of each child.
+
+        Returns
+        -------
+        range
+            The indices of the children.
+        """
+        count = len(actions)
+        self._reserve(count)
+        start = self._size
+        children = slice(start, start + count)
+        self.parent[children] = parent
+        self.action[children] = actions
+        self.depth[children] = self.depth[parent] + 1
+        self.first_child[parent] = start
+        self.children_count[parent] = count
+        self._size += count
+        return range(start, start + count)
+
+    def children(self, index: int) -> range:
+        """
+        The indices of the children of a Node.
+        """
+        start = int(self.first_child[index])
+        return range(start, start + int(self.children_count[index]))
+
+    def first_layer_parent(self, index: int, root: int) -> int:
+        """
+        Find the ancestor of a Node that is a child of the given root.
+
+        Parameters
+        ----------
+        index: int
+            The index of a descendant of the root.
+        root: int
+            The index of the root.
+
+        Returns
+        -------
+        int
+            The index of the ancestor at the first layer below the root.
+        """
+        parent = int(self.parent[index])
+        while parent != root and parent != -1:
+            index = parent
+            parent = int(self.parent[index])
+        return index
+
+    def actions(self, index: int) -> List[Action]:
+        """
+        The actions to take from the root to reach a Node.
+        """
+        actions = []
+        while self.parent[index] != -1:
+            actions.append(Action(int(self.action[index])))
+            index = int(self.parent[index])
+        return actions[::-1]
+
+    def subtree(self, root: int) -> Tuple[NodeStore, np.ndarray]:
+        """
+        Copy the subtree of a Node into a new store, the Node becoming
+        its root, keeping the children of each Node contiguous.
+
+        Parameters
+        ----------
+        root: int
+            The index of the root of the subtree.
+
+        Returns
+        -------
+        Tuple[NodeStore, np.ndarray]
+            The new store and, for each index of this store, the index
+            in the new store (-1 if outside of the subtree).
+        """
+        order = [root]
+        for index in order:
+            order.extend(self.children(index))
+        old = np.array(order, dtype=np.int64)
+        mapping = np.full(self._size, -1, dtype=np.int64)
+        mapping[old] = np.arange(len(old))
+        store = NodeStore(max(len(old), 1))
+        for name, _, _ in NodeStore._COLUMNS:
+            getattr(store, name)[:len(old)] = getattr(self, name)[old]
+        store._size = len(old)
+        store.parent[1:] = mapping[store.parent[1:]]
+        store.parent[0] = -1
+        has_children = store.children_count[:len(old)] > 0
+        store.first_child[:len(old)][has_children] = mapping[
+            store.first_child[:len(old)][has_children]
+        ]
+        return store, mapping
+
+    def view(self, index: int) -> NodeView:
+        """
+        A Node backed by this store.
+        """
+        return NodeView(self, index)
+
+
+class NodeView(Node):
+    """
+    A Node whose fields are read from and written to a NodeStore. Views
+    are created on demand, equal views pointing to the same Node.
+    """
+
+    def __init__(self, store: NodeStore, index: int) -> None:
+        self.store = store
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, NodeView)
+            and other.store is self.store
+            and other.index == self.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.index))
+
+    @property
+    def action(self) -> Action | None:  # type: ignore
+        action = int(self.store.action[self.index])
+        return None if action == -1 else Action(action)
+
+    @property
+    def depth(self) -> int:  # type: ignore
+        return int(self.store.depth[self.index])
+
+    @property
+    def path(self) -> str:  # type: ignore
+        if self.store.parent[self.index] == -1 or self.action is None:
+            return ''
+        return f"{self.depth}{self.action.to_letter()}"
+
+    @property
+    def state(self) -> int | None:  # type: ignore
+        state = int(self.store.state[self.index])
+        return None if state == -1 else state
+
+    @state.setter
+    def state(self, state: int | None) -> None:
+        self.store.state[self.index] = -1 if state is None else state
+
+    @property
+    def parent(self) -> NodeView | None:  # type: ignore
+        parent = int(self.store.parent[self.index])
+        return None if parent == -1 else NodeView(self.store, parent)
+
+    @property
+    def children(self) -> List[NodeView]:  # type: ignore
+        return [NodeView(self.store, i) for i in self.store.children(self.index)]
+
+    @children.setter
+    def children(self, children: List[Node]) -> None:
+        if len(children) != 0:
+            raise ValueError("Only the children of a view can be removed.")
+        self.store.children_count[self.index] = 0
+
+    @property
+    def env_info(self) -> EnvironmentInfo | None:  # type: ignore
+        if self.state is None:
+            return None
+        return ENVIRONMENT_INFO[int(self.store.action_mask[self.index])]
+
+    @env_info.setter
+    def env_info(self, env_info: EnvironmentInfo) -> None:
+        self.store.action_mask[self.index] = pack_action_mask(env_info.action_mask)
+
+    @property
+    def reward(self) -> float:  # type: ignore
+        return float(self.store.reward[self.index])
+
+    @reward.setter
+    def reward(self, reward: float) -> None:
+        self.store.reward[self.index] = reward
+
+    @property
+    def cumul_reward(self) -> float:  # type: ignore
+        return float(self.store.cumul_reward[self.index])
+
+    @cumul_reward.setter
+    def cumul_reward(self, cumul_reward: float) -> None:
+        self.store.cumul_reward[self.index] = cumul_reward
+
+    @property
+    def taxi_on_passenger(self) -> bool:  # type: ignore
+        return bool(self.store.taxi_on_passenger[self.index])
+
+    @taxi_on_passenger.setter
+    def taxi_on_passenger(self, taxi_on_passenger: bool) -> None:
+        self.store.taxi_on_passenger[self.index] = taxi_on_passenger
+
+    @property
+    def actions(self) -> List[Action]:
+        return self.store.actions(self.index)
+
+    @property
+    def first_layer_parent(self) -> NodeView:
+        root = self.index
+        while self.store.parent[root] != -1:
+            root = int(self.store.parent[root])
+        return NodeView(self.store, self.store.first_layer_parent(self.index, root))
@@ -1,11 +1,36 @@
+from __future__ import annotations
+import os
+import json
+import tempfile
 import numpy as np
 import pandas as pd
-from typing import List, Tuple
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Literal, Tuple
 from pandas import DataFrame
+from pydantic import BaseModel
 from IPython.display import display, HTML
 from lib.models.Action import Action
 
 
+# Q-Table file layout: magic, header length (uint64), JSON header,
+# padding up to DATA_ALIGNMENT, then the raw values in C order
+MAGIC = b"QTABLE01"
+DATA_ALIGNMENT = 64
+
+
+class QTableHeader(BaseModel):
+    """
+    Description of a Q-Table file.
+    """
+    observation_space: int
+    action_space: int
+    dtype: str = "float64"
+    gamma: float | None = None
+    lr: float | None = None
+    episode: int = 0
+    rng_state: Dict[str, Any] | None = None
+
+
 class QTable:
     """
     Representation of a Q-table. Its shape is defined by :
@@ -37,6 +62,149 @@ class QTable:
                 self.values = data
             else:
                 raise err
+        self.header: QTableHeader | None = None
+
+    @staticmethod
+    def from_shared_memory(
+        shared_memory: SharedMemory,
+        observation_space: int,
+        action_space: int
+    ) -> QTable:
+        """
+        Create a Q-table whose values live in a shared memory block, so
+        that updates are visible to every process attached to it.
+
+        Parameters
+        ----------
+        shared_memory: SharedMemory
+            The shared memory block, holding at least
+            `observation_space * action_space` float64 values.
+        observation_space: int
+            The number of lines.
+        action_space: int
+            The number of columns.
+
+        Returns
+        -------
+        QTable
+            The Q-table backed by the shared memory block.
+        """
+        values = np.ndarray(
+            (observation_space, action_space),
+            dtype=np.float64,
+            buffer=shared_memory.buf
+        )
+        return QTable(observation_space, action_space, data=values)
+
+    def save(self, path: str, header: QTableHeader | None = None) -> None:
+        """
+        Write the Q-table to a file. The file is written to a unique
+        temporary file next to its destination then swapped in, so that
+        a crash never leaves a partial file, readers keep the version
+        they opened and concurrent writers do not share a file.
+
+        Parameters
+        ----------
+        path: str
+            The destination file.
+        header: QTableHeader | None, default=None
+            The description stored with the values. Its shape and dtype
+            are taken from the Q-table.
+        """
+        if header is None:
+            header = QTableHeader(
+                observation_space=self.values.shape[0],
+                action_space=self.values.shape[1]
+            )
+        header = header.model_copy(update={
+            "observation_space": self.values.shape[0],
+            "action_space": self.values.shape[1],
+            "dtype": self.values.dtype.str
+        })
+        encoded = header.model_dump_json().encode()
+        offset = len(MAGIC) + 8 + len(encoded)
+        padding = -offset % DATA_ALIGNMENT
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(os.path.abspath(path)),
+            prefix=f"{os.path.basename(path)}.",
+            suffix=".tmp",
+            delete=False
+        ) as file:
+            try:
+                file.write(MAGIC)
+                file.write(np.uint64(len(encoded)).tobytes())
+                file.write(encoded + b" " * padding)
+                file.write(np.ascontiguousarray(self.values).tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+                # The temporary file is only readable by its owner
+                os.chmod(file.name, _file_mode(path))
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, path)
+        self.header = header
+
+    @staticmethod
+    def read_header(path: str) -> Tuple[QTableHeader, int]:
+        """
+        Read the description of a Q-table file.
+
+        Parameters
+        ----------
+        path: str
+            The Q-table file.
+
+        Returns
+        -------
+        Tuple[QTableHeader, int]
+            The header and the offset of the values in the file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a Q-table file.
+        """
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path}' is not a Q-Table file.")
+            length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+            header = QTableHeader(**json.loads(file.read(length)))
+        offset = len(MAGIC) + 8 + length
+        return header, offset + (-offset % DATA_ALIGNMENT)
+
+    @staticmethod
+    def load(path: str, mode: Literal["r", "r+", "c"] = "r") -> QTable:
+        """
+        Open a Q-table file without copying its values.
+
+        Parameters
+        ----------
+        path: str
+            The Q-table file.
+        mode: str, default="r"
+            The memory-map mode :
+            - "r": read-only
+            - "r+": updates are written to the file
+            - "c": updates stay in memory (copy-on-write)
+
+        Returns
+        -------
+        QTable
+            The Q-table backed by the file, with its header.
+        """
+        header, offset = QTable.read_header(path)
+        values = np.memmap(
+            path,
+            dtype=np.dtype(header.dtype),
+            mode=mode,
+            offset=offset,
+            shape=(header.observation_space, header.action_space)
+        )
+        table = QTable(header.observation_space, header.action_space, values)
+        table.header = header
+        return table
 
     def __getitem__(
         self,
@@ -94,3 +262,16 @@ class QTable:
             )
         else:
             return df
+
+
+def _file_mode(path: str) -> int:
+    """
+    The permissions of a file written at a path: those of the file it
+    replaces, or else those `open()` would give it under the umask.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class SumTree:
+    """
+    Binary tree in which each node holds the sum of its children, the
+    leaves holding the priorities. It allows updating a priority and
+    sampling a leaf proportionally to its priority in O(log n).
+
+    The tree is stored in an array: node `i` has children `2i` and
+    `2i + 1`, the root being node 1 and the leaves the last `size` nodes.
+
+    Attributes
+    ----------
+    capacity: int
+        The number of leaves.
+    nodes: np.ndarray
+        The value of each node.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("The capacity should be positive.")
+        self.capacity = capacity
+        self._size = 1
+        while self._size < capacity:
+            self._size *= 2
+        self._depth = self._size.bit_length() - 1
+        self.nodes = np.zeros(2 * self._size, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        """
+        The sum of all the priorities.
+        """
+        return float(self.nodes[1])
+
+    @property
+    def priorities(self) -> np.ndarray:
+        """
+        The priority of each leaf.
+        """
+        return self.nodes[self._size:self._size + self.capacity]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """
+        Set the priority of the given leaves. When a leaf appears several
+        times, its last priority is kept.
+
+        Parameters
+        ----------
+        indices: np.ndarray
+            The indices of the leaves.
+        priorities: np.ndarray
+            The new priorities.
+        """
+        nodes = np.asarray(indices, dtype=np.int64) + self._size
+        self.nodes[nodes] = priorities
+        for _ in range(self._depth):
+            nodes //= 2
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """
+        Find the leaves whose cumulative priority range contains each
+        value, descending all the values at once.
+
+        Parameters
+        ----------
+        values: np.ndarray
+            Values between 0 and `total`.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the leaf found for each value.
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self._depth):
+            left = 2 * nodes
+            go_right = values >= self.nodes[left]
+            values -= self.nodes[left] * go_right
+            nodes = left + go_right
+        leaves = nodes - self._size
+        # Rounding errors may lead past the last leaf with a priority
+        return np.minimum(leaves, self.capacity - 1)
@@ -0,0 +1,120 @@
+from typing import Callable, List
+import numpy as np
+from lib.environment.transition_table import TransitionTable
+from lib.models.Action import Action
+
+
+class TranspositionTable:
+    """
+    Representation of a breadth-first search over the states of the game
+    environment. Each state is expanded once, the first time it is reached,
+    so the search is bounded by the number of states instead of the size
+    of the tree of action sequences.
+
+    Attributes
+    ----------
+    cumul_reward: np.ndarray
+        The best cumulative reward obtained to reach each state.
+    depth: np.ndarray
+        The number of steps to reach each state, -1 if it was not reached.
+    first_action: np.ndarray
+        The index of the first action taken to reach each state with the
+        best cumulative reward, -1 if it was not reached.
+    visited_node: int
+        The number of transitions explored by the last search.
+    winning_state: int | None
+        The first winning state found by the last search.
+    deepest_layer_states: List[int]
+        The states reached at the deepest layer of the last search.
+    interrupted: bool
+        Whether the last search ran out of budget before `max_depth`.
+    """
+
+    def __init__(self, observation_space: int) -> None:
+        self.cumul_reward = np.zeros(observation_space, dtype=np.float64)
+        self.depth = np.full(observation_space, -1, dtype=np.int64)
+        self.first_action = np.full(observation_space, -1, dtype=np.int64)
+        self.visited_node = 0
+        self.winning_state: int | None = None
+        self.deepest_layer_states: List[int] = []
+        self.interrupted = False
+
+    def clear(self) -> None:
+        """
+        Forget the result of the last search.
+        """
+        self.cumul_reward[:] = 0.0
+        self.depth[:] = -1
+        self.first_action[:] = -1
+        self.visited_node = 0
+        self.winning_state = None
+        self.deepest_layer_states = []
+        self.interrupted = False
+
+    def search(
+        self,
+        table: TransitionTable,
+        root_state: int,
+        actions: List[Action],
+        max_depth: int,
+        is_winning: Callable[[int], bool],
+        out_of_budget: Callable[[int], bool] | None = None
+    ) -> None:
+        """
+        Explore the states reachable from `root_state` layer by layer, up
+        to `max_depth` steps, taking only the legal `actions`. The search
+        stops at the first winning state.
+
+        Parameters
+        ----------
+        table: TransitionTable
+            The transitions of the game environment.
+        root_state: int
+            The state the search starts from.
+        actions: List[Action]
+            The actions allowed during the search.
+        max_depth: int
+            The maximum number of steps.
+        is_winning: Callable[[int], bool]
+            Whether reaching a state ends the search.
+        out_of_budget: Callable[[int], bool] | None, default=None
+            Given the number of transitions explored, whether the search
+            should stop. It is checked before each layer but the first
+            one, the deepest layer being then the last complete one.
+        """
+        self.clear()
+        self.depth[root_state] = 0
+        layer = [root_state]
+        for depth in range(1, max_depth + 1):
+            if depth > 1 and out_of_budget is not None \
+                    and out_of_budget(self.visited_node):
+                self.interrupted = True
+                break
+            next_layer = []
+            for state in layer:
+                mask = table.action_mask[state]
+                for action in actions:
+                    if mask[action.value] == 0:
+                        continue
+                    self.visited_node += 1
+                    next_state = int(table.next_state[state, action.value])
+                    cumul_reward = self.cumul_reward[state] \
+                        + table.reward[state, action.value]
+                    first_action = action.value if depth == 1 \
+                        else self.first_action[state]
+                    if self.depth[next_state] == -1:
+                        self.depth[next_state] = depth
+                        self.cumul_reward[next_state] = cumul_reward
+                        self.first_action[next_state] = first_action
+                        next_layer.append(next_state)
+                    elif self.depth[next_state] == depth \
+                            and cumul_reward > self.cumul_reward[next_state]:
+                        self.cumul_reward[next_state] = cumul_reward
+                        self.first_action[next_state] = first_action
+                    if is_winning(next_state):
+                        self.winning_state = next_state
+                        return
+            if len(next_layer) == 0:
+                break
+            layer = next_layer
+        self.deepest_layer_states = layer
@@ -1,5 +1,8 @@
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Tuple
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.environment.state_index import StateIndex
+from lib.environment.transition_table import TransitionTable
+from lib.models.Engine import Engine
 from lib.models.EnvironmentInfo import EnvironmentInfo
 from lib.logs.logger import get_logger
 
@@ -14,28 +17,126 @@ class GameEnvironment:
     ----------
     env: GameEnv
         The game environment.
+    engine: Engine, default=Engine.GYM
+        The stepping engine. With `Engine.TABLE`, `step()` and `back_to()`
+        are served by a precomputed TransitionTable instead of the
+        Gymnasium wrappers, while producing the same trajectories.
+    index: StateIndex
+        The decoded state and legal actions of every state, shared by
+        the game environments with the same id.
+    info: EnvironmentInfo
+        The information of the current state, interned per state.
     """
 
     def __init__(
         self,
         env: GymnasiumGameEnvironment,
         seed: int | None = None,
+        engine: Engine = Engine.GYM,
     ):
         self.env = env
+        self.engine = engine
+        self.table: TransitionTable | None = None
+        if engine is Engine.TABLE:
+            self.table = TransitionTable.shared(env)
+        self.index = StateIndex.shared(env)
+        self.max_episode_steps: int | None = getattr(
+            env, "_max_episode_steps", None
+        )
+        self._elapsed_steps = 0
+        self._last_action: int | None = None
+        # Number of random draws the wrapped environment would have
+        # consumed by stepping since the last reset
+        self._rng_draws = 0
         # Init env with or without seed
         if seed:
-            state, info = self.env.reset(seed=seed)
+            state, info = self.reset(seed=seed)
         else:
-            state, info = self.env.reset()
+            state, info = self.reset()
         self.initial_state = state
+        self.initial_info = self.info
+
+    @property
+    def info(self) -> EnvironmentInfo:
+        return self.index.info[self.state]  # type: ignore
+
+    def reset(self, seed: int | None = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        Resets the game environment in a new initial state.
+
+        Parameters
+        ----------
+        seed: int | None, default=None
+            The seed used to sample the initial state.
+
+        Returns
+        -------
+        Tuple[int, Dict[str, Any]]
+            The initial state and the Gymnasium information.
+        """
+        if seed is None:
+            self.sync_rng()
+        state, info = self.env.reset(seed=seed)
         self.state = state
-        self.initial_info = EnvironmentInfo(**info)
-        self.info = EnvironmentInfo(**info)
+        self._elapsed_steps = 0
+        self._last_action = None
+        self._rng_draws = 0
+        return state, info
+
+    def sync_rng(self) -> None:
+        """
+        Catch up with the random draws the Gymnasium steps would have
+        made since the last reset, so that the random generator of the
+        game environment is in the same state for both engines.
+        """
+        if self._rng_draws:
+            self.env.unwrapped.np_random.random(self._rng_draws)
+            self._rng_draws = 0
+
+    def step(self, action: int) -> Tuple[int, float, bool, bool, Dict[str, Any]]:
+        """
+        Take an action in the game environment.
+
+        Parameters
+        ----------
+        action: int
+            The index of the action.
+
+        Returns
+        -------
+        Tuple[int, float, bool, bool, Dict[str, Any]]
+            The new state, the reward, whether the game is terminated,
+            whether the game is truncated and the Gymnasium information.
+        """
+        if self.table is None:
+            state, reward, term, trunc, info = self.env.step(action)
+            self.state = state
+            return state, reward, term, trunc, info
+        table = self.table
+        current = self.state
+        self.state = table.next_state.item(current, action)
+        self._last_action = action
+        self._rng_draws += 1
+        self._elapsed_steps += 1
+        trunc = (
+            self.max_episode_steps is not None
+            and self._elapsed_steps >= self.max_episode_steps
+        )
+        return (
+            self.state,
+            table.reward.item(current, action),
+            table.terminated.item(current, action),
+            trunc,
+            {"prob": 1.0, "action_mask": table.action_mask[self.state]}
+        )
 
     def render(self) -> List[Any] | None:
         """
         Display the game environment.
         """
+        if self.table is not None:
+            self.env.unwrapped.s = self.state  # type: ignore
+            self.env.unwrapped.lastaction = self._last_action  # type: ignore
         return self.env.render()
 
     def back_to(self, state: int) -> None:
@@ -48,7 +149,8 @@ class GameEnvironment:
             The state in which to reset the game environment.
         """
         if state < self.env.observation_space.n and state >= 0:  # type: ignore
-            self.env.env.unwrapped.s = state  # type: ignore
+            if self.table is None:
+                self.env.env.unwrapped.s = state  # type: ignore
             self.state = state
         else:
             raise ValueError(
@@ -66,8 +168,7 @@ class GameEnvironment:
             The location of the taxi on the map in the following
             format : (row, column).
         """
-        row = (self.env.s // 100) % 5
-        column = (self.env.s // 20) % 5
+        row, column = self.index.taxi_location[self.state]
         return (row + 1, column + 1)
 
     def passenger_pickedup(self, state: int) -> bool:
@@ -79,10 +180,7 @@ class GameEnvironment:
         bool
             True if the passenger is in the taxi.
         """
-        # _, _, passenger_location, _ = self.env.env.decode(state)
-        _, _, passenger_location, _ = self.env.unwrapped.decode(state)  # type: ignore
-        passenger_in_taxi = (passenger_location == 4)
-        return passenger_in_taxi
+        return self.index.picked_up[state]
 
     def passenger_droppedoff(self, state: int | None) -> bool:
         """
@@ -100,7 +198,4 @@ class GameEnvironment:
                 "You can't know if the passenger dropped off if"
                 " the state is unknown."
             )
-        _, _, passenger_location, destination = self.env.unwrapped.decode(  # type: ignore
-            state
-        )
-        return passenger_location == destination
+        return self.index.dropped_off[state]
@@ -0,0 +1,284 @@
+from __future__ import annotations
+import heapq
+import numpy as np
+from typing import Dict, List, Tuple
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.models.Action import Action
+
+# The actions moving the taxi on the grid
+MOVES = (Action.SOUTH, Action.NORTH, Action.EAST, Action.WEST)
+# Passenger location index meaning the passenger is in the taxi
+IN_TAXI = 4
+
+
+class ShortestPaths:
+    """
+    All-pairs shortest paths between the cells of the map, built from its
+    walls, and the optimal action of each state derived from them. The
+    tables are only computed when first used, `astar()` searching the
+    walls directly.
+
+    Attributes
+    ----------
+    rows: int
+        The number of rows of the map.
+    columns: int
+        The number of columns of the map.
+    locations: np.ndarray
+        The cell of each pickup/dropoff location.
+    cell: np.ndarray
+        The cell of the taxi in each state, `row * columns + column`.
+    passenger: np.ndarray
+        The passenger location index of each state, `IN_TAXI` if the
+        passenger is in the taxi.
+    destination: np.ndarray
+        The destination location index of each state.
+    distance: np.ndarray
+        The number of moves between two cells, indexed by `[from, to]`.
+    first_move: np.ndarray
+        The index of the first move of a shortest path between two cells,
+        -1 from a cell to itself.
+    steps_to_go: np.ndarray
+        The number of steps of an optimal episode from each state,
+        pickup and dropoff included.
+    optimal_action: np.ndarray
+        The index of the optimal action in each state.
+    """
+
+    _shared: Dict[str, ShortestPaths] = {}
+
+    def __init__(self, env: GymnasiumGameEnvironment) -> None:
+        self._env = env.unwrapped
+        self._desc = self._env.desc  # type: ignore
+        self.rows = self._desc.shape[0] - 2
+        self.columns = (self._desc.shape[1] - 1) // 2
+        self.locations = np.array([
+            row * self.columns + column
+            for row, column in self._env.locs  # type: ignore
+        ])
+        self._decoded: np.ndarray | None = None
+        self._tables: Tuple[np.ndarray, ...] | None = None
+
+    @staticmethod
+    def shared(env: GymnasiumGameEnvironment) -> ShortestPaths:
+        """
+        Return the shortest paths of the game environment, building them
+        only once per environment id, see `TransitionTable.shared()`.
+        """
+        spec = env.unwrapped.spec
+        key = spec.id if spec is not None else str(id(env.unwrapped))
+        if key not in ShortestPaths._shared:
+            ShortestPaths._shared[key] = ShortestPaths(env)
+        return ShortestPaths._shared[key]
+
+    @property
+    def cell(self) -> np.ndarray:
+        decoded = self._decode()
+        return decoded[:, 0] * self.columns + decoded[:, 1]
+
+    @property
+    def passenger(self) -> np.ndarray:
+        return self._decode()[:, 2]
+
+    @property
+    def destination(self) -> np.ndarray:
+        return self._decode()[:, 3]
+
+    @property
+    def distance(self) -> np.ndarray:
+        return self._all_pairs()[0]
+
+    @property
+    def first_move(self) -> np.ndarray:
+        return self._all_pairs()[1]
+
+    @property
+    def steps_to_go(self) -> np.ndarray:
+        return self._all_pairs()[2]
+
+    @property
+    def optimal_action(self) -> np.ndarray:
+        return self._all_pairs()[3]
+
+    def _decode(self) -> np.ndarray:
+        """
+        Decode every state once, into its row, column, passenger and
+        destination.
+        """
+        if self._decoded is None:
+            self._decoded = np.array([
+                list(self._env.decode(state))  # type: ignore
+                for state in range(self._env.observation_space.n)  # type: ignore
+            ])
+        return self._decoded
+
+    def _all_pairs(self) -> Tuple[np.ndarray, ...]:
+        """
+        Compute once the distance and first move tables, then the steps
+        to go and the optimal action of each state.
+        """
+        if self._tables is None:
+            distance, first_move = self._floyd_warshall(self.rows * self.columns)
+            self._tables = (distance, first_move) \
+                + self._optimal_actions(distance, first_move)
+        return self._tables
+
+    def neighbours(self, cell: int) -> List[Tuple[int, int]]:
+        """
+        The (move, cell) pairs reachable in one legal move from a cell,
+        read from the walls of the map.
+
+        Parameters
+        ----------
+        cell: int
+            The cell of the taxi.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The index of each legal move with the cell it leads to.
+        """
+        row, column = divmod(cell, self.columns)
+        # The map draws a cell every two characters, inside a border
+        line = self._desc[row + 1]
+        neighbours = []
+        if row < self.rows - 1:
+            neighbours.append((Action.SOUTH.value, cell + self.columns))
+        if row > 0:
+            neighbours.append((Action.NORTH.value, cell - self.columns))
+        if line[2 * column + 2] == b":":
+            neighbours.append((Action.EAST.value, cell + 1))
+        if line[2 * column] == b":":
+            neighbours.append((Action.WEST.value, cell - 1))
+        return neighbours
+
+    def _floyd_warshall(self, cells: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the distance and first move tables between all cells.
+        """
+        unreachable = np.iinfo(np.int64).max // 4
+        distance = np.full((cells, cells), unreachable, dtype=np.int64)
+        first_move = np.full((cells, cells), -1, dtype=np.int8)
+        np.fill_diagonal(distance, 0)
+        for cell in range(cells):
+            for move, neighbour in self.neighbours(cell):
+                distance[cell, neighbour] = 1
+                first_move[cell, neighbour] = move
+        for k in range(cells):
+            through = distance[:, k, None] + distance[None, k, :]
+            shorter = through < distance
+            distance = np.where(shorter, through, distance)
+            first_move = np.where(shorter, first_move[:, k, None], first_move)
+        distance[distance == unreachable] = -1
+        return distance, first_move
+
+    def _optimal_actions(
+        self,
+        distance: np.ndarray,
+        first_move: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the number of steps to go and the optimal action of each
+        state: drive to the passenger, pick them up, drive to the
+        destination and drop them off.
+        """
+        cell, passenger = self.cell, self.passenger
+        in_taxi = passenger == IN_TAXI
+        destination = self.locations[self.destination]
+        # The passenger location index is out of range once in the taxi
+        pickup = self.locations[np.where(in_taxi, 0, passenger)]
+        target = np.where(in_taxi, destination, pickup)
+        to_target = distance[cell, target]
+        steps_to_go = np.where(
+            in_taxi,
+            to_target + 1,
+            to_target + 1 + distance[pickup, destination] + 1
+        )
+        arrived_action = np.where(
+            in_taxi, Action.DROP_OFF.value, Action.PICK_UP.value
+        )
+        optimal_action = np.where(
+            to_target == 0, arrived_action, first_move[cell, target]
+        ).astype(np.int8)
+        return steps_to_go, optimal_action
+
+    def locate(self, state: int) -> Tuple[int, int, int]:
+        """
+        Decode a single state without building the tables.
+
+        Parameters
+        ----------
+        state: int
+            The state of the game environment.
+
+        Returns
+        -------
+        Tuple[int, int, int]
+            The cell of the taxi, the passenger location index and the
+            destination index.
+        """
+        row, column, passenger, destination = self._env.decode(state)  # type: ignore
+        return row * self.columns + column, passenger, destination
+
+    def target(self, state: int) -> int:
+        """
+        The cell the taxi should drive to: the passenger location, or the
+        destination once the passenger is in the taxi.
+        """
+        _, passenger, destination = self.locate(state)
+        if passenger == IN_TAXI:
+            return int(self.locations[destination])
+        return int(self.locations[passenger])
+
+    def astar(self, start: int, goal: int) -> List[Action]:
+        """
+        Find a shortest path between two cells with A*, the Manhattan
+        distance being the heuristic. Unlike the tables, nothing is built
+        up front: it only expands the cells it needs through the walls.
+
+        Parameters
+        ----------
+        start: int
+            The cell the path starts from.
+        goal: int
+            The cell the path ends at.
+
+        Returns
+        -------
+        List[Action]
+            The moves of the path, empty if `start` is `goal`.
+
+        Raises
+        ------
+        ValueError
+            If `goal` cannot be reached from `start`.
+        """
+        goal_row, goal_column = divmod(goal, self.columns)
+
+        def heuristic(cell: int) -> int:
+            row, column = divmod(cell, self.columns)
+            return abs(row - goal_row) + abs(column - goal_column)
+
+        came_from: Dict[int, Tuple[int, int]] = {}
+        cost = {start: 0}
+        frontier = [(heuristic(start), 0, start)]
+        while len(frontier) != 0:
+            _, current_cost, cell = heapq.heappop(frontier)
+            if cell == goal:
+                moves = []
+                while cell != start:
+                    cell, move = came_from[cell]
+                    moves.append(Action(move))
+                return moves[::-1]
+            if current_cost > cost[cell]:
+                continue
+            for move, neighbour in self.neighbours(cell):
+                new_cost = current_cost + 1
+                if new_cost < cost.get(neighbour, new_cost + 1):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = (cell, move)
+                    heapq.heappush(
+                        frontier,
+                        (new_cost + heuristic(neighbour), new_cost, neighbour)
+                    )
+        raise ValueError(f"The cell {goal} cannot be reached from {start}.")
@@ -0,0 +1,225 @@
+from __future__ import annotations
+import numpy as np
+from typing import Dict, List, Tuple
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.models.Action import Action, LEGAL_ACTIONS
+from lib.models.EnvironmentInfo import EnvironmentInfo
+
+# Passenger location index meaning the passenger is in the taxi
+IN_TAXI = 4
+
+
+class StateIndex:
+    """
+    Per-state lookup tables of the game environment, so that decoding a
+    state or listing its legal actions is a single lookup. The lists hold
+    the same data as the arrays, as plain Python objects which are faster
+    to index one state at a time.
+
+    Attributes
+    ----------
+    decoded: np.ndarray
+        The (taxi row, taxi column, passenger location, destination) of
+        each state, as uint8.
+    action_mask: np.ndarray | None
+        The legal actions of each state packed as a bitmask, bit `i` being
+        set if action `i` is legal. None if the masks are unknown.
+    taxi_location: List[Tuple[int, int]]
+        The (row, column) of the taxi in each state.
+    passenger: List[int]
+        The passenger location index of each state.
+    destination: List[int]
+        The destination index of each state.
+    picked_up: List[bool]
+        Whether the passenger is in the taxi in each state.
+    dropped_off: List[bool]
+        Whether the passenger is at its destination in each state.
+    legal_actions: List[Tuple[Action, ...]] | None
+        The interned tuple of the legal actions of each state.
+    info: List[EnvironmentInfo] | None
+        The interned information of each state, see `ENVIRONMENT_INFO`.
+    """
+
+    _shared: Dict[str, StateIndex] = {}
+
+    def __init__(
+        self,
+        decoded: np.ndarray,
+        action_mask: np.ndarray | None = None
+    ) -> None:
+        self.decoded = np.asarray(decoded, dtype=np.uint8)
+        self.decoded.setflags(write=False)
+        rows = self.decoded.tolist()
+        self.taxi_location: List[Tuple[int, int]] = [
+            (row, column) for row, column, _, _ in rows
+        ]
+        self.passenger: List[int] = [passenger for _, _, passenger, _ in rows]
+        self.destination: List[int] = [
+            destination for _, _, _, destination in rows
+        ]
+        self.picked_up: List[bool] = [p == IN_TAXI for p in self.passenger]
+        self.dropped_off: List[bool] = [
+            p == d for p, d in zip(self.passenger, self.destination)
+        ]
+        self.action_mask: np.ndarray | None = None
+        self.legal_actions: List[Tuple[Action, ...]] | None = None
+        self.info: List[EnvironmentInfo] | None = None
+        if action_mask is not None:
+            self.action_mask = pack_action_masks(action_mask)
+            self.action_mask.setflags(write=False)
+            self.legal_actions = [
+                LEGAL_ACTIONS[bits] for bits in self.action_mask.tolist()
+            ]
+            self.info = [
+                ENVIRONMENT_INFO[bits] for bits in self.action_mask.tolist()
+            ]
+
+    @staticmethod
+    def taxi(observation_space: int = 500) -> StateIndex:
+        """
+        Build the decode tables of the Taxi game environment from its
+        state encoding, without the action masks.
+        """
+        states = np.arange(observation_space)
+        return StateIndex(np.stack([
+            (states // 100) % 5,
+            (states // 20) % 5,
+            (states // 4) % 5,
+            states % 4
+        ], axis=1))
+
+    @staticmethod
+    def from_env(env: GymnasiumGameEnvironment) -> StateIndex:
+        """
+        Build the tables by decoding every state of the game environment
+        and computing its action mask.
+        """
+        unwrapped = env.unwrapped
+        states = range(int(unwrapped.observation_space.n))  # type: ignore
+        decoded = np.array([
+            list(unwrapped.decode(state))  # type: ignore
+            for state in states
+        ])
+        action_mask = np.array([
+            unwrapped.action_mask(state)  # type: ignore
+            for state in states
+        ])
+        return StateIndex(decoded, action_mask)
+
+    @staticmethod
+    def shared(env: GymnasiumGameEnvironment) -> StateIndex:
+        """
+        Return the tables of the game environment, building them only
+        once per environment id, see `TransitionTable.shared()`.
+        """
+        spec = env.unwrapped.spec
+        key = spec.id if spec is not None else str(id(env.unwrapped))
+        if key not in StateIndex._shared:
+            StateIndex._shared[key] = StateIndex.from_env(env)
+        return StateIndex._shared[key]
+
+
+def pack_action_masks(action_masks: np.ndarray) -> np.ndarray:
+    """
+    Pack rows of action masks into bitmasks, bit `i` being set if action
+    `i` is legal.
+    """
+    action_masks = np.asarray(action_masks) == 1
+    bits = 1 << np.arange(action_masks.shape[-1], dtype=np.uint8)
+    return (action_masks * bits).sum(axis=-1).astype(np.uint8)
+
+
+# The action mask of each bitmask, read-only
+ACTION_MASKS = (
+    (np.arange(1 << len(Action))[:, None] >> np.arange(len(Action))) & 1
+).astype(np.int8)
+ACTION_MASKS.setflags(write=False)
+# The interned information of each action mask packed as a bitmask, see
+# `LEGAL_ACTIONS`. They are shared by every state and Node with the same
+# legal actions, so must not be modified: their masks are read-only.
+ENVIRONMENT_INFO: Tuple[EnvironmentInfo, ...] = tuple(
+    EnvironmentInfo(prob=1.0, action_mask=action_mask)
+    for action_mask in ACTION_MASKS
+)
+
+
+def encode(
+    row: np.ndarray | int,
+    column: np.ndarray | int,
+    passenger: np.ndarray | int,
+    destination: np.ndarray | int
+) -> np.ndarray:
+    """
+    Encode Taxi states, the inverse of `decode()`. The arguments are
+    broadcast together and may be arrays of any shape.
+
+    Parameters
+    ----------
+    row: np.ndarray | int
+        The taxi row.
+    column: np.ndarray | int
+        The taxi column.
+    passenger: np.ndarray | int
+        The passenger location index, `IN_TAXI` in the taxi.
+    destination: np.ndarray | int
+        The destination index.
+
+    Returns
+    -------
+    np.ndarray
+        The states.
+
+    Raises
+    ------
+    ValueError
+        If a row, column or passenger is not in `[0, 5)`, or a
+        destination not in `[0, 4)`.
+    """
+    row, column, passenger, destination = (
+        np.asarray(value, dtype=np.int64)
+        for value in (row, column, passenger, destination)
+    )
+    for name, value, bound in (
+        ("row", row, 5),
+        ("column", column, 5),
+        ("passenger", passenger, 5),
+        ("destination", destination, 4)
+    ):
+        if np.any((value < 0) | (value >= bound)):
+            raise ValueError(f"The {name} should be in [0, {bound}).")
+    return ((row * 5 + column) * 5 + passenger) * 4 + destination
+
+
+def decode(states: np.ndarray | int) -> np.ndarray:
+    """
+    Decode Taxi states of any shape with a lookup in `TAXI.decoded`.
+
+    Parameters
+    ----------
+    states: np.ndarray | int
+        The states.
+
+    Returns
+    -------
+    np.ndarray
+        The (taxi row, taxi column, passenger location, destination) of
+        each state, as uint8, of shape `states.shape + (4,)`.
+
+    Raises
+    ------
+    ValueError
+        If a state is out of the observation space.
+    """
+    states = np.asarray(states)
+    if states.size != 0 and (
+        states.min() < 0 or states.max() >= len(TAXI.decoded)
+    ):
+        raise ValueError(
+            "States value should be contained between 0 and"
+            f" {len(TAXI.decoded)}."
+        )
+    return TAXI.decoded[states]
+
+
+# The decode tables of the Taxi game environment
+TAXI = StateIndex.taxi()
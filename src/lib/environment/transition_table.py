@@ -0,0 +1,114 @@
+from __future__ import annotations
+import numpy as np
+from typing import Dict
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+
+
+class TransitionTable:
+    """
+    Dense representation of a deterministic game environment dynamics.
+    Each array is indexed by `[state, action]`, except `action_mask`
+    which is indexed by `[state]` and holds one mask row per state.
+
+    Attributes
+    ----------
+    next_state: np.ndarray
+        The state reached by taking an action in a given state.
+    reward: np.ndarray
+        The reward obtained by taking an action in a given state.
+    terminated: np.ndarray
+        Whether taking an action in a given state ends the game.
+    action_mask: np.ndarray
+        The legal actions available in each state.
+    """
+
+    _shared: Dict[str, TransitionTable] = {}
+
+    def __init__(
+        self,
+        next_state: np.ndarray,
+        reward: np.ndarray,
+        terminated: np.ndarray,
+        action_mask: np.ndarray
+    ) -> None:
+        self.next_state = next_state
+        self.reward = reward
+        self.terminated = terminated
+        self.action_mask = action_mask
+        # Tables are shared between environments, forbid any write
+        for array in (next_state, reward, terminated, action_mask):
+            array.setflags(write=False)
+
+    @property
+    def observation_space(self) -> int:
+        return self.next_state.shape[0]
+
+    @property
+    def action_space(self) -> int:
+        return self.next_state.shape[1]
+
+    @staticmethod
+    def from_env(env: GymnasiumGameEnvironment) -> TransitionTable:
+        """
+        Build the transition table by enumerating all the transitions
+        of the game environment.
+
+        Parameters
+        ----------
+        env: GymnasiumGameEnvironment
+            The game environment.
+
+        Returns
+        -------
+        TransitionTable
+            The transition table of the game environment.
+
+        Raises
+        ------
+        ValueError
+            If the game environment is not deterministic.
+        """
+        unwrapped = env.unwrapped
+        observation_space = int(unwrapped.observation_space.n)  # type: ignore
+        action_space = int(unwrapped.action_space.n)  # type: ignore
+        next_state = np.zeros((observation_space, action_space), dtype=np.int64)
+        reward = np.zeros((observation_space, action_space), dtype=np.float64)
+        terminated = np.zeros((observation_space, action_space), dtype=bool)
+        action_mask = np.zeros((observation_space, action_space), dtype=np.int8)
+        for state in range(observation_space):
+            action_mask[state] = unwrapped.action_mask(state)  # type: ignore
+            for action in range(action_space):
+                transitions = unwrapped.P[state][action]  # type: ignore
+                if len(transitions) != 1 or transitions[0][0] != 1.0:
+                    raise ValueError(
+                        "The transition table can only be built from a"
+                        " deterministic game environment."
+                    )
+                _, new_state, new_reward, term = transitions[0]
+                next_state[state, action] = new_state
+                reward[state, action] = new_reward
+                terminated[state, action] = term
+        return TransitionTable(next_state, reward, terminated, action_mask)
+
+    @staticmethod
+    def shared(env: GymnasiumGameEnvironment) -> TransitionTable:
+        """
+        Return the transition table of the game environment, building it
+        only once per environment id.
+
+        Parameters
+        ----------
+        env: GymnasiumGameEnvironment
+            The game environment.
+
+        Returns
+        -------
+        TransitionTable
+            The transition table shared by all environments with the
+            same id.
+        """
+        spec = env.unwrapped.spec
+        key = spec.id if spec is not None else str(id(env.unwrapped))
+        if key not in TransitionTable._shared:
+            TransitionTable._shared[key] = TransitionTable.from_env(env)
+        return TransitionTable._shared[key]
@@ -0,0 +1,158 @@
+import numpy as np
+from typing import List, Tuple
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.environment.transition_table import TransitionTable
+
+
+class VectorGameEnvironment:
+    """
+    Represent many independent game environments stepped at once.
+    Every instance (slot) is backed by the shared TransitionTable and
+    owns its random generator, so that a slot seeded with `seed`
+    follows the same trajectory as a `GameEnvironment(env, seed=seed)`
+    given the same actions.
+
+    Attributes
+    ----------
+    env: GymnasiumGameEnvironment
+        The game environment the transitions are read from.
+    num_envs: int
+        The number of instances.
+    states: np.ndarray
+        The current state of each instance.
+    elapsed_steps: np.ndarray
+        The number of steps taken by each instance since its last reset.
+    """
+
+    def __init__(
+        self,
+        env: GymnasiumGameEnvironment,
+        num_envs: int,
+        seed: int | List[int] | None = None,
+    ) -> None:
+        if num_envs < 1:
+            raise ValueError("The number of environments should be positive.")
+        self.env = env
+        self.num_envs = num_envs
+        self.table = TransitionTable.shared(env)
+        self.max_episode_steps: int | None = getattr(
+            env, "_max_episode_steps", None
+        )
+        self._initial_cdf = np.cumsum(
+            env.unwrapped.initial_state_distrib  # type: ignore
+        )
+        self.rngs: List[np.random.Generator] = []
+        self.states = np.zeros(num_envs, dtype=np.int64)
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+        self.reset(seed=seed)
+
+    @property
+    def action_masks(self) -> np.ndarray:
+        """
+        The action mask of the current state of each instance.
+
+        Returns
+        -------
+        np.ndarray
+            An array of shape `(num_envs, action_space)`.
+        """
+        return self.table.action_mask[self.states]
+
+    def _seeds(self, seed: int | List[int] | None) -> List[int | None]:
+        if seed is None:
+            return [None] * self.num_envs
+        elif isinstance(seed, (int, np.integer)):
+            return [int(seed) + slot for slot in range(self.num_envs)]
+        elif len(seed) == self.num_envs:  # type: ignore
+            return list(seed)  # type: ignore
+        else:
+            raise ValueError(
+                "Seeds should be either an integer or one integer per"
+                f" environment ({self.num_envs})."
+            )
+
+    def _sample_initial_state(self, slot: int) -> int:
+        return int(np.argmax(self._initial_cdf > self.rngs[slot].random()))
+
+    def reset(
+        self,
+        seed: int | List[int] | None = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resets every instance in a new initial state.
+
+        Parameters
+        ----------
+        seed: int | List[int] | None, default=None
+            Either one seed per instance, or a base seed from which slot
+            `i` is seeded with `seed + i`.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The initial states and their action masks.
+        """
+        self.rngs = [np.random.default_rng(s) for s in self._seeds(seed)]
+        self.states = np.array(
+            [self._sample_initial_state(slot) for slot in range(self.num_envs)],
+            dtype=np.int64
+        )
+        self.elapsed_steps = np.zeros(self.num_envs, dtype=np.int64)
+        return self.states, self.action_masks
+
+    def reset_slots(self, slots: np.ndarray) -> None:
+        """
+        Resets the given instances without reseeding them.
+
+        Parameters
+        ----------
+        slots: np.ndarray
+            The indices of the instances to reset.
+        """
+        for slot in slots:
+            # Catch up with the draws the Gymnasium steps would have made
+            self.rngs[slot].random(self.elapsed_steps[slot])
+            self.states[slot] = self._sample_initial_state(slot)
+        self.elapsed_steps[slots] = 0
+
+    def step(
+        self,
+        actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Take one action in every instance. The instances whose episode
+        ended are reset automatically, their new initial state being
+        available through `states` and `action_masks`.
+
+        Parameters
+        ----------
+        actions: np.ndarray
+            The index of the action to take in each instance.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            The states reached (before any reset), the rewards, whether
+            each game is terminated, whether each game is truncated and
+            the action masks of the states reached.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(
+                f"Expected one action per environment ({self.num_envs})."
+            )
+        states = self.states
+        next_states = self.table.next_state[states, actions]
+        rewards = self.table.reward[states, actions]
+        terminated = self.table.terminated[states, actions]
+        self.elapsed_steps += 1
+        if self.max_episode_steps is None:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+        else:
+            truncated = self.elapsed_steps >= self.max_episode_steps
+        masks = self.table.action_mask[next_states]
+        self.states = next_states.copy()
+        done = np.flatnonzero(terminated | truncated)
+        if len(done):
+            self.reset_slots(done)
+        return next_states, rewards, terminated, truncated, masks
@@ -1,18 +1,42 @@
 import torch
 import numpy as np
 from tqdm import tqdm
-from typing import Callable, List
+from functools import partial
+from typing import Callable, List, Tuple
 from lib.data.neural_network import NeuralNetwork
 from lib.models.Action import ActionWithReward
 from lib.models.GameStatus import GameStatus
 from lib.models.Metrics import EpisodeMetrics
 from lib.models.Policies import Policies
-from lib.data.memory import Memory, Transition
+from lib.data.memory import (
+    Memory,
+    PrioritizedMemory,
+    Transition,
+    TransitionBatch
+)
 from lib.policies.GreedyPolicy import GreedyPolicy
 from lib.policies.EpsilonGreedyPolicy import EpsilonGreedyPolicy
 
 
 class DeepQLearning:
+    """
+    Provide utility functions to compute Deep Q-Learning steps.
+
+    Attributes
+    ----------
+    tau: float, default=1.0
+        The weight of the policy network when blended into the target
+        network.
+    target_update_every: int, default=1
+        The number of optimization steps between two target network
+        updates.
+    cache_targets: bool, default=False
+        Whether to compute the maximum target Q-value of every state in
+        one pass, cached until the next target network update. Under the
+        default `target_update_every=1` the cache is dropped after every
+        optimization step and never hits, so it only pays off with
+        spaced out updates.
+    """
 
     def __init__(
         self,
@@ -24,6 +48,8 @@ class DeepQLearning:
         gamma: float = 1.0,
         tau: float = 1.0,
         batch_size: int = 128,
+        target_update_every: int = 1,
+        cache_targets: bool = False
     ) -> None:
         if data is None:
             self.data = Memory(128)
@@ -36,6 +62,10 @@ class DeepQLearning:
         self.sample_depth = sample_depth
         self.tau = tau
         self.batch_size = batch_size
+        self.target_update_every = target_update_every
+        self.cache_targets = cache_targets
+        self.steps_done = 0
+        self._target_values: torch.Tensor | None = None
         self.policy_network = NeuralNetwork(
             self.policy.game_env.env.observation_space.n,  # type: ignore
             self.policy.game_env.env.action_space.n,  # type: ignore
@@ -49,6 +79,10 @@ class DeepQLearning:
         self.target_network.model.load_state_dict(
             self.policy_network.model.state_dict()
         )
+        # Row `i` is the one-hot encoding of state `i`
+        self._one_hot = torch.eye(
+            self.policy.game_env.env.observation_space.n  # type: ignore
+        )
 
     def do_episode(self) -> EpisodeMetrics:
         """
@@ -73,7 +107,9 @@ class DeepQLearning:
                 pass
             cumulative_reward += next.reward
             self._optimize_model()
-            self._update_target_network()
+            self.steps_done += 1
+            if self.steps_done % self.target_update_every == 0:
+                self._update_target_network()
         return EpisodeMetrics(
             steps=steps,
             cumulative_reward=cumulative_reward
@@ -98,6 +134,27 @@ class DeepQLearning:
         for layer in policy_network_layers:
             target_network_layers[layer] = policy_network_layers[layer] \
               * self.tau + target_network_layers[layer] * (1 - self.tau)
+        self.target_network.model.load_state_dict(target_network_layers)
+        # The cached target values are stale
+        self._target_values = None
+
+    def _max_target_values(self) -> torch.Tensor:
+        """
+        Return the maximum Q-value of the target network for every state,
+        computed in a single forward pass over the whole state space and
+        cached until the next target network update.
+
+        Returns
+        -------
+        torch.Tensor
+            The maximum target Q-value of each state.
+        """
+        if self._target_values is None:
+            with torch.no_grad():
+                self._target_values = self.target_network.model(
+                    self._one_hot
+                ).max(1).values
+        return self._target_values
 
     def _generate_one_sample(self) -> ActionWithReward:
         """
@@ -141,41 +198,143 @@ class DeepQLearning:
                 )
             return next
 
-    def _optimize_model(self) -> None:
-        # If not enough samples to train
-        if len(self.data) < self.batch_size:
-            return
+    def _batch_tensors(self, batch: TransitionBatch) -> Tuple[torch.Tensor, ...]:
+        """
+        Convert a batch of transitions into network inputs, the states
+        being one-hot encoded by indexing a cached identity matrix.
 
-        batch = self.data.sample(self.batch_size)
-        states, actions, rewards, n_states = Memory.prepare_batch(batch)
-        actions = Memory.action_to_index(actions)
-        policy_out = self.policy_network.model(
-            torch.Tensor(np.array(states))
-        )
-        q_values = self.policy_network.model(
-            torch.Tensor(np.array(states))
-        ).gather(1, actions.unsqueeze(1)).squeeze(0)
+        Parameters
+        ----------
+        batch: TransitionBatch
+            The transitions, by columns.
 
-        non_final_mask = torch.tensor(
-            tuple(map(lambda s: s is not None, n_states)),
-            dtype=torch.bool
-        )
-        non_final_next_states = torch.tensor(
-            np.array([s for s in n_states if s is not None])
-        )
+        Returns
+        -------
+        Tuple[torch.Tensor, ...]
+            The encoded states, the action indices, the rewards, the
+            indices of the next states and the non final mask.
+        """
+        non_final_mask = torch.from_numpy(~batch.done)
+        states = self._one_hot[torch.from_numpy(batch.state.astype(np.int64))]
+        next_states = torch.from_numpy(batch.next_state.astype(np.int64))
+        actions = torch.from_numpy(batch.action.astype(np.int64))
+        rewards = torch.from_numpy(batch.reward)
+        return states, actions, rewards, next_states, non_final_mask
 
-        vs = torch.zeros(self.batch_size)
-        with torch.no_grad():
-            vs[non_final_mask] = self.target_network.model(
-                non_final_next_states
-            ).max(1).values
+    def _loss(
+        self,
+        batch: TransitionBatch,
+        weights: torch.Tensor | None = None
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Compute the loss of the policy network on a batch of transitions.
 
-        target_q_values = self._target_q(
-            torch.tensor(np.array(rewards, dtype="float32")), vs
+        Parameters
+        ----------
+        batch: TransitionBatch
+            The transitions, by columns.
+        weights: torch.Tensor | None, default=None
+            The importance-sampling weight of each transition. The loss
+            function is then evaluated per transition with its functional
+            form, see `_elementwise_loss()`.
+
+        Returns
+        -------
+        Tuple[torch.Tensor, torch.Tensor]
+            The loss and the temporal difference error of each transition.
+
+        Raises
+        ------
+        TypeError
+            If weights are given with a loss function that cannot be
+            evaluated per transition.
+        """
+        states, actions, rewards, next_states, non_final_mask = \
+            self._batch_tensors(batch)
+        q_values = self.policy_network.model(states).gather(
+            1, actions.unsqueeze(1)
         )
-        #print(q_values, target_q_values)
+        if self.cache_targets:
+            vs = torch.where(
+                non_final_mask,
+                self._max_target_values()[next_states],
+                0.0
+            )
+        else:
+            vs = torch.zeros(len(actions))
+            with torch.no_grad():
+                vs[non_final_mask] = self.target_network.model(
+                    self._one_hot[next_states[non_final_mask]]
+                ).max(1).values
+        target_q_values = self._target_q(rewards, vs).unsqueeze(1)
+        errors = (target_q_values - q_values).detach().squeeze(1)
+        if weights is None:
+            return self.loss_function(q_values, target_q_values), errors
+        losses = _elementwise_loss(self.loss_function)(
+            q_values, target_q_values
+        )
+        return (weights * losses.squeeze(1)).mean(), errors
+
+    def _optimize_model(self) -> None:
+        # If not enough samples to train
+        if len(self.data) < self.batch_size:
+            return
 
-        loss = self.loss_function(q_values, target_q_values.unsqueeze(1))
+        if isinstance(self.data, PrioritizedMemory):
+            indices = self.data.sample_indices(self.batch_size)
+            loss, errors = self._loss(
+                self.data.gather(indices),
+                torch.from_numpy(self.data.weights(indices))
+            )
+        else:
+            loss, _ = self._loss(self.data.sample_batch(self.batch_size))
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
+        if isinstance(self.data, PrioritizedMemory):
+            self.data.update_priorities(indices, errors.numpy())
+
+
+def _elementwise_loss(
+    loss_function: Callable[[torch.Tensor, torch.Tensor], torch.Tensor]
+) -> Callable[[torch.Tensor, torch.Tensor], torch.Tensor]:
+    """
+    The functional form of a torch loss, with the same parameters but
+    evaluated per element, to weight each transition of a batch.
+
+    Parameters
+    ----------
+    loss_function: Callable[[torch.Tensor, torch.Tensor], torch.Tensor]
+        A SmoothL1Loss, HuberLoss, MSELoss or L1Loss.
+
+    Returns
+    -------
+    Callable[[torch.Tensor, torch.Tensor], torch.Tensor]
+        The loss of each element.
+
+    Raises
+    ------
+    TypeError
+        If the loss function has no known functional form.
+    """
+    functional = torch.nn.functional
+    if isinstance(loss_function, torch.nn.SmoothL1Loss):
+        return partial(
+            functional.smooth_l1_loss,
+            beta=loss_function.beta,
+            reduction="none"
+        )
+    if isinstance(loss_function, torch.nn.HuberLoss):
+        return partial(
+            functional.huber_loss,
+            delta=loss_function.delta,
+            reduction="none"
+        )
+    if isinstance(loss_function, torch.nn.MSELoss):
+        return partial(functional.mse_loss, reduction="none")
+    if isinstance(loss_function, torch.nn.L1Loss):
+        return partial(functional.l1_loss, reduction="none")
+    raise TypeError(
+        "Prioritized replay needs a SmoothL1Loss, HuberLoss, MSELoss or"
+        f" L1Loss, got {type(loss_function).__name__}."
+    )
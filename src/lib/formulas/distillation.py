@@ -0,0 +1,249 @@
+import random
+import multiprocessing
+import torch
+import numpy as np
+from typing import List
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.neural_network import Model
+from lib.data.q_table import QTable
+from lib.formulas.dynamic_programming import DynamicProgramming
+from lib.models.Engine import Engine
+from lib.policies.DistilledPolicy import DistilledPolicy
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+from lib.policies.Policy import Policy
+
+
+class Distillation:
+    """
+    Distill a policy into the action it takes in each state, served by a
+    DistilledPolicy, along with the Q-values of the distilled policy.
+
+    Attributes
+    ----------
+    env: GymnasiumGameEnvironment
+        The game environment.
+    gamma: float, default=1.0
+        The discount factor of the Q-values of the policies distilled
+        from their decisions.
+    engine: Engine, default=Engine.GYM
+        The stepping engine of the distilled policies.
+    """
+
+    def __init__(
+        self,
+        env: GymnasiumGameEnvironment,
+        gamma: float = 1.0,
+        engine: Engine = Engine.GYM
+    ) -> None:
+        self.env = env
+        self.gamma = gamma
+        self.engine = engine
+        self.solver = DynamicProgramming(env, gamma=gamma)
+
+    def reachable_states(self) -> np.ndarray:
+        """
+        The states reachable from the initial states of the game
+        environment, without going through a terminal transition.
+
+        Returns
+        -------
+        np.ndarray
+            The reachable states, sorted.
+        """
+        table = self.solver.table
+        distribution = self.env.unwrapped.initial_state_distrib  # type: ignore
+        reachable = np.asarray(distribution) > 0
+        layer = np.flatnonzero(reachable)
+        while len(layer) != 0:
+            next_states = table.next_state[layer][~table.terminated[layer]]
+            new = np.unique(next_states[~reachable[next_states]])
+            reachable[new] = True
+            layer = new
+        return np.flatnonzero(reachable)
+
+    def looping_states(self, actions: np.ndarray) -> np.ndarray:
+        """
+        The initial states from which following the actions of a
+        distilled policy never ends the game.
+
+        Parameters
+        ----------
+        actions: np.ndarray
+            The index of the action taken in each state.
+
+        Returns
+        -------
+        np.ndarray
+            The initial states of the looping trajectories, sorted.
+        """
+        table = self.solver.table
+        distribution = self.env.unwrapped.initial_state_distrib  # type: ignore
+        initial = np.flatnonzero(np.asarray(distribution) > 0)
+        states = initial.copy()
+        running = np.ones(len(states), dtype=bool)
+        # A deterministic trajectory that visits every state has looped
+        for _ in range(table.observation_space):
+            current = states[running]
+            moves = actions[current]
+            states[running] = table.next_state[current, moves]
+            running[running] = ~table.terminated[current, moves]
+            if not running.any():
+                break
+        return initial[running]
+
+    def _policy(self, actions: np.ndarray, q_table: QTable) -> DistilledPolicy:
+        return DistilledPolicy(
+            self.env,
+            actions=actions.astype(np.uint8),
+            data=q_table,
+            engine=self.engine
+        )
+
+    def from_q_table(self, q_table: QTable) -> DistilledPolicy:
+        """
+        Distill the greedy policy of a Q-table, e.g. computed by a solver.
+
+        Parameters
+        ----------
+        q_table: QTable
+            The Q-table, copied into the distilled policy.
+
+        Returns
+        -------
+        DistilledPolicy
+            The greedy policy.
+        """
+        values = np.array(q_table.values)
+        return self._policy(
+            values.argmax(axis=1), QTable(*values.shape, data=values)
+        )
+
+    def from_model(self, model: Model) -> DistilledPolicy:
+        """
+        Distill the greedy policy of a DQN model, with a single forward
+        pass over the one-hot encoding of every state.
+
+        Parameters
+        ----------
+        model: Model
+            The DQN model.
+
+        Returns
+        -------
+        DistilledPolicy
+            The greedy policy, with the Q-values of the model.
+        """
+        with torch.no_grad():
+            values = model(torch.eye(self.solver.table.observation_space))
+        return self.from_q_table(QTable(*values.shape, data=values.numpy()))
+
+    def from_policy(
+        self,
+        policy: Policy,
+        workers: int = 1,
+        seed: int | None = None,
+        check: bool = True
+    ) -> DistilledPolicy:
+        """
+        Distill a policy by asking its decision in every reachable state,
+        the other states keeping action 0. The Q-values are those of the
+        distilled policy, computed from the transition table.
+
+        A MonteCarloPolicy starts a new search from each state, other
+        policies decide from the state their game environment is brought
+        back to. Freezing a policy whose decisions change over time, e.g.
+        tie-broken at random, can make the distilled policy loop. A
+        MonteCarloPolicy needs a depth of at least 10 to always see the
+        next pickup or dropoff, and so to distill a policy that ends the
+        game from every initial state.
+
+        Parameters
+        ----------
+        policy: Policy
+            The policy to distill.
+        workers: int, default=1
+            The number of worker processes, each deciding in a share of
+            the states with its own copy of the policy.
+        seed: int | None, default=None
+            If given, the seed of the random generators of worker `i` is
+            `seed + i`.
+        check: bool, default=True
+            Whether to verify that the distilled policy ends the game from
+            every initial state, see `looping_states()`.
+
+        Returns
+        -------
+        DistilledPolicy
+            The distilled policy.
+
+        Raises
+        ------
+        ValueError
+            If the number of workers is not positive, or if the distilled
+            policy never ends the game from some initial states.
+        """
+        if workers < 1:
+            raise ValueError("The number of workers should be positive.")
+        states = self.reachable_states()
+        actions = np.zeros(self.solver.table.observation_space, dtype=np.int64)
+        if workers == 1:
+            if seed is not None:
+                random.seed(seed)
+                np.random.seed(seed)
+            actions[states] = _decide(policy, states.tolist())
+        else:
+            context = multiprocessing.get_context()
+            shares = [states[worker::workers] for worker in range(workers)]
+            with context.Pool(workers) as pool:
+                results = pool.starmap(_distill_worker, [
+                    (
+                        policy,
+                        share.tolist(),
+                        None if seed is None else seed + worker
+                    )
+                    for worker, share in enumerate(shares)
+                ])
+            for share, result in zip(shares, results):
+                actions[share] = result
+        if check:
+            looping = self.looping_states(actions)
+            if len(looping) != 0:
+                raise ValueError(
+                    f"The distilled policy never ends the game from"
+                    f" {len(looping)} initial states: {looping.tolist()}."
+                )
+        values = self.solver.evaluate(actions)
+        return self._policy(actions, QTable(*values.shape, data=values))
+
+
+def _decide(policy: Policy, states: List[int]) -> List[int]:
+    """
+    Ask the decision of a policy in each state.
+    """
+    actions = []
+    for state in states:
+        if isinstance(policy, MonteCarloPolicy):
+            policy.reset_to(state)
+        else:
+            policy.game_env.back_to(state)
+        actions.append(policy.next_action().action.value)  # type: ignore
+    return actions
+
+
+def _distill_worker(
+    policy: Policy,
+    states: List[int],
+    seed: int | None
+) -> List[int]:
+    """
+    Ask the decision of a copy of a policy in a worker process.
+
+    Returns
+    -------
+    List[int]
+        The index of the action taken in each state.
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    return _decide(policy, states)
@@ -0,0 +1,188 @@
+import time
+import numpy as np
+from typing import Tuple
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.q_table import QTable
+from lib.environment.transition_table import TransitionTable
+from lib.models.Metrics import SolverMetrics
+
+
+class DynamicProgramming:
+    """
+    Provide exact solvers computing the optimal Q-Table of a
+    deterministic game environment from its transition table.
+
+    Attributes
+    ----------
+    gamma: float, default=1.0
+        The discount factor.
+    tolerance: float, default=1e-9
+        The largest change of a Q-value between two sweeps under which
+        the solver has converged.
+    max_iterations: int, default=10000
+        The maximum number of sweeps.
+    data: QTable
+        The Q-Table computed by the last solver run.
+    """
+
+    def __init__(
+        self,
+        env: GymnasiumGameEnvironment,
+        gamma: float = 1.0,
+        tolerance: float = 1e-9,
+        max_iterations: int = 10000
+    ) -> None:
+        self.table = TransitionTable.shared(env)
+        self.gamma = gamma
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.data = QTable(
+            self.table.observation_space, self.table.action_space
+        )
+        # Bootstrapping factor of each transition, none after termination
+        self._discount = self.gamma * ~self.table.terminated
+
+    def _backup(self, v: np.ndarray) -> np.ndarray:
+        """
+        Apply the Bellman backup to a state-value vector.
+
+        Parameters
+        ----------
+        v: np.ndarray
+            The value of each state.
+
+        Returns
+        -------
+        np.ndarray
+            The Q-value of each (state, action).
+        """
+        return self.table.reward + self._discount * v[self.table.next_state]
+
+    def value_iteration(self) -> SolverMetrics:
+        """
+        Compute the optimal Q-Table by value iteration.
+
+        Returns
+        -------
+        SolverMetrics
+            The number of sweeps, the last change of a Q-value, whether
+            the solver converged and the elapsed time in seconds.
+        """
+        start = time.perf_counter()
+        q = np.zeros_like(self.table.reward)
+        delta = np.inf
+        iterations = 0
+        while iterations < self.max_iterations and delta > self.tolerance:
+            new_q = self._backup(q.max(axis=1))
+            delta = float(np.abs(new_q - q).max())
+            q = new_q
+            iterations += 1
+        self.data.values = q
+        return SolverMetrics(
+            iterations=iterations,
+            delta=delta,
+            converged=delta <= self.tolerance,
+            elapsed=time.perf_counter() - start
+        )
+
+    def _evaluate(
+        self,
+        policy: np.ndarray,
+        v: np.ndarray
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Evaluate a deterministic policy by iterated backups. When `gamma`
+        is 1, the evaluation stops after as many sweeps as there are
+        states, see `policy_iteration()`.
+
+        Parameters
+        ----------
+        policy: np.ndarray
+            The index of the action taken in each state.
+        v: np.ndarray
+            The initial value of each state.
+
+        Returns
+        -------
+        Tuple[np.ndarray, float]
+            The value of each state and the last change of a value.
+        """
+        if self.gamma < 1.0:
+            max_sweeps = self.max_iterations
+        else:
+            max_sweeps = self.table.observation_space
+        states = np.arange(self.table.observation_space)
+        reward = self.table.reward[states, policy]
+        discount = self._discount[states, policy]
+        next_state = self.table.next_state[states, policy]
+        delta = np.inf
+        for _ in range(max_sweeps):
+            new_v = reward + discount * v[next_state]
+            delta = float(np.abs(new_v - v).max())
+            v = new_v
+            if delta <= self.tolerance:
+                break
+        return v, delta
+
+    def evaluate(self, policy: np.ndarray) -> np.ndarray:
+        """
+        Compute the Q-values of a deterministic policy: the return of
+        taking an action then following the policy.
+
+        Parameters
+        ----------
+        policy: np.ndarray
+            The index of the action taken in each state.
+
+        Returns
+        -------
+        np.ndarray
+            The Q-value of each (state, action).
+        """
+        v, _ = self._evaluate(
+            np.asarray(policy, dtype=np.int64),
+            np.zeros(self.table.observation_space)
+        )
+        return self._backup(v)
+
+    def policy_iteration(self) -> SolverMetrics:
+        """
+        Compute the optimal Q-Table by policy iteration. Each policy is
+        evaluated by iterated backups. When `gamma` is 1, the evaluation
+        stops after as many sweeps as there are states: the value of a
+        terminating policy is exact by then, while a policy that never
+        terminates is left with a value low enough to be improved.
+
+        Returns
+        -------
+        SolverMetrics
+            The number of policy improvements, the last change of a
+            state value during evaluation, whether the solver converged
+            and the elapsed time in seconds.
+        """
+        start = time.perf_counter()
+        states = np.arange(self.table.observation_space)
+        policy = np.zeros(self.table.observation_space, dtype=np.int64)
+        v = np.zeros(self.table.observation_space)
+        delta = np.inf
+        iterations = 0
+        converged = False
+        while iterations < self.max_iterations:
+            iterations += 1
+            v, delta = self._evaluate(policy, v)
+            # Policy improvement, keeping the current action on ties
+            q = self._backup(v)
+            new_policy = q.argmax(axis=1)
+            stable = q[states, new_policy] <= q[states, policy] + self.tolerance
+            new_policy[stable] = policy[stable]
+            if (new_policy == policy).all():
+                converged = True
+                break
+            policy = new_policy
+        self.data.values = self._backup(v)
+        return SolverMetrics(
+            iterations=iterations,
+            delta=delta,
+            converged=converged,
+            elapsed=time.perf_counter() - start
+        )
@@ -1,20 +1,367 @@
-from lib.data.monte_carlo_tree import MonteCarloTree
+import math
+import random
+import time
+import torch
+import numpy as np
+from enum import Enum
+from typing import List, Tuple
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.neural_network import Model
 from lib.data.q_table import QTable
+from lib.environment.transition_table import TransitionTable
+from lib.models.Action import Action
+from lib.models.Metrics import SearchMetrics
 
 
 class MonteCarloTreeSearchFormula:
     """
-    Provide util functions to compute MonteCarlo steps.
+    Provide a Monte Carlo Tree Search over the transitions of a
+    deterministic game environment. Each iteration selects a path down
+    the tree by upper confidence bound, expands the reached node,
+    evaluates it by a rollout or by the value of `data`, and backs the
+    return up along the path.
+
+    Without `data` the selection follows UCT. With a QTable or a DQN
+    Model, its Q-values of a state give a softmax prior over the legal
+    actions and the selection follows PUCT.
 
     Attributes
     ----------
+    table: TransitionTable
+        The transitions of the game environment.
+    data: QTable | Model | None, default=None
+        The Q-values used as prior and, depending on `rollout`, as value.
+    exploration: float, default=1.0
+        The weight of the exploration term of the upper confidence bound,
+        the Q-values being normalized to [0, 1] over the tree.
+    gamma: float, default=0.95
+        The discount factor of the backed up returns.
+    rollout: Rollout, default=Rollout.RANDOM
+        How a new node is evaluated.
+    rollout_depth: int, default=100
+        The maximum number of steps of a rollout.
+    temperature: float, default=1.0
+        The temperature of the softmax prior.
     """
-    
+
+    class Rollout(Enum):
+        # Uniform legal actions
+        RANDOM = "random"
+        # Best legal action according to `data`
+        GREEDY = "greedy"
+        # No rollout, the best Q-value of `data`
+        VALUE = "value"
+
     def __init__(
         self,
-        data: MonteCarloTree | QTable | None = None
+        env: GymnasiumGameEnvironment,
+        data: QTable | Model | None = None,
+        exploration: float = 1.0,
+        gamma: float = 0.95,
+        rollout: Rollout = Rollout.RANDOM,
+        rollout_depth: int = 100,
+        temperature: float = 1.0
     ) -> None:
+        if data is None and rollout is not MonteCarloTreeSearchFormula.Rollout.RANDOM:
+            raise ValueError(
+                f"The {rollout.value} rollout requires a QTable or a Model."
+            )
+        self.table = TransitionTable.shared(env)
         self.data = data
+        self.exploration = exploration
+        self.gamma = gamma
+        self.rollout = rollout
+        self.rollout_depth = rollout_depth
+        self.temperature = temperature
+        # Plain lists are much faster than arrays for scalar lookups
+        self._next_state: List[List[int]] = self.table.next_state.tolist()
+        self._reward: List[List[float]] = self.table.reward.tolist()
+        self._terminated: List[List[bool]] = self.table.terminated.tolist()
+        self._legal_actions: List[List[int]] = [
+            np.flatnonzero(mask).tolist() for mask in self.table.action_mask
+        ]
+        self._q_values: np.ndarray | None = None
+        if isinstance(data, QTable):
+            self._q_values = data.values
+        self._reset(0)
+
+    def _reset(self, root_state: int) -> None:
+        """
+        Start a new tree made of a single root node.
+        """
+        self.parent: List[int] = [-1]
+        self.action: List[int] = [-1]
+        self.state: List[int] = [root_state]
+        self.reward: List[float] = [0.0]
+        self.terminal: List[bool] = [False]
+        self.prior: List[float] = [1.0]
+        self.visits: List[int] = [0]
+        self.value_sum: List[float] = [0.0]
+        self.depth: List[int] = [0]
+        self.children: List[range] = [range(0)]
+        self.expanded: List[bool] = [False]
+        self.visited_node = 0
+        self._min_q = math.inf
+        self._max_q = -math.inf
+
+    def q_values(self, state: int) -> np.ndarray:
+        """
+        The Q-values of a state according to `data`.
+        """
+        if self._q_values is not None:
+            return self._q_values[state]
+        model: Model = self.data  # type: ignore
+        with torch.no_grad():
+            one_hot = torch.zeros(self.table.observation_space)
+            one_hot[state] = 1.0
+            return model(one_hot).numpy()
+
+    def _expand(self, node: int) -> None:
+        """
+        Create the children of a node, one per legal action.
+        """
+        self.expanded[node] = True
+        state = self.state[node]
+        actions = self._legal_actions[state]
+        if self.data is not None:
+            q = self.q_values(state)[actions] / self.temperature
+            exp = np.exp(q - q.max())
+            priors = (exp / exp.sum()).tolist()
+        else:
+            priors = [1.0] * len(actions)
+        start = len(self.state)
+        for action, prior in zip(actions, priors):
+            self.parent.append(node)
+            self.action.append(action)
+            self.state.append(self._next_state[state][action])
+            self.reward.append(self._reward[state][action])
+            self.terminal.append(self._terminated[state][action])
+            self.prior.append(prior)
+            self.visits.append(0)
+            self.value_sum.append(0.0)
+            self.depth.append(self.depth[node] + 1)
+            self.children.append(range(0))
+            self.expanded.append(False)
+        self.children[node] = range(start, len(self.state))
+        self.visited_node += len(actions)
+
+    def _select(self, node: int) -> int:
+        """
+        Choose the child of a node maximizing the upper confidence bound,
+        unvisited children first when there is no prior.
+        """
+        children = self.children[node]
+        parent_visits = self.visits[node]
+        span = self._max_q - self._min_q
+        if self.data is None:
+            unvisited = [c for c in children if self.visits[c] == 0]
+            if len(unvisited) != 0:
+                return random.choice(unvisited)
+            log_visits = math.log(parent_visits)
+        else:
+            sqrt_visits = math.sqrt(parent_visits)
+        best_score = -math.inf
+        best_children: List[int] = []
+        for child in children:
+            visits = self.visits[child]
+            if visits == 0:
+                q = 0.0
+            elif span > 0:
+                q = (self.value_sum[child] / visits - self._min_q) / span
+            else:
+                q = 0.5
+            if self.data is None:
+                score = q + self.exploration * math.sqrt(log_visits / visits)
+            else:
+                score = q + self.exploration * self.prior[child] \
+                    * sqrt_visits / (1 + visits)
+            if score > best_score:
+                best_score = score
+                best_children = [child]
+            elif score == best_score:
+                best_children.append(child)
+        return random.choice(best_children)
+
+    def _evaluate(self, state: int) -> float:
+        """
+        Estimate the return from a state.
+        """
+        if self.rollout is MonteCarloTreeSearchFormula.Rollout.VALUE:
+            return float(self.q_values(state)[self._legal_actions[state]].max())
+        greedy = self.rollout is MonteCarloTreeSearchFormula.Rollout.GREEDY
+        value = 0.0
+        discount = 1.0
+        for _ in range(self.rollout_depth):
+            actions = self._legal_actions[state]
+            if greedy:
+                q = self.q_values(state)
+                action = max(actions, key=lambda a: q[a])
+            else:
+                action = random.choice(actions)
+            value += discount * self._reward[state][action]
+            discount *= self.gamma
+            self.visited_node += 1
+            if self._terminated[state][action]:
+                break
+            state = self._next_state[state][action]
+        return value
+
+    def _backup(self, node: int, value: float) -> None:
+        """
+        Propagate the return of a node up to the root.
+        """
+        while node != -1:
+            self.visits[node] += 1
+            if self.parent[node] != -1:
+                value = self.reward[node] + self.gamma * value
+                self.value_sum[node] += value
+                q = self.value_sum[node] / self.visits[node]
+                self._min_q = min(self._min_q, q)
+                self._max_q = max(self._max_q, q)
+            node = self.parent[node]
+
+    def train(
+        self,
+        root_state: int,
+        iterations: int,
+        time_budget: float | None = None
+    ) -> SearchMetrics:
+        """
+        Build a new tree from a state.
+
+        Parameters
+        ----------
+        root_state: int
+            The state of the root node.
+        iterations: int
+            The number of selection, expansion, evaluation and backup
+            iterations.
+        time_budget: float | None, default=None
+            If given, the search also stops after this many seconds.
+
+        Returns
+        -------
+        SearchMetrics
+            The deepest node, the number of transitions simulated in the
+            tree and the rollouts, the elapsed time in seconds and whether
+            the time budget stopped the search.
+        """
+        start = time.perf_counter()
+        self._reset(root_state)
+        interrupted = False
+        for iteration in range(iterations):
+            if time_budget is not None and iteration > 0 \
+                    and time.perf_counter() - start >= time_budget:
+                interrupted = True
+                break
+            node = 0
+            # Selection, a node is expanded the second time it is reached
+            while not self.terminal[node]:
+                if not self.expanded[node]:
+                    if node != 0 and self.visits[node] == 0:
+                        break
+                    self._expand(node)
+                if len(self.children[node]) == 0:
+                    break
+                node = self._select(node)
+            if self.terminal[node]:
+                value = 0.0
+            else:
+                value = self._evaluate(self.state[node])
+            self._backup(node, value)
+        return SearchMetrics(
+            depth=max(self.depth),
+            visited_node=self.visited_node,
+            elapsed=time.perf_counter() - start,
+            interrupted=interrupted
+        )
+
+    def best_action(self) -> Action:
+        """
+        The most visited action of the root node, the best mean return
+        breaking ties.
+        """
+        def key(child: int):
+            visits = self.visits[child]
+            mean = self.value_sum[child] / visits if visits else -math.inf
+            return (visits, mean)
+        return Action(self.action[max(self.children[0], key=key)])
 
-    def train(self):
-        pass
\ No newline at end of file
+    @staticmethod
+    def merge_root_statistics(statistics: List[np.ndarray]) -> np.ndarray:
+        """
+        Merge the root statistics of independent searches from the same
+        state, summing the visit counts and averaging the mean returns
+        weighted by the visit counts.
+
+        Parameters
+        ----------
+        statistics: List[np.ndarray]
+            The `root_statistics()` of each search.
+
+        Returns
+        -------
+        np.ndarray
+            The merged statistics, of shape `(action_space, 2)`.
+        """
+        stacked = np.stack(statistics)
+        visits = stacked[:, :, 0].sum(axis=0)
+        returns = (stacked[:, :, 0] * stacked[:, :, 1]).sum(axis=0)
+        merged = np.zeros_like(stacked[0])
+        merged[:, 0] = visits
+        np.divide(returns, visits, out=merged[:, 1], where=visits > 0)
+        return merged
+
+    @staticmethod
+    def best_root_action(statistics: np.ndarray) -> Action:
+        """
+        The most visited action of root statistics, the best mean return
+        breaking ties, see `best_action()`.
+        """
+        visits, means = statistics[:, 0], statistics[:, 1]
+        means = np.where(visits > 0, means, -np.inf)
+        return Action(int(np.lexsort((means, visits))[-1]))
+
+    def root_statistics(self) -> np.ndarray:
+        """
+        The visit count and the mean return of each action of the root
+        node, of shape `(action_space, 2)`, zero for illegal actions.
+        """
+        statistics = np.zeros((self.table.action_space, 2))
+        for child in self.children[0]:
+            visits = self.visits[child]
+            statistics[self.action[child], 0] = visits
+            if visits:
+                statistics[self.action[child], 1] = \
+                    self.value_sum[child] / visits
+        return statistics
+
+
+# Search of the current worker process, set by the pool initializer
+_WORKER_FORMULA: MonteCarloTreeSearchFormula | None = None
+
+
+def _init_search_worker(formula: MonteCarloTreeSearchFormula) -> None:
+    global _WORKER_FORMULA
+    _WORKER_FORMULA = formula
+
+
+def _search_worker(
+    root_state: int,
+    iterations: int,
+    time_budget: float | None,
+    seed: int
+) -> Tuple[np.ndarray, SearchMetrics]:
+    """
+    Search from a state in a worker process, reusing the search set up
+    by the pool initializer.
+
+    Returns
+    -------
+    Tuple[np.ndarray, SearchMetrics]
+        The root statistics and the metrics of the search.
+    """
+    random.seed(seed)
+    formula: MonteCarloTreeSearchFormula = _WORKER_FORMULA  # type: ignore
+    metrics = formula.train(root_state, iterations, time_budget)
+    return formula.root_statistics(), metrics
@@ -1,12 +1,19 @@
+from __future__ import annotations
+import random
+import multiprocessing
 import numpy as np
-from typing import List
+from contextlib import nullcontext
+from enum import Enum
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, ContextManager, List
 from tqdm import tqdm
+from lib.environment.vector_environment import VectorGameEnvironment
 from lib.models.Action import Action, ActionWithReward
 from lib.models.GameStatus import GameStatus
 from lib.models.Metrics import EpisodeMetrics, StepResult
 from lib.models.Policies import Policies
 from lib.models.Metrics import Result
-from lib.data.q_table import QTable
+from lib.data.q_table import QTable, QTableHeader
 from lib.policies.GreedyPolicy import GreedyPolicy
 from lib.policies.EpsilonGreedyPolicy import EpsilonGreedyPolicy
 from lib.policies.MonteCarloPolicy import MonteCarloPolicy
@@ -26,8 +33,30 @@ class QLearning:
         for each new episode.
     cutoff_score: int
         If the cutoff score is reached, stop the episode.
+    data: QTable
+        The Q-Table, also followed by the greedy policies.
     """
 
+    class Duplicates(Enum):
+        """
+        How a batched update handles several transitions from the same
+        (state, action) pair.
+        - SEQUENTIAL: same result as applying the transitions one by one
+        - AVERAGE: apply the mean of the targets computed on the table
+          as it was before the batch
+        """
+        SEQUENTIAL = "sequential"
+        AVERAGE = "average"
+
+    class Locking(Enum):
+        """
+        How parallel workers synchronize their Q-Table updates.
+        - NONE: lock-free updates (Hogwild)
+        - STRIPED: each row is guarded by one of a few shared locks
+        """
+        NONE = "none"
+        STRIPED = "striped"
+
     def __init__(
         self,
         observation_space: int,
@@ -43,11 +72,41 @@ class QLearning:
         self.gamma = gamma
         self.lr = lr
         self.advantage = advantage
+        self.policy = policy
         if data is None:
             self.data = QTable(observation_space, action_space)
         else:
             self.data = data
-        self.policy = policy
+        self.episode = 0
+        self._row_locks: List[Any] = []
+
+    @property
+    def data(self) -> QTable:
+        return self._data
+
+    @data.setter
+    def data(self, data: QTable) -> None:
+        self._data = data
+        if isinstance(self.policy, GreedyPolicy):
+            self.policy.data = data
+
+    def _lock_row(self, state: int) -> ContextManager:
+        """
+        The lock guarding the updates of a Q-Table row, if any.
+
+        Parameters
+        ----------
+        state: int
+            The row of the Q-Table.
+
+        Returns
+        -------
+        ContextManager
+            The lock of the row, or a no-op context without locks.
+        """
+        if self._row_locks:
+            return self._row_locks[state % len(self._row_locks)]
+        return nullcontext()
 
     def do_step(self) -> StepResult:
         """
@@ -60,10 +119,11 @@ class QLearning:
             and the immediate reward for taking the current step.
         """
         current_state = self.policy.game_env.state
-        next = self.q_star(current_state)
-        # Update Q-Table // `self.policy.game_env.state` is updated,
-        # corresponding to `next_state`
-        self.data.values[current_state, next.action.value] = next.bellman
+        with self._lock_row(current_state):
+            next = self.q_star(current_state)
+            # Update Q-Table // `self.policy.game_env.state` is updated,
+            # corresponding to `next_state`
+            self.data.values[current_state, next.action.value] = next.bellman
         return StepResult(
             action=next.action,
             game_status=next.game_status,
@@ -96,23 +156,339 @@ class QLearning:
             cumulative_reward=cumulative_reward
         )
 
-    def train(self, num_episodes: int) -> List[EpisodeMetrics]:
+    def train(
+        self,
+        num_episodes: int,
+        workers: int | None = None,
+        seed: int | None = None,
+        locking: Locking = Locking.NONE,
+        stripes: int = 16,
+        checkpoint: str | None = None,
+        checkpoint_every: int = 100
+    ) -> List[EpisodeMetrics]:
         """
-        Train the model for a given number of episodes.
+        Train the model for a given number of episodes. With `workers`,
+        the episodes are spread over a pool of processes, each with its
+        own game environment, all updating the Q-Table in shared memory.
 
         Parameters
         ----------
         num_episodes: int
             The number of episodes.
+        workers: int | None, default=None
+            The number of worker processes. Train in the current process
+            if None.
+        seed: int | None, default=None
+            The base seed of the workers, worker `i` being seeded with
+            `seed + i`. A single seeded worker gives reproducible results.
+        locking: QLearning.Locking, default=Locking.NONE
+            How the workers synchronize their Q-Table updates.
+        stripes: int, default=16
+            The number of locks shared by the rows with striped locking.
+        checkpoint: str | None, default=None
+            The file in which to checkpoint the model, see `resume()`.
+            It is written at the end of the training and, without
+            workers, every `checkpoint_every` episodes.
+        checkpoint_every: int, default=100
+            The number of episodes between two checkpoints.
 
         Returns
         -------
         List[EpisodeMetrics]
-            A list of episode metrics.
+            A list of episode metrics, in episode order. In parallel,
+            episode `i` is run by worker `i % workers`.
         """
+        if workers is not None:
+            metrics = self._train_parallel(
+                num_episodes, workers, seed, locking, stripes
+            )
+            self.episode += num_episodes
+            if checkpoint is not None:
+                self.checkpoint(checkpoint)
+            return metrics
         metrics = []
         for _ in tqdm(range(num_episodes)):
             metrics.append(self.do_episode())
+            self.episode += 1
+            if checkpoint is not None and (
+                self.episode % checkpoint_every == 0
+                or len(metrics) == num_episodes
+            ):
+                self.checkpoint(checkpoint)
+        return metrics
+
+    def _train_parallel(
+        self,
+        num_episodes: int,
+        workers: int,
+        seed: int | None,
+        locking: Locking,
+        stripes: int
+    ) -> List[EpisodeMetrics]:
+        """
+        Train the model over a pool of worker processes, see `train()`.
+        """
+        if workers < 1:
+            raise ValueError("The number of workers should be positive.")
+        table = self.data
+        values = table.values
+        shared_memory = SharedMemory(create=True, size=values.nbytes)
+        try:
+            QTable.from_shared_memory(
+                shared_memory, *values.shape
+            ).values[:] = values
+            context = multiprocessing.get_context()
+            locks = []
+            if locking is QLearning.Locking.STRIPED:
+                locks = [context.Lock() for _ in range(stripes)]
+            # The pool gets a copy of the model without its Q-Table
+            self.data = QTable(*values.shape)
+            try:
+                with context.Pool(
+                    workers,
+                    initializer=_init_worker,
+                    initargs=(locks,)
+                ) as pool:
+                    results = pool.starmap(_train_worker, [
+                        (
+                            self,
+                            shared_memory.name,
+                            worker,
+                            None if seed is None else seed + worker,
+                            len(range(worker, num_episodes, workers))
+                        )
+                        for worker in range(workers)
+                    ])
+            finally:
+                self.data = table
+            values[:] = QTable.from_shared_memory(
+                shared_memory, *values.shape
+            ).values
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+        return [
+            results[episode % workers][episode // workers]
+            for episode in range(num_episodes)
+        ]
+
+    def checkpoint(self, path: str) -> None:
+        """
+        Save the Q-Table with the hyperparameters, the number of episodes
+        done and the state of the random generators, so that the training
+        can be resumed.
+
+        Parameters
+        ----------
+        path: str
+            The checkpoint file, atomically replaced.
+        """
+        game_env = self.policy.game_env
+        game_env.sync_rng()
+        numpy_state = np.random.get_state(legacy=False)
+        numpy_state["state"]["key"] = numpy_state["state"]["key"].tolist()  # type: ignore
+        rng_state = {
+            "numpy": numpy_state,
+            "env": game_env.env.unwrapped.np_random.bit_generator.state,
+            "action_space": game_env.env.action_space.np_random
+                                    .bit_generator.state
+        }
+        self.data.save(path, QTableHeader(
+            observation_space=self.data.values.shape[0],
+            action_space=self.data.values.shape[1],
+            gamma=self.gamma,
+            lr=self.lr,
+            episode=self.episode,
+            rng_state=rng_state
+        ))
+
+    def resume(self, path: str) -> QTableHeader:
+        """
+        Restore the model from a checkpoint written by `checkpoint()`.
+        The Q-Table is loaded in memory so that the training does not
+        alter the checkpoint.
+
+        Parameters
+        ----------
+        path: str
+            The checkpoint file.
+
+        Returns
+        -------
+        QTableHeader
+            The header of the checkpoint.
+        """
+        checkpoint = QTable.load(path, mode="c")
+        header: QTableHeader = checkpoint.header  # type: ignore
+        self.data = QTable(
+            header.observation_space,
+            header.action_space,
+            data=np.array(checkpoint.values)
+        )
+        self.data.header = header
+        if header.gamma is not None:
+            self.gamma = header.gamma
+        if header.lr is not None:
+            self.lr = header.lr
+        self.episode = header.episode
+        if header.rng_state is not None:
+            numpy_state = header.rng_state["numpy"]
+            numpy_state["state"]["key"] = np.array(
+                numpy_state["state"]["key"], dtype=np.uint32
+            )
+            np.random.set_state(numpy_state)
+            game_env = self.policy.game_env
+            game_env.sync_rng()
+            game_env.env.unwrapped.np_random.bit_generator.state = \
+                header.rng_state["env"]
+            game_env.env.action_space.np_random.bit_generator.state = \
+                header.rng_state["action_space"]
+        return header
+
+    def do_batch_update(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        duplicates: Duplicates = Duplicates.SEQUENTIAL
+    ) -> None:
+        """
+        Apply the Bellman update of a batch of transitions to the Q-Table.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The state of each transition.
+        actions: np.ndarray
+            The index of the action of each transition.
+        rewards: np.ndarray
+            The reward of each transition.
+        next_states: np.ndarray
+            The state reached by each transition.
+        duplicates: QLearning.Duplicates, default=Duplicates.SEQUENTIAL
+            How to handle transitions sharing the same (state, action).
+        """
+        values = self.data.values
+        action_space = values.shape[1]
+        cells = states * action_space + actions
+        targets = values[states, actions] + self.lr * (
+            rewards + self.gamma * values[next_states].max(axis=1)
+            - values[states, actions]
+        )
+        if duplicates is QLearning.Duplicates.AVERAGE:
+            unique_cells, inverse = np.unique(cells, return_inverse=True)
+            sums = np.bincount(inverse, weights=targets)
+            counts = np.bincount(inverse)
+            values.flat[unique_cells] = sums / counts
+            return
+        # A transition is clean if no previous transition of the batch
+        # wrote its cell or the row of its next state: its target does not
+        # depend on the order of the updates.
+        size = len(cells)
+        order = np.arange(size)
+        first_cell_write = np.full(values.size, size)
+        np.minimum.at(first_cell_write, cells, order)
+        first_row_write = np.full(values.shape[0], size)
+        np.minimum.at(first_row_write, states, order)
+        dirty = np.flatnonzero(
+            (first_cell_write[cells] < order)
+            | (first_row_write[next_states] < order)
+        )
+        clean = np.ones(size, dtype=bool)
+        clean[dirty] = False
+        start = 0
+        for index in dirty:
+            chunk = np.flatnonzero(clean[start:index]) + start
+            values.flat[cells[chunk]] = targets[chunk]
+            state, action = states[index], actions[index]
+            values[state, action] += self.lr * (
+                rewards[index] + self.gamma * values[next_states[index]].max()
+                - values[state, action]
+            )
+            start = index + 1
+        chunk = np.flatnonzero(clean[start:]) + start
+        values.flat[cells[chunk]] = targets[chunk]
+
+    def train_vectorized(
+        self,
+        num_episodes: int,
+        num_envs: int = 64,
+        seed: int | None = None,
+        duplicates: Duplicates = Duplicates.SEQUENTIAL
+    ) -> List[EpisodeMetrics]:
+        """
+        Train the model for a given number of episodes by running many
+        game environments in lockstep. An episode stops when the game is
+        terminated or truncated, or when `max_steps` is reached. Instance
+        `i` starts from `seed + i`, later episodes start from unseeded
+        resets.
+
+        Parameters
+        ----------
+        num_episodes: int
+            The number of episodes.
+        num_envs: int, default=64
+            The number of game environments stepped at once.
+        seed: int | None, default=None
+            The base seed of the game environments.
+        duplicates: QLearning.Duplicates, default=Duplicates.SEQUENTIAL
+            How to handle transitions sharing the same (state, action)
+            within a step of the game environments.
+
+        Returns
+        -------
+        List[EpisodeMetrics]
+            A list of episode metrics, in the order episodes finished.
+        """
+        if not hasattr(self.policy, "next_actions"):
+            raise TypeError(
+                "Vectorized training requires a policy providing"
+                " `next_actions()`."
+            )
+        greedy = isinstance(self.policy, GreedyPolicy)
+        self.policy.reset_hyperparameters()
+        vector_env = VectorGameEnvironment(
+            self.policy.game_env.env, num_envs, seed=seed
+        )
+        steps = np.zeros(num_envs, dtype=np.int64)
+        cumulative_rewards = np.zeros(num_envs)
+        metrics: List[EpisodeMetrics] = []
+        with tqdm(total=num_episodes) as progress:
+            while len(metrics) < num_episodes:
+                states = vector_env.states
+                masks = vector_env.action_masks
+                if greedy:
+                    actions = self.policy.next_actions(  # type: ignore
+                        states,
+                        masks,
+                        self.data.values[states].argmax(axis=1),
+                        steps=steps
+                    )
+                else:
+                    actions = self.policy.next_actions(states, masks)  # type: ignore
+                next_states, rewards, term, trunc, _ = vector_env.step(actions)
+                self.do_batch_update(
+                    states, actions, rewards, next_states, duplicates
+                )
+                steps += 1
+                cumulative_rewards += rewards
+                limit = steps >= self.max_steps
+                done = np.flatnonzero(term | trunc | limit)
+                if len(done) == 0:
+                    continue
+                vector_env.reset_slots(
+                    np.flatnonzero(limit & ~(term | trunc))
+                )
+                finished = done[:num_episodes - len(metrics)]
+                for slot in finished:
+                    metrics.append(EpisodeMetrics(
+                        steps=int(steps[slot]),
+                        cumulative_reward=float(cumulative_rewards[slot])
+                    ))
+                progress.update(len(finished))
+                steps[done] = 0
+                cumulative_rewards[done] = 0.0
         return metrics
 
     @staticmethod
@@ -134,20 +510,36 @@ class QLearning:
         """
         return (n * p).sum()
 
+    def expected_values(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The expected Q-value of one or many states under the policy, as
+        used by Expected SARSA targets.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The expected Q-value of each state, of the shape of `states`.
+        """
+        return np.einsum(
+            "...a,...a->...",
+            self.policy.probabilities(states),  # type: ignore
+            self.data.values[states]
+        )
+
     def j(self) -> float:
         """
-        Compute the expected value for each possible action at a given state.
+        Compute the expected value of the actions at the current state.
 
         Returns
         -------
-            The expected value for each possible action at a given state.
+            The expected value of the actions at the current state.
         """
-        return np.array([  # type: ignore
-            next.probability * self.data[  # type: ignore
-                self.policy.game_env.state, next.action.value
-            ]
-            for next in self.rewards()
-        ]).sum()
+        return float(self.expected_values(self.policy.game_env.state))
 
     def rewards(self) -> List[ActionWithReward]:
         """
@@ -160,11 +552,12 @@ class QLearning:
         """
         if self.policy.type is Policy.Type.PROBABILISTIC:
             actions_reward = []
-            actions_probability = self.policy.actions_probability()  # type: ignore
+            probabilities = self.policy.probabilities(  # type: ignore
+                self.policy.game_env.state
+            ).tolist()
             for action in self.policy.possible_actions():  # type: ignore
                 action_with_reward = self.policy.take_action(action)
-                action_with_reward.probability = actions_probability\
-                    .model_dump()[action.name]  # type: ignore
+                action_with_reward.probability = probabilities[action.value]
                 actions_reward.append(action_with_reward)
             return actions_reward
         else:
@@ -281,3 +674,54 @@ class QLearning:
                 ) + self.q(current_state, current.action),
                 game_status=current.game_status
             )
+
+
+# Locks of the current worker process, set by the pool initializer
+_WORKER_LOCKS: List[Any] = []
+
+
+def _init_worker(locks: List[Any]) -> None:
+    global _WORKER_LOCKS
+    _WORKER_LOCKS = locks
+
+
+def _train_worker(
+    model: QLearning,
+    shared_memory_name: str,
+    worker: int,
+    seed: int | None,
+    num_episodes: int
+) -> List[EpisodeMetrics]:
+    """
+    Run episodes in a worker process, updating the shared Q-Table.
+
+    Returns
+    -------
+    List[EpisodeMetrics]
+        The metrics of the episodes run by the worker.
+    """
+    shared_memory = SharedMemory(name=shared_memory_name)
+    observation_space, action_space = model.data.values.shape
+    model.data = QTable.from_shared_memory(
+        shared_memory, observation_space, action_space
+    )
+    model._row_locks = _WORKER_LOCKS
+    if seed is not None:
+        np.random.seed(seed)
+        random.seed(seed)
+        model.policy.game_env.env.action_space.seed(seed)
+        model.policy.game_env.reset(seed=seed)
+        if model.policy.seed is not None:  # type: ignore
+            model.policy.seed = seed  # type: ignore
+    metrics = []
+    for _ in range(num_episodes):
+        episode = model.do_episode()
+        metrics.append(EpisodeMetrics(
+            steps=episode.steps,
+            cumulative_reward=episode.cumulative_reward,
+            worker=worker
+        ))
+    # Release the buffer before closing the block
+    model.data = QTable(observation_space, action_space)
+    shared_memory.close()
+    return metrics
@@ -1,11 +1,12 @@
 from __future__ import annotations
 from enum import Enum
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from pydantic import BaseModel
 from numpy import array, ndarray
 from lib.errors.NotLegalActionException import NotLegalActionException
 from lib.models.EnvironmentInfo import EnvironmentInfo
 from lib.models.GameStatus import GameStatus
+from lib.models.Record import hot_path
 
 
 class Action(Enum):
@@ -111,25 +112,37 @@ class Action(Enum):
             raise NotLegalActionException
 
     @staticmethod
-    def legal_actions(info: EnvironmentInfo) -> Tuple[Action]:
+    def legal_actions(info: EnvironmentInfo | ndarray) -> Tuple[Action]:
         """
         Convert a Gymnasium indexed action into human readable format.
+        The tuples are interned, one per action mask.
 
         Parameters
         ----------
-        info: EnvInfo
-            Gymnasium information at a given step.
+        info: EnvInfo | ndarray
+            Gymnasium information at a given step, or its action mask.
 
         Returns
         -------
         Tuple[Action]
             A tuple of available actions at a given step.
         """
-        actions = []
-        for index, action in enumerate(info.action_mask):
-            if action == 1:
-                actions.append(list(Action)[index])
-        return tuple(actions)
+        mask = info if isinstance(info, ndarray) else info.action_mask
+        key = (mask.dtype.char, mask.tobytes())
+        actions = _LEGAL_ACTIONS_BY_MASK.get(key)
+        if actions is None:
+            bits = sum(1 << index for index, legal in enumerate(mask) if legal == 1)
+            actions = _LEGAL_ACTIONS_BY_MASK[key] = LEGAL_ACTIONS[bits]
+        return actions  # type: ignore
+
+
+# The interned tuple of legal actions of each action mask packed as a
+# bitmask, bit `i` being set if action `i` is legal
+LEGAL_ACTIONS: Tuple[Tuple[Action, ...], ...] = tuple(
+    tuple(action for action in Action if (bits >> action.value) & 1)
+    for bits in range(1 << len(Action))
+)
+_LEGAL_ACTIONS_BY_MASK: Dict[Tuple[str, bytes], Tuple[Action, ...]] = {}
 
 
 class ActionProbabilities(BaseModel):
@@ -143,6 +156,29 @@ class ActionProbabilities(BaseModel):
     PICK_UP: float | None = None
     DROP_OFF: float | None = None
 
+    @staticmethod
+    def from_array(probabilities: ndarray) -> ActionProbabilities:
+        """
+        Display the probability vector of a state, as computed by
+        `Policy.probabilities()`. The actions that are never taken are
+        left unset.
+
+        Parameters
+        ----------
+        probabilities: ndarray
+            The probability of each action, indexed by its value.
+
+        Returns
+        -------
+        ActionProbabilities
+            The probability associated with each action.
+        """
+        return ActionProbabilities(**{
+            action.name: float(probability)
+            for action, probability in zip(Action, probabilities.tolist())
+            if probability > 0
+        })
+
 
 class ActionWithReward(BaseModel):
     """
@@ -172,3 +208,6 @@ class ActionWithReward(BaseModel):
             rewards.append(el.reward)
             probabilities.append(el.probability)
         return array([rewards, probabilities])
+
+
+ActionWithReward = hot_path(ActionWithReward)  # type: ignore
@@ -1,6 +1,8 @@
 from __future__ import annotations
+import numpy as np
 from typing import Tuple
 from enum import Enum
+from lib.environment.state_index import TAXI, decode
 
 
 class Destination(Enum):
@@ -17,19 +19,33 @@ class Destination(Enum):
         state: int,
         absolute: bool = False
     ) -> Destination | Tuple[int, int] | None:
-        destination_location = Destination(state % 4)
+        destination_location = TAXI.destination[state]
         if absolute:
-            if destination_location == Destination.BLUE:
-                return (4, 3)
-            elif destination_location == Destination.GREEN:
-                return (0, 4)
-            elif destination_location == Destination.RED:
-                return (0, 0)
-            elif destination_location == Destination.YELLOW:
-                return (4, 0)
-            else:
-                return None
-        return destination_location
+            return _ABSOLUTE_LOCATIONS[destination_location]
+        return _DESTINATIONS[destination_location]
+
+    @staticmethod
+    def locations(states: np.ndarray, absolute: bool = False) -> np.ndarray:
+        """
+        Return the destination of states of any shape, see `location()`.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The states of the game environment.
+        absolute: bool, default=False
+            Return the absolute coordinate of the destination.
+
+        Returns
+        -------
+        np.ndarray
+            The destination index of each state. If in absolute mode, the
+            coordinates of shape `states.shape + (2,)`.
+        """
+        destinations = decode(states)[..., 3]
+        if absolute:
+            return _ABSOLUTE_COORDINATES[destinations]
+        return destinations
 
     @staticmethod
     def to_human_readable(destination: int) -> str:
@@ -64,3 +80,9 @@ class Destination(Enum):
             The index of the destination.
         """
         return Destination(destination).value
+
+
+_DESTINATIONS = tuple(Destination)
+# The coordinates of each destination
+_ABSOLUTE_LOCATIONS = ((0, 0), (0, 4), (4, 0), (4, 3))
+_ABSOLUTE_COORDINATES = np.array(_ABSOLUTE_LOCATIONS, dtype=np.int8)
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class Engine(Enum):
+    """
+    The stepping engine backing a game environment.
+    """
+    GYM = "gym"
+    TABLE = "table"
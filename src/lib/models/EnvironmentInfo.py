@@ -1,5 +1,6 @@
 from numpy import ndarray
 from pydantic import BaseModel
+from lib.models.Record import hot_path
 
 
 class EnvironmentInfo(BaseModel):
@@ -11,3 +12,6 @@ class EnvironmentInfo(BaseModel):
 
     class Config:
         arbitrary_types_allowed = True
+
+
+EnvironmentInfo = hot_path(EnvironmentInfo)  # type: ignore
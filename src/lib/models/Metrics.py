@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from lib.models.Action import Action
 from lib.models.GameStatus import GameStatus
+from lib.models.Record import hot_path
 
 
 class EpisodeMetrics(BaseModel):
@@ -9,6 +10,10 @@ class EpisodeMetrics(BaseModel):
     """
     steps: int
     cumulative_reward: float
+    worker: int | None = None
+
+
+EpisodeMetrics = hot_path(EpisodeMetrics)  # type: ignore
 
 
 class StepResult(BaseModel):
@@ -20,6 +25,9 @@ class StepResult(BaseModel):
     immediate_reward: float
 
 
+StepResult = hot_path(StepResult)  # type: ignore
+
+
 class Result(BaseModel):
     """
     Representation of a bellman step result.
@@ -30,6 +38,9 @@ class Result(BaseModel):
     game_status: GameStatus
 
 
+Result = hot_path(Result)  # type: ignore
+
+
 class AgreggatedMetrics(BaseModel):
     """
     Representation of aggregated metrics over many episodes.
@@ -38,3 +49,24 @@ class AgreggatedMetrics(BaseModel):
     std: float
     max: float
     min: float
+
+
+class SolverMetrics(BaseModel):
+    """
+    Representation of the convergence of an exact solver.
+    """
+    iterations: int
+    delta: float
+    converged: bool
+    elapsed: float
+
+
+class SearchMetrics(BaseModel):
+    """
+    Representation of the search behind a single decision.
+    """
+    depth: int
+    visited_node: int
+    elapsed: float
+    interrupted: bool
+    cached: bool = False
@@ -1,6 +1,8 @@
 from __future__ import annotations
+import numpy as np
 from typing import Tuple
 from enum import Enum
+from lib.environment.state_index import TAXI, decode
 
 
 class Passenger(Enum):
@@ -36,21 +38,35 @@ class Passenger(Enum):
             the coordinates in which the passenger is located. It will
             return 'None' if the passenger is in the taxi.
         """
-        passenger_location = Passenger((state // 4) % 5)
+        passenger_location = TAXI.passenger[state]
         if absolute:
-            if passenger_location == Passenger.BLUE:
-                return (4, 3)
-            elif passenger_location == Passenger.GREEN:
-                return (0, 4)
-            elif passenger_location == Passenger.RED:
-                return (0, 0)
-            elif passenger_location == Passenger.YELLOW:
-                return (4, 0)
-            elif passenger_location == Passenger.TAXI:
-                return (-1, -1)
-            else:
-                return None
-        return passenger_location
+            return _ABSOLUTE_LOCATIONS[passenger_location]
+        return _PASSENGERS[passenger_location]
+
+    @staticmethod
+    def locations(states: np.ndarray, absolute: bool = False) -> np.ndarray:
+        """
+        Return the location of the passenger in states of any shape, see
+        `location()`.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The states of the game environment.
+        absolute: bool, default=False
+            Return the absolute coordinate of the passenger location.
+
+        Returns
+        -------
+        np.ndarray
+            The passenger location index of each state. If in absolute
+            mode, the coordinates of shape `states.shape + (2,)`, (-1, -1)
+            if the passenger is in the taxi.
+        """
+        passenger_locations = decode(states)[..., 2]
+        if absolute:
+            return _ABSOLUTE_COORDINATES[passenger_locations]
+        return passenger_locations
 
     @staticmethod
     def to_human_readable(passenger: int) -> Passenger:
@@ -85,3 +101,9 @@ class Passenger(Enum):
             The index of the passenger location.
         """
         return Passenger(passenger).value
+
+
+_PASSENGERS = tuple(Passenger)
+# The coordinates of each passenger location, (-1, -1) in the taxi
+_ABSOLUTE_LOCATIONS = ((0, 0), (0, 4), (4, 0), (4, 3), (-1, -1))
+_ABSOLUTE_COORDINATES = np.array(_ABSOLUTE_LOCATIONS, dtype=np.int8)
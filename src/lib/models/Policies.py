@@ -2,6 +2,9 @@ from typing import Union
 from lib.policies.LegalSamplePolicy import LegalSamplePolicy
 from lib.policies.RandomSamplePolicy import RandomSamplePolicy
 from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+from lib.policies.MonteCarloTreeSearchPolicy import MonteCarloTreeSearchPolicy
+from lib.policies.ShortestPathPolicy import ShortestPathPolicy
+from lib.policies.DistilledPolicy import DistilledPolicy
 from lib.policies.GreedyPolicy import GreedyPolicy
 from lib.policies.EpsilonGreedyPolicy import EpsilonGreedyPolicy
 
@@ -11,5 +14,8 @@ Policies = Union[
     GreedyPolicy,
     LegalSamplePolicy,
     RandomSamplePolicy,
-    MonteCarloPolicy
+    MonteCarloPolicy,
+    MonteCarloTreeSearchPolicy,
+    ShortestPathPolicy,
+    DistilledPolicy
 ]
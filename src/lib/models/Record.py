@@ -0,0 +1,137 @@
+from __future__ import annotations
+import os
+from typing import Any, Dict, Tuple, Type, TypeVar
+from pydantic import BaseModel
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# Whether the results built on the hot path are lightweight records
+# instead of validated pydantic models, set with `TAXI_FAST_MODE=1`
+FAST_MODE = os.environ.get("TAXI_FAST_MODE", "").lower() in ("1", "true", "yes")
+
+_RECORDS: Dict[Type[BaseModel], Type[Record]] = {}
+
+
+class Record:
+    """
+    Lightweight stand-in of a pydantic model, with the same fields,
+    defaults and methods but stored in `__slots__` and built without
+    validation. A record is equal to the model, or record, holding the
+    same values.
+
+    Attributes
+    ----------
+    model_fields: Dict[str, Any]
+        The fields of the pydantic model.
+    """
+    __slots__ = ()
+    __hash__ = None  # type: ignore
+    _model: Type[BaseModel]
+    _fields: Tuple[str, ...]
+    model_fields: Dict[str, Any]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (self._model, Record)) \
+           or getattr(other, "_model", type(other)) is not self._model:
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field)
+            for field in self._fields
+        )
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self._fields
+        )
+        return f"{type(self).__name__}({values})"
+
+    def model_dump(self) -> Dict[str, Any]:
+        """
+        The values of the fields, see `BaseModel.model_dump()`.
+        """
+        return {field: getattr(self, field) for field in self._fields}
+
+    def model_copy(self, update: Dict[str, Any] | None = None) -> Record:
+        """
+        A shallow copy of the record, see `BaseModel.model_copy()`.
+        """
+        return type(self)(**{**self.model_dump(), **(update or {})})
+
+    def to_model(self) -> BaseModel:
+        """
+        Validate the record into its pydantic model, e.g. before being
+        exported.
+
+        Raises
+        ------
+        ValidationError
+            If a value is not valid.
+        """
+        return self._model(**self.model_dump())
+
+
+def record_of(model: Type[BaseModel]) -> Type[Record]:
+    """
+    Build, once per model, the record class standing in for a pydantic
+    model: its fields are slots, its constructor takes the same keyword
+    arguments and defaults, and the methods defined in the model body
+    are kept.
+
+    Parameters
+    ----------
+    model: Type[BaseModel]
+        The pydantic model.
+
+    Returns
+    -------
+    Type[Record]
+        The record class, named after the model.
+    """
+    if model in _RECORDS:
+        return _RECORDS[model]
+    fields = tuple(model.model_fields)
+    parameters = ", ".join(
+        field if info.is_required() else f"{field}=_defaults[{field!r}]"
+        for field, info in model.model_fields.items()
+    )
+    assignments = "".join(
+        f"\n    self.{field} = {field}" for field in fields
+    ) or "\n    pass"
+    namespace: Dict[str, Any] = {
+        "_defaults": {
+            field: info.default
+            for field, info in model.model_fields.items()
+            if not info.is_required()
+        }
+    }
+    exec(f"def __init__(self, *, {parameters}):{assignments}", namespace)
+    body: Dict[str, Any] = {
+        name: value
+        for name, value in vars(model).items()
+        if isinstance(value, (staticmethod, classmethod, property))
+        or (callable(value) and not isinstance(value, type)
+            and not name.startswith(("_", "model_")))
+    }
+    body.update(
+        __slots__=fields,
+        __init__=namespace["__init__"],
+        __module__=model.__module__,
+        __qualname__=model.__qualname__,
+        __doc__=model.__doc__,
+        _model=model,
+        _fields=fields,
+        model_fields=model.model_fields,
+    )
+    record = _RECORDS[model] = type(model.__name__, (Record,), body)
+    return record
+
+
+def hot_path(model: Type[Model]) -> Type[Model]:
+    """
+    The class built on the hot path for a pydantic model: its record in
+    fast mode, the model itself otherwise. Validation then only happens
+    at the boundaries, with `Record.to_model()`.
+    """
+    if FAST_MODE:
+        return record_of(model)  # type: ignore
+    return model
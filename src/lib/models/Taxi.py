@@ -1,3 +1,7 @@
+import numpy as np
+from lib.environment.state_index import TAXI, decode
+
+
 class Taxi():
     """
     Representation of the taxi location.
@@ -9,6 +13,23 @@ class Taxi():
         Convert the current state to a given location on the
         environment grid.
         """
-        row = (state // 100) % 5
-        col = (state // 20) % 5
-        return row, col
+        return TAXI.taxi_location[state]
+
+    @staticmethod
+    def locations(states: np.ndarray) -> np.ndarray:
+        """
+        Convert states of any shape to their location on the environment
+        grid, see `location()`.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The (row, column) of the taxi in each state, of shape
+            `states.shape + (2,)`.
+        """
+        return decode(states)[..., :2]
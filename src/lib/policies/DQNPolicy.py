@@ -1,7 +1,9 @@
 import torch
+import numpy as np
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
 from lib.data.neural_network import Model
 from lib.data.memory import Memory
+from lib.models.Engine import Engine
 from lib.models.Action import Action
 from lib.policies.Policy import Policy
 
@@ -12,9 +14,10 @@ class DQNPolicy(Policy):
         self,
         game_env: GymnasiumGameEnvironment,
         policy_network: Model,
-        seed: int | None = None
+        seed: int | None = None,
+        engine: Engine = Engine.GYM
     ) -> None:
-        super().__init__(game_env=game_env, seed=seed)
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
         self.seed = seed
         self.policy_network = policy_network
 
@@ -28,7 +31,7 @@ class DQNPolicy(Policy):
             Decide if the environment should be also reset.
         """
         if reset_env:
-            self.game_env.env.reset(seed=self.seed)
+            self.game_env.reset(seed=self.seed)
 
     def next_action(self):
         with torch.no_grad():
@@ -39,3 +42,28 @@ class DQNPolicy(Policy):
             out = self.policy_network(state)
         action = Action(int(torch.argmax(out)))
         return self.take_action(action)
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states,
+        with a single forward pass over their one-hot encodings.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+        """
+        states = np.asarray(states)
+        observation_space = self.game_env.env.observation_space.n  # type: ignore
+        with torch.no_grad():
+            out = self.policy_network(
+                torch.eye(observation_space)[torch.from_numpy(states.reshape(-1).astype(np.int64))]
+            )
+        actions = out.argmax(dim=1).numpy().reshape(states.shape)
+        return Policy.one_hot_probabilities(actions)
@@ -0,0 +1,78 @@
+import numpy as np
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.q_table import QTable
+from lib.models.Engine import Engine
+from lib.models.Action import Action, ActionWithReward
+from lib.policies.Policy import Policy
+
+
+class DistilledPolicy(Policy):
+    """
+    Take the action stored for the current state, as distilled from a
+    more expensive policy by `Distillation`. Each decision is a single
+    array lookup.
+
+    Attributes
+    ----------
+    actions: np.ndarray
+        The index of the action to take in each state, as uint8.
+    data: QTable | None
+        The values of the distilled policy, if known.
+    """
+
+    def __init__(
+        self,
+        game_env: GymnasiumGameEnvironment,
+        actions: np.ndarray,
+        data: QTable | None = None,
+        seed: int | None = None,
+        engine: Engine = Engine.GYM
+    ) -> None:
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
+        self.seed = seed
+        self.type = Policy.Type.DETERMINISTIC
+        self.actions = np.asarray(actions, dtype=np.uint8)
+        self.data = data
+
+    def reset_hyperparameters(self, reset_env: bool = False) -> None:
+        """
+        Resets the environment and the hyperparameters of the policy.
+
+        Parameters
+        ----------
+        reset_env: bool, default=False
+            Decide if the environment should be also reset.
+        """
+        if reset_env:
+            self.game_env.reset(seed=self.seed)
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+        """
+        return Policy.one_hot_probabilities(self.actions[states])
+
+    def next_action(self) -> ActionWithReward:
+        """
+        Take the distilled action of the current state.
+
+        Returns
+        -------
+        ActionWithReward
+            The action associated with both :
+            - Its immediate reward
+            - Its probability of occurring.
+            - The current game status (terminated, truncated, running)
+        """
+        return self.take_action(Action(int(self.actions[self.game_env.state])))
@@ -1,9 +1,12 @@
 import numpy as np
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
 from lib.data.neural_network import Model
+from lib.environment.state_index import ACTION_MASKS
+from lib.models.Engine import Engine
 from lib.models.Action import Action, ActionWithReward
 from lib.models.GameStatus import GameStatus
 from lib.policies.DQNPolicy import DQNPolicy
+from lib.policies.Policy import Policy
 
 
 class EpsilonDQNPolicy(DQNPolicy):
@@ -15,12 +18,14 @@ class EpsilonDQNPolicy(DQNPolicy):
         epsilon: float = 1.0,
         decay_rate: float = 0.01,
         legal: bool = False,
-        seed: int | None = None
+        seed: int | None = None,
+        engine: Engine = Engine.GYM
     ) -> None:
         super().__init__(
             game_env=game_env,
             seed=seed,
-            policy_network=policy_network
+            policy_network=policy_network,
+            engine=engine
         )  # type: ignore
         self.epsilon = epsilon
         self.init_epsilon = epsilon
@@ -42,7 +47,7 @@ class EpsilonDQNPolicy(DQNPolicy):
             Decide if the environment should be also reset.
         """
         if reset_env:
-            self.game_env.env.reset(seed=self.seed)
+            self.game_env.reset(seed=self.seed)
         self._steps = 0
         self.epsilon = self.init_epsilon
 
@@ -90,8 +95,7 @@ class EpsilonDQNPolicy(DQNPolicy):
                 )
         else:
             action = self.game_env.env.action_space.sample()
-            new_state, reward, term, trunc, _ = self.game_env.env.step(action)
-            self.game_env.state = new_state
+            _, reward, term, trunc, _ = self.game_env.step(action)
             if term:
                 return ActionWithReward(
                     action=Action(action),
@@ -127,3 +131,28 @@ class EpsilonDQNPolicy(DQNPolicy):
         else:
             self._update_epsilon()
             return self._explore()
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states, at
+        the current epsilon, see `EpsilonGreedyPolicy.probabilities()`.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+        """
+        if self.legal:
+            explore = Policy.uniform_probabilities(
+                ACTION_MASKS[self.game_env.index.action_mask[states]]
+            )
+        else:
+            explore = np.full(np.shape(states) + (len(Action),), 1 / len(Action))
+        return self.epsilon * explore \
+            + (1 - self.epsilon) * super().probabilities(states)
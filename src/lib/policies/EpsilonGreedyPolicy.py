@@ -1,8 +1,12 @@
 import numpy as np
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.q_table import QTable
+from lib.environment.state_index import ACTION_MASKS
+from lib.models.Engine import Engine
 from lib.models.Action import Action, ActionWithReward
 from lib.models.GameStatus import GameStatus
 from lib.policies.GreedyPolicy import GreedyPolicy
+from lib.policies.Policy import Policy
 
 
 class EpsilonGreedyPolicy(GreedyPolicy):
@@ -34,9 +38,13 @@ class EpsilonGreedyPolicy(GreedyPolicy):
         legal: bool = False,
         epsilon: float = 1.0,
         decay_rate: float = 0.01,
-        seed: int | None = None
+        seed: int | None = None,
+        engine: Engine = Engine.GYM,
+        data: QTable | None = None
     ):
-        super().__init__(game_env=game_env, seed=seed)
+        super().__init__(
+            game_env=game_env, seed=seed, engine=engine, data=data
+        )
         self.seed = seed
         self.legal = legal
         self.init_epsilon = epsilon
@@ -57,7 +65,7 @@ class EpsilonGreedyPolicy(GreedyPolicy):
             Decide if the environment should be also reset.
         """
         if reset_env:
-            self.game_env.env.reset(seed=self.seed)
+            self.game_env.reset(seed=self.seed)
         self._steps = 0
         self.epsilon = self.init_epsilon
 
@@ -105,8 +113,7 @@ class EpsilonGreedyPolicy(GreedyPolicy):
                 )
         else:
             action = self.game_env.env.action_space.sample()
-            new_state, reward, term, trunc, _ = self.game_env.env.step(action)
-            self.game_env.state = new_state
+            _, reward, term, trunc, _ = self.game_env.step(action)
             if term:
                 return ActionWithReward(
                     action=Action(action),
@@ -141,6 +148,62 @@ class EpsilonGreedyPolicy(GreedyPolicy):
         """
         return super().next_action(action)
 
+    def next_actions(
+        self,
+        states: np.ndarray,
+        masks: np.ndarray,
+        actions: np.ndarray,
+        steps: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Choose the next action of many game environments at once
+        following the epsilon greedy tradeoff, e.g. the instances of a
+        VectorGameEnvironment.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The current state of each game environment.
+        masks: np.ndarray
+            The action mask of each game environment.
+        actions: np.ndarray
+            The greedy action of each game environment, used when
+            exploiting.
+        steps: np.ndarray | None, default=None
+            The number of steps already taken in the current episode of
+            each game environment. When provided, each game environment
+            follows its own epsilon decay, restarting at every episode
+            like `next_action()` does after `reset_hyperparameters()`.
+            Otherwise a batch counts as a single step for the decay.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the next action for each game environment.
+        """
+        if steps is None:
+            self._steps += 1
+            epsilon = self.epsilon
+            self._update_epsilon()
+        else:
+            # Closed form of the decay applied once per previous step
+            steps = np.asarray(steps)
+            epsilon = self.init_epsilon * np.exp(
+                -self.decay_rate * steps * (steps + 1) / 2
+            )
+        explore = np.random.uniform(0.0, 1.0, size=len(states)) < epsilon
+        next_actions = np.array(actions, dtype=np.int64)
+        if explore.any():
+            if self.legal:
+                next_actions[explore] = Policy.sample_legal_actions(
+                    np.asarray(masks)[explore]
+                )
+            else:
+                next_actions[explore] = np.random.randint(
+                    0, len(Action), size=int(explore.sum())
+                )
+        return next_actions
+
     def next_action(
         self,
         action: Action,
@@ -164,3 +227,42 @@ class EpsilonGreedyPolicy(GreedyPolicy):
         else:
             self._update_epsilon()
             return self._explore()
+
+    def probabilities(
+        self,
+        states: np.ndarray | int,
+        values: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states, at
+        the current epsilon: the greedy action with probability
+        `1 - epsilon`, and otherwise an action sampled like `_explore()`.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+        values: np.ndarray | None, default=None
+            The Q-values of each state, of shape
+            `states.shape + (action_space,)`. Read from `data` if not
+            given.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+
+        Raises
+        ------
+        ValueError
+            If neither the Q-values nor the Q-Table are given.
+        """
+        if self.legal:
+            explore = Policy.uniform_probabilities(
+                ACTION_MASKS[self.game_env.index.action_mask[states]]
+            )
+        else:
+            explore = np.full(np.shape(states) + (len(Action),), 1 / len(Action))
+        return self.epsilon * explore \
+            + (1 - self.epsilon) * super().probabilities(states, values)
@@ -1,4 +1,7 @@
+import numpy as np
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.q_table import QTable
+from lib.models.Engine import Engine
 from lib.models.Action import Action, ActionWithReward
 from lib.policies.Policy import Policy
 
@@ -14,15 +17,21 @@ class GreedyPolicy(Policy):
         The type of policy. It can be either :
         - Probabilistic
         - Deterministic
+    data: QTable | None
+        The Q-Table whose best values give the greedy actions, bound
+        to the Q-Table being learned by QLearning.
     """
 
     def __init__(
         self,
         game_env: GymnasiumGameEnvironment,
-        seed: int | None = None
+        seed: int | None = None,
+        engine: Engine = Engine.GYM,
+        data: QTable | None = None
     ) -> None:
-        super().__init__(game_env=game_env, seed=seed)
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
         self.seed = seed
+        self.data = data
 
     def reset_hyperparameters(self, reset_env: bool = False) -> None:
         """
@@ -34,7 +43,74 @@ class GreedyPolicy(Policy):
             Decide if the environment should be also reset.
         """
         if reset_env:
-            self.game_env.env.reset(seed=self.seed)
+            self.game_env.reset(seed=self.seed)
+
+    def next_actions(
+        self,
+        states: np.ndarray,
+        masks: np.ndarray,
+        actions: np.ndarray,
+        steps: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Choose the next action of many game environments at once,
+        e.g. the instances of a VectorGameEnvironment.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The current state of each game environment.
+        masks: np.ndarray
+            The action mask of each game environment.
+        actions: np.ndarray
+            The next action of each game environment according to the
+            best Q-value.
+        steps: np.ndarray | None, default=None
+            The number of steps taken in the current episode of each
+            game environment. Unused by the greedy policy.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the next action for each game environment.
+        """
+        return np.asarray(actions, dtype=np.int64)
+
+    def probabilities(
+        self,
+        states: np.ndarray | int,
+        values: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+        values: np.ndarray | None, default=None
+            The Q-values of each state, of shape
+            `states.shape + (action_space,)`. Read from `data` if not
+            given.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+
+        Raises
+        ------
+        ValueError
+            If neither the Q-values nor the Q-Table are given.
+        """
+        if values is None:
+            if self.data is None:
+                raise ValueError(
+                    "The greedy actions need the Q-values or a Q-Table."
+                )
+            values = self.data.values[states]
+        return Policy.one_hot_probabilities(np.argmax(values, axis=-1))
 
     def next_action(self, action: Action) -> ActionWithReward:  # type: ignore
         """
@@ -1,6 +1,8 @@
 import numpy as np
 from typing import Tuple
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.environment.state_index import ACTION_MASKS
+from lib.models.Engine import Engine
 from lib.models.Action import Action, ActionProbabilities, ActionWithReward
 from lib.models.GameStatus import GameStatus
 from lib.policies.Policy import Policy
@@ -22,11 +24,17 @@ class LegalSamplePolicy(Policy):
     def __init__(
         self,
         game_env: GymnasiumGameEnvironment,
-        seed: int | None = None
+        seed: int | None = None,
+        engine: Engine = Engine.GYM
     ) -> None:
-        super().__init__(game_env=game_env, seed=seed)
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
         self.seed = seed
         self.type = Policy.Type.PROBABILISTIC
+        # The probability of each action in each state
+        self._probabilities = Policy.uniform_probabilities(
+            ACTION_MASKS[self.game_env.index.action_mask]
+        )
+        self._probabilities.setflags(write=False)
 
     def reset_hyperparameters(
         self,
@@ -41,7 +49,7 @@ class LegalSamplePolicy(Policy):
             Decide if the environment should be also reset.
         """
         if reset_env:
-            self.game_env.env.reset(seed=self.seed)
+            self.game_env.reset(seed=self.seed)
 
     def actions_probability(self) -> ActionProbabilities:
         """
@@ -52,20 +60,27 @@ class LegalSamplePolicy(Policy):
         ActionProbabilities
             The probability associated with each legal action.
         """
-        legal_actions_names = [
-            action.name for action in self.possible_actions()
-        ]
-        num_legal_actions = len(
-            self.game_env.info.action_mask[self.game_env.info.action_mask == 1]
+        return ActionProbabilities.from_array(
+            self._probabilities[self.game_env.state]
         )
-        action_prob = {
-            action: prob for action, prob in zip(
-                legal_actions_names, list(
-                    np.full(num_legal_actions, 1/num_legal_actions)
-                )
-            )
-        }
-        return ActionProbabilities(**action_prob)
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states,
+        uniform over the legal actions of each state.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+        """
+        return self._probabilities[states]
 
     def possible_actions(self) -> Tuple[Action, ...]:
         """
@@ -79,6 +94,29 @@ class LegalSamplePolicy(Policy):
         """
         return Action.legal_actions(self.game_env.info)
 
+    def next_actions(
+        self,
+        states: np.ndarray,
+        masks: np.ndarray
+    ) -> np.ndarray:
+        """
+        Choose the next action of many game environments at once,
+        e.g. the instances of a VectorGameEnvironment.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The current state of each game environment.
+        masks: np.ndarray
+            The action mask of each game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the next action for each game environment.
+        """
+        return Policy.sample_legal_actions(masks)
+
     def next_action(  # type: ignore
         self,
         mask: np.ndarray | None = None
@@ -101,8 +139,7 @@ class LegalSamplePolicy(Policy):
         """
         if mask is not None:
             action = self.game_env.env.action_space.sample(mask)
-            new_state, reward, term, trunc, _ = self.game_env.env.step(action)
-            self.game_env.state = new_state
+            _, reward, term, trunc, _ = self.game_env.step(action)
             if term:
                 return ActionWithReward(
                     action=Action(action),
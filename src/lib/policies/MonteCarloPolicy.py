@@ -1,11 +1,20 @@
 import logging
 import random
-from typing import Tuple
+import time
+import numpy as np
+from enum import Enum
+from typing import List, Tuple
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.decision_cache import Decision, DecisionCache
 from lib.data.monte_carlo_tree import MonteCarloTree
+from lib.data.node_store import NodeView
+from lib.data.transposition_table import TranspositionTable
+from lib.environment.transition_table import TransitionTable
 from lib.policies.Policy import Policy
+from lib.models.Engine import Engine
 from lib.models.Action import Action, ActionWithReward
 from lib.models.GameStatus import GameStatus
+from lib.models.Metrics import SearchMetrics
 from lib.models.Stage import Stage
 from lib.models.Node import Node
 from lib.models.EnvironmentInfo import EnvironmentInfo
@@ -16,6 +25,16 @@ from lib.logs.logger import get_logger
 LOGGER = get_logger()
 LOGGER.setLevel(logging.ERROR)
 
+# The state of the search restored after `probabilities()`
+_SEARCH_ATTRIBUTES = (
+    "current_node",
+    "current_stage",
+    "_tree_stage",
+    "pick_tree",
+    "drop_tree",
+    "search_metrics"
+)
+
 
 class MonteCarloPolicy(Policy):
     """
@@ -24,30 +43,77 @@ class MonteCarloPolicy(Policy):
     - actions: a list [int] of all actions the agent can make
     - depth: the depth of the tree, meaning the maximum amount of steps
     the agent might have to take to complete pickup/dropoff
+    - search: how the possibilities are explored, either a tree of
+    action sequences or a transposition table keyed by state
+    - time_budget/node_budget: make the search anytime, deepening layer
+    by layer up to `depth` until the budget runs out, the decision being
+    taken on the deepest complete layer
+    - decision_cache: replay the decisions already taken in the same
+    (state, stage) instead of searching again
     """
 
+    class Search(Enum):
+        TREE = "tree"
+        TRANSPOSITION = "transposition"
+
     def __init__(
         self,
         game_env: GymnasiumGameEnvironment,
         depth: int,
-        seed: int | None = None
+        seed: int | None = None,
+        engine: Engine = Engine.GYM,
+        search: Search = Search.TREE,
+        reuse_tree: bool = False,
+        time_budget: float | None = None,
+        node_budget: int | None = None,
+        decision_cache: DecisionCache | None = None
     ):
-        super().__init__(game_env=game_env, seed=seed)
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
         self.seed = seed
         self.depth = depth
+        self.search = search
+        self.reuse_tree = reuse_tree
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.decision_cache = decision_cache
+        self.search_metrics: SearchMetrics | None = None
+        self._start = 0.0
+        self._deadline = 0.0
+        self.transposition_table: TranspositionTable | None = None
+        if search is MonteCarloPolicy.Search.TRANSPOSITION:
+            self.transposition_table = TranspositionTable(
+                self.game_env.env.observation_space.n  # type: ignore
+            )
         self.actions: list[Action] = list(Action)
+        self._reset_search(
+            self.game_env.initial_state,
+            self.game_env.initial_info
+        )
+
+    def _reset_search(self, state: int, env_info: EnvironmentInfo) -> None:
+        """
+        Start a new search from the given state, at the PICK stage.
 
+        Parameters
+        ----------
+        state: int
+            The state of the root Node.
+        env_info: EnvironmentInfo
+            The information of the root Node state.
+        """
         root_node = Node(
             depth=0,
-            state=self.game_env.initial_state,
-            env_info=self.game_env.initial_info
+            state=state,
+            env_info=env_info,
+            children=[]
         )
         self.current_node: Node = root_node
         self.current_stage: Stage = Stage.PICK
+        self._tree_stage: Stage | None = None
 
         self.pick_tree: MonteCarloTree = self.generate_tree(
             root_node=root_node,
-            depth=depth,
+            depth=self.depth,
         )
         self.drop_tree: MonteCarloTree | None = None
 
@@ -61,7 +127,98 @@ class MonteCarloPolicy(Policy):
             Decide if the environment should be also reset.
         """
         if reset_env:
-            self.__init__(self.game_env.env, depth=self.depth, seed=self.seed)
+            state, _ = self.game_env.reset(seed=self.seed)
+            self._reset_search(state, self.game_env.info)
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states, each
+        decided by a new search from the state, see `reset_to()`. When
+        the best nodes of a search start with different actions, the
+        random tie-break makes each of them equally likely. The search
+        and the game environment are restored afterwards.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape `(action_space,)`
+            for a single state and `states.shape + (action_space,)` for
+            an array of states.
+
+        Raises
+        ------
+        GameAlreadyWonException
+            If the passenger is already dropped off in a state.
+        """
+        states = np.asarray(states)
+        saved = {name: getattr(self, name) for name in _SEARCH_ATTRIBUTES}
+        env_state = self.game_env.state
+        probabilities = np.zeros(states.shape + (len(Action),))
+        try:
+            for index in np.ndindex(states.shape):
+                actions = self._decide(int(states[index]))
+                probabilities[index + (actions,)] = 1 / len(actions)
+        finally:
+            for name, value in saved.items():
+                setattr(self, name, value)
+            self.game_env.back_to(env_state)
+        return probabilities
+
+    def _decide(self, state: int) -> List[int]:
+        """
+        Search from any state like `next_action()`, without taking the
+        action, see `probabilities()`.
+
+        Parameters
+        ----------
+        state: int
+            The state to decide from.
+
+        Returns
+        -------
+        List[int]
+            The first actions of the best nodes, a single one unless the
+            decision is a tie-break.
+        """
+        self.reset_to(state)
+        if self.game_env.passenger_droppedoff(state):
+            raise GameAlreadyWonException(
+                f"No decision is taken in state {state}, the passenger is"
+                " already dropped off."
+            )
+        self._start_search()
+        if self.decision_cache is not None:
+            decision = self.decision_cache.get(state, self.current_stage)  # type: ignore
+            if decision is not None:
+                return [decision.action.value]
+        if self.search is MonteCarloPolicy.Search.TRANSPOSITION:
+            transposition_table: TranspositionTable = self.transposition_table  # type: ignore
+            return sorted({
+                int(transposition_table.first_action[s])
+                for s in self._search_transposition(state)
+            })
+        tree = self._search_tree(reused=False)
+        return self._first_actions(tree, self._best_nodes(tree))
+
+    def reset_to(self, state: int) -> None:
+        """
+        Start a new search from any state, at the stage of that state,
+        e.g. to query the decision of the policy in every state.
+
+        Parameters
+        ----------
+        state: int
+            The state to decide from.
+        """
+        self.game_env.back_to(state)
+        self._reset_search(state, self.game_env.info)
+        if self.game_env.passenger_pickedup(state):
+            self.current_stage = Stage.DROP
 
     def possible_actions(self) -> Tuple[Action, ...]:
         return Action.legal_actions(self.game_env.info.action_mask)
@@ -83,56 +240,38 @@ class MonteCarloPolicy(Policy):
                 "You can't call next_action() cause the game has finished,"
                 " the passenger is succeffully dropped off."
             )
-        best_node = None
-        self.current_node.children = []
-        self.current_node.depth = 0
-        self.current_node.path = ''
-        self.current_node.parent = None
-        self.current_node.reward = 0.0
-        self.current_node.cumul_reward = 0.0
-        # Call the training function
-        if self.current_stage is Stage.PICK:
-            self.pick_tree = self.generate_tree(
-                root_node=self.current_node,
-                depth=self.depth
-            )
-            self.train_pickup()
-            if self.pick_tree.winning_node is not None:
-                LOGGER.info(
-                    "Found PICK stage winning node:"
-                    f" {self.pick_tree.winning_node}"
-                )
-                best_node = self.pick_tree.winning_node
-            else:
-                max_cumul_reward = max(
-                    node.cumul_reward for node in
-                    self.pick_tree.deepest_layer_nodes
-                )
-                best_nodes = [
-                    node for node in self.pick_tree.deepest_layer_nodes
-                    if node.cumul_reward == max_cumul_reward
-                ]
-                best_node = random.choice(best_nodes)
-                # LOGGER.info(f"RANDOM best_node CHOSEN: {best_node}")
-        elif self.current_stage is Stage.DROP:
-            self.drop_tree = self.generate_tree(
-                root_node=self.current_node,
-                depth=self.depth,
-            )
-            self.train_dropoff()
-            if self.drop_tree.winning_node is not None:
-                best_node = self.drop_tree.winning_node
-            else:
-                max_cumul_reward = max(
-                    node.cumul_reward for node
-                    in self.drop_tree.deepest_layer_nodes
-                )
-                best_nodes = [
-                    node for node in self.drop_tree.deepest_layer_nodes
-                    if node.cumul_reward == max_cumul_reward
-                ]
-                best_node = random.choice(best_nodes)
-        self.current_node = best_node.first_layer_parent
+        start = self._start_search()
+        state, stage = self.current_node.state, self.current_stage
+        if self.decision_cache is not None:
+            decision = self.decision_cache.get(state, stage)  # type: ignore
+            if decision is not None:
+                return self._replay_decision(decision, render)
+        if self.search is MonteCarloPolicy.Search.TRANSPOSITION:
+            return self._next_action_transposition(render)
+        reused = self.reuse_tree and self._reroot_tree()
+        tree = self._search_tree(reused)
+        best_nodes = self._best_nodes(tree)
+        if tree.winning is not None:
+            best_node = tree.winning
+        else:
+            best_node = random.choice(best_nodes)
+        tie = len(self._first_actions(tree, best_nodes)) > 1
+        first_layer_parent = tree.node(tree.first_layer_parent(best_node))
+        root_depth = int(tree.store.depth[tree.root])
+        if tree.winning is not None or tree.interrupted:
+            depth = int(tree.store.depth[best_node]) - root_depth
+        else:
+            depth = tree.depth - root_depth
+        self.search_metrics = SearchMetrics(
+            depth=depth,
+            visited_node=tree.visited_node,
+            elapsed=time.perf_counter() - start,
+            interrupted=tree.interrupted
+        )
+        # A reused tree was pruned by the states of the previous searches
+        if not tie and not reused:
+            self._remember(state, stage, first_layer_parent)  # type: ignore
+        self.current_node = first_layer_parent
         self.game_env.back_to(self.current_node.state)
         if render:
             self.game_env.render()
@@ -151,9 +290,348 @@ class MonteCarloPolicy(Policy):
             game_status = GameStatus.RUNNING
 
         return ActionWithReward(
-            action=best_node.first_layer_parent.action,
+            action=first_layer_parent.action,
+            probability=1.0,
+            reward=first_layer_parent.reward,
+            game_status=game_status
+        )
+
+    def _start_search(self) -> float:
+        """
+        Start the budget of a new search.
+
+        Returns
+        -------
+        float
+            The start time of the search.
+        """
+        start = self._start = time.perf_counter()
+        if self.time_budget is not None:
+            self._deadline = start + self.time_budget
+        return start
+
+    def _search_tree(self, reused: bool) -> MonteCarloTree:
+        """
+        Search the tree of the current stage, built from the current node
+        unless it is reused.
+
+        Parameters
+        ----------
+        reused: bool
+            Whether the tree was re-rooted at the current node.
+
+        Returns
+        -------
+        MonteCarloTree
+            The searched tree.
+        """
+        self._tree_stage = self.current_stage
+        # Call the training function
+        if self.current_stage is Stage.PICK:
+            if not reused:
+                self.pick_tree = self.generate_tree(
+                    root_node=self._root_node(),
+                    depth=self.depth
+                )
+            tree = self.pick_tree
+            if tree.winning is None:
+                self.train_pickup()
+            if tree.winning is not None:
+                LOGGER.info(
+                    f"Found PICK stage winning node: {tree.winning_node}"
+                )
+        else:
+            if not reused:
+                self.drop_tree = self.generate_tree(
+                    root_node=self._root_node(),
+                    depth=self.depth,
+                )
+            tree = self.drop_tree  # type: ignore
+            if tree.winning is None:
+                self.train_dropoff()
+        return tree
+
+    @staticmethod
+    def _best_nodes(tree: MonteCarloTree) -> List[int]:
+        """
+        The winning node of a searched tree, or else the nodes of its
+        deepest layer with the best cumulative reward.
+        """
+        if tree.winning is not None:
+            return [tree.winning]
+        cumul_rewards = tree.store.cumul_reward[tree.deepest_layer]
+        max_cumul_reward = cumul_rewards.max()
+        return [
+            node for node, cumul_reward
+            in zip(tree.deepest_layer, cumul_rewards)
+            if cumul_reward == max_cumul_reward
+        ]
+
+    @staticmethod
+    def _first_actions(tree: MonteCarloTree, nodes: List[int]) -> List[int]:
+        """
+        The distinct first actions leading to some nodes of a tree.
+        """
+        return sorted({
+            int(tree.store.action[tree.first_layer_parent(node)])
+            for node in nodes
+        })
+
+    def _reroot_tree(self) -> bool:
+        """
+        Re-root the tree of the current stage at the current node, chosen
+        by the last decision, keeping its explored descendants. The search
+        then only has to extend the frontier of the tree by one layer, or
+        nothing at all if a winning node was already found below.
+
+        The states explored below the siblings of the current node are
+        forgotten, but the branches they pruned below the current node
+        are not explored again.
+
+        Returns
+        -------
+        bool
+            False if the tree cannot be reused and should be rebuilt.
+        """
+        if self.current_stage is Stage.PICK:
+            tree = self.pick_tree
+        else:
+            tree = self.drop_tree
+        node = self.current_node
+        if (
+            tree is None
+            or self._tree_stage is not self.current_stage
+            or not isinstance(node, NodeView)
+            or node.store is not tree.store
+            or tree.store.parent[node.index] != tree.root
+            # The frontier of an interrupted search is incomplete
+            or tree.interrupted
+        ):
+            return False
+        if not tree.reroot(node.index, self.depth):
+            return False
+        self.current_node = tree.root_node
+        return True
+
+    def _remember(self, state: int, stage: Stage, node: Node) -> None:
+        """
+        Store the decision just taken from a state at a given stage, the
+        chosen node being reached, in the decision cache if any.
+
+        Only the decisions that do not depend on a random tie-break are
+        stored, i.e. the search found a winning node or its best nodes
+        share their first action, from a tree that was not reused and
+        pruned by previous searches. Replaying a tie-break every time the
+        state is met would make the taxi loop between states.
+        """
+        if self.decision_cache is None:
+            return
+        self.decision_cache.put(state, stage, Decision(
+            action=node.action,  # type: ignore
+            next_state=node.state,  # type: ignore
+            reward=node.reward,  # type: ignore
+            taxi_on_passenger=node.taxi_on_passenger,
+            depth=self.search_metrics.depth,  # type: ignore
+            visited_node=self.search_metrics.visited_node  # type: ignore
+        ))
+
+    def _replay_decision(
+        self,
+        decision: Decision,
+        render: bool = False
+    ) -> ActionWithReward:
+        """
+        Take a decision found in the decision cache instead of searching.
+        """
+        result = self._step(
+            self.current_node.state, decision.action, render  # type: ignore
+        )
+        self.current_node.taxi_on_passenger = decision.taxi_on_passenger
+        if decision.taxi_on_passenger:
+            self.current_stage = Stage.DROP
+        self.search_metrics = SearchMetrics(
+            depth=decision.depth,
+            visited_node=decision.visited_node,
+            elapsed=time.perf_counter() - self._start,
+            interrupted=False,
+            cached=True
+        )
+        return result
+
+    def _out_of_budget(self, visited_node: int) -> bool:
+        """
+        Whether the search budget of the current decision is exhausted.
+
+        Parameters
+        ----------
+        visited_node: int
+            The number of nodes visited by the current search.
+
+        Returns
+        -------
+        bool
+            True if either the node or the time budget is exhausted.
+        """
+        if self.node_budget is not None and visited_node >= self.node_budget:
+            return True
+        return self.time_budget is not None \
+            and time.perf_counter() >= self._deadline
+
+    def _interrupt(self, tree: MonteCarloTree, index: int) -> bool:
+        """
+        Stop the search before visiting a node if the budget is exhausted,
+        the deepest complete layer becoming the deepest layer of the tree.
+        The first layer is always searched.
+
+        Parameters
+        ----------
+        tree: MonteCarloTree
+            The tree being searched.
+        index: int
+            The index of the next node to visit.
+
+        Returns
+        -------
+        bool
+            True if the search should stop.
+        """
+        if self.time_budget is None and self.node_budget is None:
+            return False
+        store = tree.store
+        depth = int(store.depth[index]) - 1
+        if depth <= store.depth[tree.root] \
+                or not self._out_of_budget(tree.visited_node - 1):
+            return False
+        size = len(store)
+        tree.deepest_layer = np.flatnonzero(
+            (store.depth[:size] == depth) & (store.state[:size] != -1)
+        ).tolist()
+        tree.interrupted = True
+        return True
+
+    def _root_node(self) -> Node:
+        """
+        A new root Node at the current node state.
+        """
+        return Node(
+            depth=0,
+            action=self.current_node.action,
+            state=self.current_node.state,
+            env_info=self.current_node.env_info,
+            children=[],
+            taxi_on_passenger=self.current_node.taxi_on_passenger
+        )
+
+    def _next_action_transposition(
+        self,
+        render: bool = False
+    ) -> ActionWithReward:
+        """
+        Choose the next action with a breadth-first search over the states
+        stored in the transposition table, see `next_action()`.
+        """
+        state, stage = self.current_node.state, self.current_stage
+        transposition_table: TranspositionTable = self.transposition_table  # type: ignore
+        best_states = self._search_transposition(state)  # type: ignore
+        if transposition_table.winning_state is not None:
+            best_state = transposition_table.winning_state
+        else:
+            best_state = random.choice(best_states)
+        tie = len({
+            int(transposition_table.first_action[s]) for s in best_states
+        }) > 1
+        action = Action(int(transposition_table.first_action[best_state]))
+        self.search_metrics = SearchMetrics(
+            depth=int(transposition_table.depth[best_state]),
+            visited_node=transposition_table.visited_node,
+            elapsed=time.perf_counter() - self._start,
+            interrupted=transposition_table.interrupted
+        )
+        result = self._step(state, action, render)  # type: ignore
+        if not tie:
+            self._remember(state, stage, self.current_node)  # type: ignore
+        return result
+
+    def _search_transposition(self, state: int) -> List[int]:
+        """
+        Search the states of the current stage from a state in the
+        transposition table.
+
+        Parameters
+        ----------
+        state: int
+            The state to search from.
+
+        Returns
+        -------
+        List[int]
+            The winning state, or else the states of the deepest layer
+            with the best cumulative reward.
+        """
+        table = TransitionTable.shared(self.game_env.env)
+        if self.current_stage is Stage.PICK:
+            actions = [a for a in Action if a is not Action.DROP_OFF]
+            is_winning = self.game_env.passenger_pickedup
+        else:
+            actions = [a for a in Action if a is not Action.PICK_UP]
+            is_winning = self.game_env.passenger_droppedoff
+        self.transposition_table.search(  # type: ignore
+            table=table,
+            root_state=state,  # type: ignore
+            actions=actions,
+            max_depth=self.depth,
+            is_winning=is_winning,
+            out_of_budget=self._out_of_budget
+            if self.time_budget is not None or self.node_budget is not None
+            else None
+        )
+        transposition_table: TranspositionTable = self.transposition_table  # type: ignore
+        if transposition_table.winning_state is not None:
+            return [transposition_table.winning_state]
+        candidates = transposition_table.deepest_layer_states
+        max_cumul_reward = max(
+            transposition_table.cumul_reward[s] for s in candidates
+        )
+        return [
+            s for s in candidates
+            if transposition_table.cumul_reward[s] == max_cumul_reward
+        ]
+
+    def _step(
+        self,
+        state: int,
+        action: Action,
+        render: bool = False
+    ) -> ActionWithReward:
+        """
+        Take an action from a state, the reached state becoming the
+        current node, and update the stage.
+        """
+        self.game_env.back_to(state)
+        next_state, reward, *_ = self.game_env.step(action.value)
+        self.current_node = Node(
+            depth=0,
+            action=action,
+            state=next_state,
+            env_info=self.game_env.info,
+            children=[],
+            reward=reward,
+            cumul_reward=reward
+        )
+        if render:
+            self.game_env.render()
+        if self.game_env.passenger_pickedup(next_state):
+            self.current_stage = Stage.DROP
+        else:
+            self.current_stage = Stage.PICK
+        if self.game_env.passenger_droppedoff(next_state):
+            game_status = GameStatus.TERMINATED
+        else:
+            game_status = GameStatus.RUNNING
+        return ActionWithReward(
+            action=action,
             probability=1.0,
-            reward=best_node.first_layer_parent.reward,
+            reward=reward,
             game_status=game_status
         )
 
@@ -191,44 +669,45 @@ class MonteCarloPolicy(Policy):
         return tree
 
     def train_pickup(self) -> None:
-        # Initialize BFS list with root children
-        self.pick_tree.bfs += self.pick_tree.root_node.children
-
+        tree = self.pick_tree
+        store = tree.store
+        action_masks = self.game_env.index.action_mask
         # Itérer le tableau et exécuter l'action associée à chaque noeud
-        for node in self.pick_tree.bfs:
+        for index in tree.queue:
+            if self._interrupt(tree, index):
+                return
+            parent = int(store.parent[index])
+            action = int(store.action[index])
             # Take back env to parent Node state
-            self.game_env.back_to(node.parent.state)
+            self.game_env.back_to(int(store.state[parent]))
 
             # Exec Node action
-            state, reward, _, _, info = self.game_env.env.step(
-                node.action.value
-            )
+            state, reward, _, _, _ = self.game_env.step(action)
 
             # Process possible Cutoffs
             # Moved wall & wrong pick/drop
-            illegal_action = bool(
-                node.parent.env_info.action_mask[node.action.value] == 0
-            )
+            illegal_action = not (int(store.action_mask[parent]) >> action) & 1
             # Passed on visited state
-            moved_back = bool(state in self.pick_tree.state_history)
+            moved_back = bool(state in tree.state_history)
             # Update du Tree et du Node
-            self.pick_tree.visited_node += 1
-            self.pick_tree.state_history.add(state)
-            node.update_reward(reward)
-            node.state = state
-            node.env_info = EnvironmentInfo(**info)
-            node.update_children_with(node.env_info)
+            tree.visited_node += 1
+            tree.state_history.add(state)
+            action_mask = action_masks.item(state)
+            store.reward[index] = reward
+            store.cumul_reward[index] = reward + store.cumul_reward[parent]
+            store.state[index] = state
+            store.action_mask[index] = action_mask
 
             # Stop if passenger picked up
             if self.game_env.passenger_pickedup(state):
-                node.taxi_on_passenger = True
+                store.taxi_on_passenger[index] = True
+                node = tree.node(index)
                 LOGGER.info(f"Found PICK stage winning node : {node}")
-                self.pick_tree.winning_node = node
+                tree.winning = index
                 self.current_stage = Stage.DROP
                 drop_root_node = Node(
                     depth=0,
                     action=node.action,
-                    parent=node.parent,
                     state=node.state,
                     env_info=node.env_info,
                     children=[],
@@ -244,56 +723,58 @@ class MonteCarloPolicy(Policy):
 
             # Cutoff si mauvaise action choisie
             if illegal_action is False and moved_back is False:
-                self.pick_tree.bfs.extend(node.children)
+                tree.queue.extend(tree.expand(index, action_mask))
 
             # Add Nodes of searching depth to list if no winning Node found
-            if node.depth == self.depth:
-                self.pick_tree.deepest_layer_nodes.append(node)
+            if store.depth[index] == tree.depth:
+                tree.deepest_layer.append(index)
 
     def train_dropoff(self) -> None:
-        # Initialize BFS list with root children
-        self.drop_tree.bfs += self.drop_tree.root_node.children
-
+        tree: MonteCarloTree = self.drop_tree  # type: ignore
+        store = tree.store
+        action_masks = self.game_env.index.action_mask
         # Itérer le tableau et exécuter l'action associée à chaque noeud
-        for node in self.drop_tree.bfs:
-
+        for index in tree.queue:
+            if self._interrupt(tree, index):
+                return
+            parent = int(store.parent[index])
+            action = int(store.action[index])
             # Take back env to parent Node state
-            self.game_env.back_to(node.parent.state)
+            self.game_env.back_to(int(store.state[parent]))
 
             # Exec Node action
-            state, reward, _, _, info = self.game_env.env.step(
-                node.action.value
-            )
+            state, reward, _, _, _ = self.game_env.step(action)
 
             # Process possible Cutoffs
             # Moved wall & wrong pick/drop
-            illegal_action = bool(
-                node.parent.env_info.action_mask[node.action.value] == 0
-            )
+            illegal_action = not (int(store.action_mask[parent]) >> action) & 1
             # Passed on visited state
-            moved_back = bool(state in self.drop_tree.state_history)
+            moved_back = bool(state in tree.state_history)
 
             # Update du Tree et du Node
-            self.drop_tree.visited_node += 1
-            self.drop_tree.state_history.add(state)
-            node.update_reward(reward)
-            node.state = state
-            node.env_info = EnvironmentInfo(**info)
-            node.update_children_with(node.env_info)
+            tree.visited_node += 1
+            tree.state_history.add(state)
+            action_mask = action_masks.item(state)
+            store.reward[index] = reward
+            store.cumul_reward[index] = reward + store.cumul_reward[parent]
+            store.state[index] = state
+            store.action_mask[index] = action_mask
 
             # Stop if passenger dropped off
             if self.game_env.passenger_droppedoff(state):
-                LOGGER.info(f"Found DROP stage winning node : {node}")
-                self.drop_tree.winning_node = node
+                LOGGER.info(
+                    f"Found DROP stage winning node : {tree.node(index)}"
+                )
+                tree.winning = index
                 return
 
             # Cutoff if bad action chosen
             if illegal_action is False and moved_back is False:
-                self.drop_tree.bfs.extend(node.children)
+                tree.queue.extend(tree.expand(index, action_mask))
 
             # Add Nodes of searching depth to list if no winning Node found
-            if node.depth is self.depth:
-                self.drop_tree.deepest_layer_nodes.append(node)
+            if store.depth[index] == tree.depth:
+                tree.deepest_layer.append(index)
 
     def train(self) -> None:
         """
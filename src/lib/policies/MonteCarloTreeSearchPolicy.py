@@ -0,0 +1,236 @@
+import time
+import multiprocessing
+import weakref
+import numpy as np
+from multiprocessing.pool import Pool
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.data.neural_network import Model
+from lib.data.q_table import QTable
+from lib.formulas.monte_carlo_tree_seach import (
+    MonteCarloTreeSearchFormula,
+    _init_search_worker,
+    _search_worker
+)
+from lib.models.Engine import Engine
+from lib.models.Action import Action, ActionWithReward
+from lib.models.Metrics import SearchMetrics
+from lib.policies.Policy import Policy
+
+
+class MonteCarloTreeSearchPolicy(Policy):
+    """
+    Choose each action with a Monte Carlo Tree Search (UCT, or PUCT when
+    `data` is given) started from the current state, taking the most
+    visited action of the root.
+
+    The search itself does not need fewer transitions than the
+    breadth-first MonteCarloPolicy, which prunes revisited states and
+    simulates about 47 transitions per decision: plain UCT rollouts
+    rarely reach the drop off reward, so 200 to 1000 iterations simulate
+    16k to 60k transitions per decision for a lower return. Only a prior
+    computed by a solver brings it under the breadth-first search. Over
+    12 sweeps of value iteration, whose greedy policy alone returns
+    -94.7, PUCT with 10 iterations and `rollout_depth=20` returns 5.75
+    with 20 transitions per decision, against 7.35 at depth 8. Over 14
+    sweeps it returns 8.25 like depth 12. See
+    `benchmarks/mcts_search.py`.
+
+    With several `workers`, the search is root-parallel: each worker
+    process searches from the same state with its own seed and their
+    root statistics are merged to pick the action. The pool, and the
+    search with its transition table in each worker, is created on the
+    first decision and reused until `close()`, called when leaving a
+    `with` block or when the policy is garbage collected. The seeds of
+    the workers are drawn from a generator seeded with `seed`.
+
+    Attributes
+    ----------
+    iterations: int
+        The number of iterations of each search.
+    time_budget: float | None
+        If given, each search also stops after this many seconds.
+    workers: int
+        The number of worker processes, the search being run in the
+        current process if 1.
+    formula: MonteCarloTreeSearchFormula
+        The search, see its attributes for the other parameters.
+    search_metrics: SearchMetrics | None
+        The metrics of the last search.
+    root_statistics: np.ndarray | None
+        The visit count and mean return of each action at the root of
+        the last search, merged over the workers.
+    """
+
+    def __init__(
+        self,
+        game_env: GymnasiumGameEnvironment,
+        iterations: int = 1000,
+        data: QTable | Model | None = None,
+        exploration: float = 1.0,
+        gamma: float = 0.95,
+        rollout: MonteCarloTreeSearchFormula.Rollout =
+            MonteCarloTreeSearchFormula.Rollout.RANDOM,
+        rollout_depth: int = 100,
+        time_budget: float | None = None,
+        workers: int = 1,
+        seed: int | None = None,
+        engine: Engine = Engine.GYM
+    ) -> None:
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
+        self.seed = seed
+        self.type = Policy.Type.DETERMINISTIC
+        self.iterations = iterations
+        self.time_budget = time_budget
+        if workers < 1:
+            raise ValueError("The number of workers should be positive.")
+        self.workers = workers
+        self._pool: Pool | None = None
+        self._pool_finalizer: weakref.finalize | None = None
+        self._worker_seeds = np.random.default_rng(seed)
+        self.formula = MonteCarloTreeSearchFormula(
+            env=game_env,
+            data=data,
+            exploration=exploration,
+            gamma=gamma,
+            rollout=rollout,
+            rollout_depth=rollout_depth
+        )
+        self.search_metrics: SearchMetrics | None = None
+        self.root_statistics: np.ndarray | None = None
+
+    def reset_hyperparameters(self, reset_env: bool = False) -> None:
+        """
+        Resets the environment and the hyperparameters of the policy.
+
+        Parameters
+        ----------
+        reset_env: bool, default=False
+            Decide if the environment should be also reset.
+        """
+        if reset_env:
+            self.game_env.reset(seed=self.seed)
+            self._worker_seeds = np.random.default_rng(self.seed)
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states, each
+        decided by a new search from the state, see `next_action()`. The
+        rollouts being random, another search may decide otherwise.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape `(action_space,)`
+            for a single state and `states.shape + (action_space,)` for
+            an array of states.
+        """
+        states = np.asarray(states)
+        actions = np.zeros(states.shape, dtype=np.int64)
+        for index in np.ndindex(states.shape):
+            actions[index] = self._search(int(states[index])).value
+        return Policy.one_hot_probabilities(actions)
+
+    def close(self) -> None:
+        """
+        Stop the worker processes, if any.
+        """
+        if self._pool_finalizer is not None:
+            self._pool_finalizer()
+            self._pool_finalizer = None
+        self._pool = None
+
+    def __enter__(self) -> "MonteCarloTreeSearchPolicy":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _search(self, state: int) -> Action:
+        """
+        Search from a state, in every worker if several.
+
+        Parameters
+        ----------
+        state: int
+            The state to search from.
+
+        Returns
+        -------
+        Action
+            The best action found.
+        """
+        if self.workers > 1:
+            return self._search_parallel(state)
+        self.search_metrics = self.formula.train(
+            root_state=state,
+            iterations=self.iterations,
+            time_budget=self.time_budget
+        )
+        self.root_statistics = self.formula.root_statistics()
+        return self.formula.best_action()
+
+    def _search_parallel(self, state: int) -> Action:
+        """
+        Search from a state in every worker, see `_search()`.
+
+        Returns
+        -------
+        Action
+            The best action according to the merged root statistics.
+        """
+        start = time.perf_counter()
+        if self._pool is None:
+            self._pool = multiprocessing.get_context().Pool(
+                self.workers,
+                initializer=_init_search_worker,
+                initargs=(self.formula,)
+            )
+            self._pool_finalizer = weakref.finalize(
+                self, _close_pool, self._pool
+            )
+        results = self._pool.starmap(_search_worker, [
+            (
+                state,
+                self.iterations,
+                self.time_budget,
+                int(seed)
+            )
+            for seed in self._worker_seeds.integers(2**32, size=self.workers)
+        ])
+        self.search_metrics = SearchMetrics(
+            depth=max(metrics.depth for _, metrics in results),
+            visited_node=sum(metrics.visited_node for _, metrics in results),
+            elapsed=time.perf_counter() - start,
+            interrupted=any(metrics.interrupted for _, metrics in results)
+        )
+        self.root_statistics = MonteCarloTreeSearchFormula.merge_root_statistics(
+            [statistics for statistics, _ in results]
+        )
+        return MonteCarloTreeSearchFormula.best_root_action(self.root_statistics)
+
+    def next_action(self) -> ActionWithReward:
+        """
+        Search from the current state and take the best action found.
+
+        Returns
+        -------
+        ActionWithReward
+            The action associated with both :
+            - Its immediate reward
+            - Its probability of occurring.
+            - The current game status (terminated, truncated, running)
+        """
+        return self.take_action(self._search(self.game_env.state))
+
+
+def _close_pool(pool: Pool) -> None:
+    """
+    Stop the worker processes of a pool, see `close()`.
+    """
+    pool.terminate()
+    pool.join()
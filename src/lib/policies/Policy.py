@@ -1,7 +1,9 @@
+import numpy as np
 from abc import ABCMeta, abstractmethod
 from enum import Enum
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
 from lib.environment.environment import GameEnvironment
+from lib.models.Engine import Engine
 from lib.models.Action import Action, ActionWithReward
 from lib.models.GameStatus import GameStatus, GameExitStatus
 
@@ -14,6 +16,8 @@ class Policy(metaclass=ABCMeta):
     ----------
     game_env: GymnasiumGameEnvironment
         The game environment.
+    engine: Engine, default=Engine.GYM
+        The stepping engine of the game environment.
     """
 
     class Type(Enum):
@@ -23,9 +27,10 @@ class Policy(metaclass=ABCMeta):
     def __init__(
         self,
         game_env: GymnasiumGameEnvironment,
-        seed: int | None
+        seed: int | None,
+        engine: Engine = Engine.GYM
     ):
-        self.game_env = GameEnvironment(env=game_env, seed=seed)
+        self.game_env = GameEnvironment(env=game_env, seed=seed, engine=engine)
 
     @abstractmethod
     def next_action(self) -> ActionWithReward:
@@ -41,6 +46,85 @@ class Policy(metaclass=ABCMeta):
         """
         pass
 
+    @staticmethod
+    def sample_legal_actions(masks: np.ndarray) -> np.ndarray:
+        """
+        Sample uniformly one legal action per row of action masks.
+
+        Parameters
+        ----------
+        masks: np.ndarray
+            The action masks, of shape `(n, action_space)`.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the sampled action for each row.
+        """
+        masks = np.asarray(masks)
+        legal_counts = masks.sum(axis=1)
+        # Rank of the sampled action among the legal ones of its row
+        ranks = (np.random.random(len(masks)) * legal_counts).astype(np.int64)
+        return np.argmax(masks.cumsum(axis=1) > ranks[:, None], axis=1)
+
+    @staticmethod
+    def one_hot_probabilities(actions: np.ndarray | int) -> np.ndarray:
+        """
+        The probabilities of a deterministic policy taking the given
+        actions.
+
+        Parameters
+        ----------
+        actions: np.ndarray | int
+            The index of the action taken in each state.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `actions.shape + (action_space,)`.
+        """
+        return _ONE_HOT[np.asarray(actions)]
+
+    @staticmethod
+    def uniform_probabilities(masks: np.ndarray) -> np.ndarray:
+        """
+        The probabilities of sampling uniformly one legal action per row
+        of action masks, see `sample_legal_actions()`.
+
+        Parameters
+        ----------
+        masks: np.ndarray
+            The action masks, of shape `(..., action_space)`.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of the shape of the masks.
+        """
+        masks = np.asarray(masks, dtype=np.float64)
+        return masks / masks.sum(axis=-1, keepdims=True)
+
+    @abstractmethod
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of the policy taking each action in one or many
+        states.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, indexed by its value, of
+            shape `(action_space,)` for a single state and
+            `states.shape + (action_space,)` for an array of states.
+        """
+        pass
+
     def is_game_over(self, action: ActionWithReward | GameExitStatus) -> bool:
         """
         Verify if the game is over.
@@ -88,10 +172,9 @@ class Policy(metaclass=ABCMeta):
             If the action is neither an integer or an Action.
         """
         if type(action) is int:
-            new_state, reward, term, trunc, _ = self.game_env.env.step(
+            _, reward, term, trunc, _ = self.game_env.step(
                 action
             )
-            self.game_env.state = new_state
             if term:
                 return ActionWithReward(
                     action=Action(action),
@@ -112,10 +195,9 @@ class Policy(metaclass=ABCMeta):
                     game_status=GameStatus.RUNNING
                 )
         elif type(action) is Action:
-            new_state, reward, term, trunc, _ = self.game_env.env.step(
+            _, reward, term, trunc, _ = self.game_env.step(
                 action.value
             )
-            self.game_env.state = new_state
             if term:
                 return ActionWithReward(
                     action=Action(action),
@@ -138,3 +220,7 @@ class Policy(metaclass=ABCMeta):
             raise TypeError(
                 "The action should either be an integer or an Action."
             )
+
+
+_ONE_HOT = np.eye(len(Action))
+_ONE_HOT.setflags(write=False)
@@ -1,6 +1,7 @@
 import numpy as np
 from typing import Tuple
 from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.models.Engine import Engine
 from lib.models.Action import Action, ActionProbabilities, ActionWithReward
 from lib.models.GameStatus import GameStatus
 from lib.policies.Policy import Policy
@@ -23,9 +24,10 @@ class RandomSamplePolicy(Policy):
     def __init__(
         self,
         game_env: GymnasiumGameEnvironment,
-        seed: int | None = None
+        seed: int | None = None,
+        engine: Engine = Engine.GYM
     ):
-        super().__init__(game_env=game_env, seed=seed)
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
         self.seed = seed
         self.type = Policy.Type.PROBABILISTIC
 
@@ -39,7 +41,7 @@ class RandomSamplePolicy(Policy):
             Decide if the environment should be also reset.
         """
         if reset_env:
-            self.game_env.env.reset(seed=self.seed)
+            self.game_env.reset(seed=self.seed)
 
     @staticmethod
     def actions_probability() -> ActionProbabilities:
@@ -51,13 +53,25 @@ class RandomSamplePolicy(Policy):
         ActionProbabilities
             Action associated with their probabilities.
         """
-        action_names = [action.name for action in list(Action)]
-        action_prob = {
-            action: prob for action, prob in zip(
-                action_names, list(np.full(6, 1/6))
-            )
-        }
-        return ActionProbabilities(**action_prob)
+        return ActionProbabilities.from_array(_UNIFORM)
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states,
+        uniform over every action.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+        """
+        return np.broadcast_to(_UNIFORM, np.shape(states) + _UNIFORM.shape).copy()
 
     def possible_actions(self) -> Tuple[Action, ...]:
         """
@@ -70,6 +84,30 @@ class RandomSamplePolicy(Policy):
         """
         return tuple(list(Action))
 
+    def next_actions(
+        self,
+        states: np.ndarray,
+        masks: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Choose the next action of many game environments at once,
+        e.g. the instances of a VectorGameEnvironment.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            The current state of each game environment.
+        masks: np.ndarray | None, default=None
+            The action mask of each game environment. Ignored as every
+            action can be sampled.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the next action for each game environment.
+        """
+        return np.random.randint(0, len(Action), size=len(states))
+
     def next_action(  # type: ignore
         self,
     ) -> ActionWithReward:
@@ -86,8 +124,7 @@ class RandomSamplePolicy(Policy):
         """
         action = self.game_env.env.action_space.sample()
 
-        new_state, reward, term, trunc, _ = self.game_env.env.step(action)
-        self.game_env.state = new_state
+        _, reward, term, trunc, _ = self.game_env.step(action)
 
         if term:
             return ActionWithReward(
@@ -110,3 +147,6 @@ class RandomSamplePolicy(Policy):
                 probability=float(1/6),
                 game_status=GameStatus.RUNNING
             )
+
+
+_UNIFORM = np.full(len(Action), 1 / len(Action))
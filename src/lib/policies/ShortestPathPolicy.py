@@ -0,0 +1,119 @@
+import numpy as np
+from enum import Enum
+from gymnasium.wrappers.time_limit import TimeLimit as GymnasiumGameEnvironment
+from lib.environment.shortest_paths import ShortestPaths, IN_TAXI
+from lib.models.Engine import Engine
+from lib.models.Action import Action, ActionWithReward
+from lib.policies.Policy import Policy
+
+
+class ShortestPathPolicy(Policy):
+    """
+    Drive optimally along the shortest paths of the map: to the passenger,
+    pick them up, to the destination and drop them off.
+
+    Attributes
+    ----------
+    planner: Planner
+        How the next move is found. It can be either :
+        - TABLE: a lookup in the optimal action of each state, computed
+          on first use from the all-pairs shortest paths
+        - ASTAR: an A* search from the taxi to its target at each step,
+          the tables are never built
+    shortest_paths: ShortestPaths
+        The shortest paths of the map, shared by the environments with
+        the same id.
+    """
+
+    class Planner(Enum):
+        TABLE = "table"
+        ASTAR = "astar"
+
+    def __init__(
+        self,
+        game_env: GymnasiumGameEnvironment,
+        planner: Planner = Planner.TABLE,
+        seed: int | None = None,
+        engine: Engine = Engine.GYM
+    ) -> None:
+        super().__init__(game_env=game_env, seed=seed, engine=engine)
+        self.seed = seed
+        self.type = Policy.Type.DETERMINISTIC
+        self.planner = planner
+        self.shortest_paths = ShortestPaths.shared(game_env)
+
+    def reset_hyperparameters(self, reset_env: bool = False) -> None:
+        """
+        Resets the environment and the hyperparameters of the policy.
+
+        Parameters
+        ----------
+        reset_env: bool, default=False
+            Decide if the environment should be also reset.
+        """
+        if reset_env:
+            self.game_env.reset(seed=self.seed)
+
+    def optimal_action(self, state: int) -> Action:
+        """
+        The optimal action to take in a state.
+
+        Parameters
+        ----------
+        state: int
+            The state of the game environment.
+
+        Returns
+        -------
+        Action
+            The next move along a shortest path to the target of the
+            taxi, or the pickup/dropoff once on it.
+        """
+        if self.planner is ShortestPathPolicy.Planner.TABLE:
+            return Action(int(self.shortest_paths.optimal_action[state]))
+        cell, passenger, _ = self.shortest_paths.locate(state)
+        moves = self.shortest_paths.astar(cell, self.shortest_paths.target(state))
+        if len(moves) != 0:
+            return moves[0]
+        if passenger == IN_TAXI:
+            return Action.DROP_OFF
+        return Action.PICK_UP
+
+    def probabilities(self, states: np.ndarray | int) -> np.ndarray:
+        """
+        The probability of taking each action in one or many states, see
+        `optimal_action()`.
+
+        Parameters
+        ----------
+        states: np.ndarray | int
+            The states of the game environment.
+
+        Returns
+        -------
+        np.ndarray
+            The probability of each action, of shape
+            `states.shape + (action_space,)`.
+        """
+        if self.planner is ShortestPathPolicy.Planner.TABLE:
+            actions = self.shortest_paths.optimal_action[states]
+        else:
+            states = np.asarray(states)
+            actions = np.array([
+                self.optimal_action(state).value for state in states.flat
+            ], dtype=np.int64).reshape(states.shape)
+        return Policy.one_hot_probabilities(actions)
+
+    def next_action(self) -> ActionWithReward:
+        """
+        Take the optimal action in the current state.
+
+        Returns
+        -------
+        ActionWithReward
+            The action associated with both :
+            - Its immediate reward
+            - Its probability of occurring.
+            - The current game status (terminated, truncated, running)
+        """
+        return self.take_action(self.optimal_action(self.game_env.state))
@@ -0,0 +1,59 @@
+from multiprocessing.shared_memory import SharedMemory
+from lib.data.decision_cache import Decision, DecisionCache
+from lib.models.Action import Action
+from lib.models.Stage import Stage
+
+
+def decision(action: Action, next_state: int = 0) -> Decision:
+    return Decision(
+        action=action,
+        next_state=next_state,
+        reward=-1.0,
+        taxi_on_passenger=False,
+        depth=4,
+        visited_node=12
+    )
+
+
+def test_get_and_put_count_hits_and_misses():
+    cache = DecisionCache(500)
+    assert cache.get(42, Stage.PICK) is None
+    cache.put(42, Stage.PICK, decision(Action.NORTH, 142))
+    assert cache.get(42, Stage.DROP) is None
+    assert cache.get(42, Stage.PICK) == decision(Action.NORTH, 142)
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 1
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_least_recently_used_decision_is_evicted():
+    cache = DecisionCache(500, capacity=2)
+    cache.put(1, Stage.PICK, decision(Action.SOUTH))
+    cache.put(2, Stage.PICK, decision(Action.NORTH))
+    cache.get(1, Stage.PICK)
+    cache.put(3, Stage.DROP, decision(Action.EAST))
+    assert len(cache) == 2
+    assert cache.get(2, Stage.PICK) is None
+    assert cache.get(1, Stage.PICK) is not None
+    assert cache.get(3, Stage.DROP) is not None
+    # Replacing a decision does not evict another one
+    cache.put(3, Stage.DROP, decision(Action.WEST))
+    assert len(cache) == 2
+
+
+def test_shared_memory_cache():
+    shared_memory = SharedMemory(create=True, size=DecisionCache.nbytes(500))
+    try:
+        writer = DecisionCache.from_shared_memory(
+            shared_memory, 500, initialize=True
+        )
+        reader = DecisionCache.from_shared_memory(shared_memory, 500)
+        assert reader.get(7, Stage.DROP) is None
+        writer.put(7, Stage.DROP, decision(Action.DROP_OFF, 3))
+        assert reader.get(7, Stage.DROP) == decision(Action.DROP_OFF, 3)
+        assert (writer.hits, writer.misses) == (1, 1)
+        del writer, reader
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
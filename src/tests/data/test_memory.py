@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from lib.data.memory import Memory, Transition
+from lib.models.Action import Action
+
+
+def test_memory_push_and_sample():
+    memory = Memory(10)
+    memory.push(Transition(state=1, action=Action.EAST, next_state=2, reward=-1.0))
+    memory.push(Transition(state=2, action=Action.DROP_OFF, next_state=None, reward=20.0))
+    assert len(memory) == 2
+    assert memory.transitions() == [
+        Transition(state=1, action=Action.EAST, next_state=2, reward=-1.0),
+        Transition(state=2, action=Action.DROP_OFF, next_state=None, reward=20.0)
+    ]
+    batch = memory.sample(2)
+    assert len(batch) == 2
+    assert all(transition.state in (1, 2) for transition in batch)
+
+
+def test_memory_sample_without_replacement():
+    memory = Memory(10)
+    for state in range(10):
+        memory.push(
+            Transition(state=state, action=Action.NORTH, next_state=state + 1, reward=0.0)
+        )
+    for _ in range(20):
+        batch = memory.sample(10)
+        assert sorted(transition.state for transition in batch) == list(range(10))
+
+
+def test_memory_sample_indices_without_replacement():
+    np.random.seed(0)
+    memory = Memory(100)
+    states = np.arange(100)
+    memory.push_many(
+        states, states % 6, np.zeros(100), states, np.zeros(100, dtype=bool)
+    )
+    for batch_size in (1, 10, 40, 60):
+        indices = memory.sample_indices(batch_size, replace=False)
+        assert len(np.unique(indices)) == batch_size
+        assert ((indices >= 0) & (indices < 100)).all()
+
+
+def test_memory_sample_larger_than_memory():
+    memory = Memory(10)
+    with pytest.raises(ValueError):
+        memory.sample(1)
+
+
+def test_memory_ring_buffer_overwrites_oldest():
+    memory = Memory(4)
+    for state in range(6):
+        memory.push(
+            Transition(state=state, action=Action.NORTH, next_state=state + 1, reward=0.0)
+        )
+    assert len(memory) == 4
+    assert [transition.state for transition in memory.transitions()] == [2, 3, 4, 5]
+
+
+def test_memory_push_many_matches_push():
+    rng = np.random.default_rng(0)
+    states = rng.integers(0, 500, size=13)
+    actions = rng.integers(0, 6, size=13)
+    rewards = rng.random(13).astype(np.float32)
+    next_states = rng.integers(0, 500, size=13)
+    dones = rng.random(13) < 0.3
+    expected = Memory(5)
+    for i in range(13):
+        expected.push(Transition(
+            state=int(states[i]),
+            action=list(Action)[actions[i]],
+            reward=float(rewards[i]),
+            next_state=None if dones[i] else int(next_states[i])
+        ))
+    result = Memory(5)
+    result.push_many(states[:2], actions[:2], rewards[:2], next_states[:2], dones[:2])
+    result.push_many(states[2:], actions[2:], rewards[2:], next_states[2:], dones[2:])
+    assert len(result) == 5
+    assert result.transitions() == expected.transitions()
+    batch = result.gather(np.arange(5))
+    assert (batch.state == expected.states).all()
+    assert (batch.done == expected.dones).all()
@@ -1,6 +1,8 @@
+import numpy as np
 from lib.data.monte_carlo_tree import MonteCarloTree
 from lib.models.Action import Action
 from lib.models.Node import Node
+from lib.data.node_store import pack_action_mask
 
 
 def test_create_monte_carlo_tree():
@@ -28,3 +30,43 @@ def test_create_monte_carlo_tree():
     assert result.root_node.path == expected_root_node.path
     for child_node in result.root_node.children:
        assert child_node.parent.path == expected_root_node.path
+
+
+def test_monte_carlo_tree_expands_lazily():
+    actions = [a for a in Action if a is not Action.DROP_OFF]
+    tree = MonteCarloTree(root_node=Node(depth=0), actions=actions, depth=9)
+    assert [child.action for child in tree.root_node.children] == actions
+    assert all(child.children == [] for child in tree.root_node.children)
+    assert tree.created_node == 1 + len(actions)
+
+
+def test_monte_carlo_tree_expand_legal_children_only():
+    actions = [a for a in Action if a is not Action.DROP_OFF]
+    tree = MonteCarloTree(root_node=Node(depth=0), actions=actions, depth=2)
+    index = tree.queue[0]
+    children = tree.expand(index, pack_action_mask(np.array([0, 1, 1, 0, 0, 0])))
+    nodes = [tree.node(child) for child in children]
+    assert [node.action for node in nodes] == [Action.NORTH, Action.EAST]
+    assert [node.path for node in nodes] == ["2B", "2C"]
+    assert all(node.parent == tree.node(index) for node in nodes)
+    assert tree.node(index).children == nodes
+    assert len(tree.expand(children[0])) == 0
+    assert tree.frontier == [children[0]]
+
+
+def test_monte_carlo_tree_node_views():
+    actions = [a for a in Action if a is not Action.DROP_OFF]
+    tree = MonteCarloTree(root_node=Node(depth=0, state=7), actions=actions, depth=3)
+    child = tree.queue[1]
+    grandchild = tree.expand(child)[3]
+    node = tree.node(grandchild)
+    assert node.actions == [Action.NORTH, Action.WEST]
+    assert node.fullpath == "1B2D"
+    assert node.first_layer_parent == tree.node(child)
+    assert tree.first_layer_parent(grandchild) == child
+    assert tree.root_node.state == 7
+    node.state = 12
+    node.cumul_reward = -2.0
+    assert tree.store.state[grandchild] == 12
+    assert tree.node(grandchild).cumul_reward == -2.0
+    assert tree.store.nbytes < 32 * len(tree.store)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from lib.data.memory import PrioritizedMemory
+
+
+def filled_memory(size: int, capacity: int) -> PrioritizedMemory:
+    memory = PrioritizedMemory(capacity, alpha=1.0, beta=1.0)
+    states = np.arange(size)
+    memory.push_many(
+        states, states % 6, np.zeros(size), states, np.zeros(size, dtype=bool)
+    )
+    return memory
+
+
+def test_prioritized_memory_new_transitions_have_max_priority():
+    memory = filled_memory(4, 8)
+    memory.update_priorities(np.array([0]), np.array([3.0]))
+    memory.push_many(*(np.zeros(2, dtype=np.int64) for _ in range(5)))
+    assert memory.tree.priorities[4:6] == pytest.approx([3.0, 3.0])
+    assert memory.tree.priorities[6:].tolist() == [0.0, 0.0]
+
+
+def test_prioritized_memory_samples_proportionally():
+    np.random.seed(0)
+    memory = filled_memory(4, 4)
+    memory.update_priorities(np.arange(4), np.array([0.0, 1.0, 0.0, 3.0]))
+    indices = np.concatenate([memory.sample_indices(4) for _ in range(1000)])
+    counts = np.bincount(indices, minlength=4) / len(indices)
+    assert counts[0] < 0.001 and counts[2] < 0.001
+    assert counts[3] == pytest.approx(0.75, abs=0.01)
+
+
+def test_prioritized_memory_sample():
+    np.random.seed(0)
+    memory = filled_memory(10, 16)
+    memory.update_priorities(np.arange(10), np.arange(10.0))
+    for _ in range(20):
+        batch = memory.sample(4)
+        states = [transition.state for transition in batch]
+        assert len(set(states)) == 4
+        assert 0 not in states
+
+
+def test_prioritized_memory_weights():
+    memory = filled_memory(4, 4)
+    memory.update_priorities(np.arange(4), np.array([1.0, 1.0, 1.0, 3.0]))
+    weights = memory.weights(np.arange(4))
+    assert weights.max() == 1.0
+    assert weights[3] == pytest.approx(1 / 3, rel=1e-4)
+
+
+def test_prioritized_memory_sample_larger_than_memory():
+    memory = filled_memory(2, 4)
+    with pytest.raises(ValueError):
+        memory.sample_indices(3)
@@ -0,0 +1,87 @@
+import os
+import numpy as np
+import gymnasium as gym
+import pytest
+from lib.data.q_table import QTable, QTableHeader
+from lib.formulas.q_learning import QLearning
+from lib.models.Engine import Engine
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+
+def q_learning(seed: int) -> QLearning:
+    env = gym.make("Taxi-v3")
+    env.reset(seed=seed)
+    policy = LegalSamplePolicy(game_env=env, engine=Engine.TABLE)  # type: ignore
+    return QLearning(
+        observation_space=500,
+        action_space=6,
+        policy=policy,
+        max_steps=50,
+        gamma=0.9,
+        lr=0.5
+    )
+
+
+def test_q_table_save_load_roundtrip(tmp_path):
+    path = str(tmp_path / "q_table.bin")
+    q_table = QTable(500, 6, np.random.default_rng(0).random((500, 6)))
+    q_table.save(path, QTableHeader(
+        observation_space=500, action_space=6, gamma=0.9, episode=12
+    ))
+    result = QTable.load(path)
+    assert isinstance(result.values, np.memmap)
+    assert (result.values == q_table.values).all()
+    assert result.header is not None
+    assert result.header.gamma == 0.9
+    assert result.header.episode == 12
+    assert os.listdir(tmp_path) == ["q_table.bin"]
+
+
+def test_q_table_save_keeps_the_file_mode(tmp_path):
+    path = str(tmp_path / "q_table.bin")
+    q_table = QTable(500, 6)
+    umask = os.umask(0o022)
+    try:
+        q_table.save(path)
+        assert os.stat(path).st_mode & 0o777 == 0o644
+        os.chmod(path, 0o640)
+        q_table.save(path)
+        assert os.stat(path).st_mode & 0o777 == 0o640
+    finally:
+        os.umask(umask)
+
+
+def test_q_table_load_read_only(tmp_path):
+    path = str(tmp_path / "q_table.bin")
+    QTable(500, 6).save(path)
+    result = QTable.load(path)
+    assert not result.values.flags.writeable
+    with pytest.raises(ValueError):
+        result.values[0, 0] = 1.0
+
+
+def test_q_table_load_wrong_file(tmp_path):
+    path = tmp_path / "q_table.bin"
+    path.write_bytes(b"not a q-table")
+    with pytest.raises(ValueError):
+        QTable.load(str(path))
+
+
+def test_q_learning_resume_matches_uninterrupted_training(tmp_path):
+    path = str(tmp_path / "checkpoint.bin")
+    np.random.seed(5)
+    expected_model = q_learning(5)
+    expected = expected_model.train(6)
+
+    np.random.seed(5)
+    model = q_learning(5)
+    result = model.train(3, checkpoint=path)
+    np.random.seed(0)
+    resumed = q_learning(0)
+    header = resumed.resume(path)
+    result += resumed.train(3)
+
+    assert header.episode == 3
+    assert resumed.episode == 6
+    assert result == expected
+    assert (resumed.data.values == expected_model.data.values).all()
@@ -0,0 +1,18 @@
+import numpy as np
+from lib.data.sum_tree import SumTree
+
+
+def test_sum_tree_total_and_update():
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+    assert tree.total == 15.0
+    tree.update(np.array([1, 1]), np.array([7.0, 0.0]))
+    assert tree.total == 13.0
+    assert (tree.priorities == [1.0, 0.0, 3.0, 4.0, 5.0]).all()
+
+
+def test_sum_tree_find_follows_cumulative_priorities():
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 0.0, 3.0, 4.0, 5.0]))
+    values = np.array([0.0, 0.5, 1.0, 3.9, 4.0, 7.99, 8.0, 12.99])
+    assert tree.find(values).tolist() == [0, 0, 2, 2, 3, 3, 4, 4]
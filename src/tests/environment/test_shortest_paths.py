@@ -0,0 +1,104 @@
+import numpy as np
+import gymnasium as gym
+from lib.environment.shortest_paths import ShortestPaths
+from lib.environment.transition_table import TransitionTable
+from lib.formulas.dynamic_programming import DynamicProgramming
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.policies.ShortestPathPolicy import ShortestPathPolicy
+
+
+def test_distances_are_shortest_paths():
+    paths = ShortestPaths.shared(gym.make("Taxi-v3"))  # type: ignore
+    assert paths.distance.shape == (25, 25)
+    assert np.all(np.diag(paths.distance) == 0)
+    assert np.all(paths.distance >= 0)
+    assert np.array_equal(paths.distance, paths.distance.T)
+    # (0, 0) to (0, 4) goes around the wall below (0, 1)
+    assert paths.distance[0, 4] == 8
+    for start in range(25):
+        for goal in range(25):
+            assert len(paths.astar(start, goal)) == paths.distance[start, goal]
+
+
+def test_first_moves_follow_shortest_paths():
+    env = gym.make("Taxi-v3")
+    paths = ShortestPaths.shared(env)  # type: ignore
+    table = TransitionTable.shared(env)  # type: ignore
+    for start in range(25):
+        for goal in range(25):
+            if start == goal:
+                assert paths.first_move[start, goal] == -1
+                continue
+            move = paths.first_move[start, goal]
+            state = int(np.flatnonzero(paths.cell == start)[0])
+            assert table.action_mask[state, move] == 1
+            after = paths.cell[table.next_state[state, move]]
+            assert paths.distance[after, goal] == paths.distance[start, goal] - 1
+
+
+def test_neighbours_follow_the_action_masks():
+    env = gym.make("Taxi-v3")
+    paths = ShortestPaths(env)  # type: ignore
+    table = TransitionTable.shared(env)  # type: ignore
+    for state in range(table.observation_space):
+        cell, _, _ = paths.locate(state)
+        expected = [
+            (move, int(paths.cell[table.next_state[state, move]]))
+            for move in range(4)
+            if table.action_mask[state, move] == 1
+        ]
+        assert sorted(paths.neighbours(cell)) == sorted(expected)
+
+
+def test_astar_does_not_build_the_tables():
+    paths = ShortestPaths(gym.make("Taxi-v3"))  # type: ignore
+    for state in (17, 328, 401):
+        cell, _, _ = paths.locate(state)
+        paths.astar(cell, paths.target(state))
+    assert paths._tables is None and paths._decoded is None
+    assert paths.distance[0, 4] == 8
+    assert paths._tables is not None
+
+
+def test_steps_to_go_match_optimal_values():
+    env = gym.make("Taxi-v3")
+    paths = ShortestPaths.shared(env)  # type: ignore
+    solver = DynamicProgramming(env)  # type: ignore
+    solver.value_iteration()
+    playable = paths.passenger != paths.destination
+    # Every step costs 1, except the final drop off which earns 20
+    expected = 21 - paths.steps_to_go[playable]
+    assert np.allclose(solver.data.values.max(axis=1)[playable], expected)
+
+
+def test_shortest_path_policy_is_optimal():
+    env = gym.make("Taxi-v3")
+    for planner in ShortestPathPolicy.Planner:
+        for seed in range(1, 11):
+            policy = ShortestPathPolicy(
+                env, planner=planner, seed=seed, engine=Engine.TABLE  # type: ignore
+            )
+            steps_to_go = policy.shortest_paths.steps_to_go[policy.game_env.state]
+            total, steps = 0.0, 0
+            while True:
+                result = policy.next_action()
+                total += result.reward
+                steps += 1
+                if result.game_status is GameStatus.TERMINATED:
+                    break
+            assert steps == steps_to_go
+            assert total == 21 - steps_to_go
+
+
+def test_shortest_path_policy_probabilities():
+    env = gym.make("Taxi-v3")
+    states = np.arange(0, 500, 7)
+    for planner in ShortestPathPolicy.Planner:
+        policy = ShortestPathPolicy(env, planner=planner, seed=3)  # type: ignore
+        result = policy.probabilities(states)
+        assert result.shape == (len(states), 6)
+        assert np.array_equal(result.argmax(axis=1), [
+            policy.optimal_action(int(state)).value for state in states
+        ])
+        assert np.all(result.sum(axis=1) == 1.0)
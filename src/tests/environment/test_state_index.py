@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+import gymnasium as gym
+from lib.environment.environment import GameEnvironment
+from lib.environment.state_index import ENVIRONMENT_INFO, TAXI, StateIndex
+from lib.models.Action import Action
+from lib.models.Engine import Engine
+from lib.models.Destination import Destination
+from lib.models.EnvironmentInfo import EnvironmentInfo
+from lib.models.Passenger import Passenger
+from lib.models.Taxi import Taxi
+
+
+def test_state_index_matches_decode():
+    env = gym.make("Taxi-v3")
+    index = StateIndex.shared(env)  # type: ignore
+    assert index.decoded.dtype == np.uint8
+    assert np.array_equal(index.decoded, TAXI.decoded)
+    for state in range(500):
+        row, column, passenger, destination = env.unwrapped.decode(state)  # type: ignore
+        assert index.taxi_location[state] == (row, column)
+        assert index.picked_up[state] == (passenger == 4)
+        assert index.dropped_off[state] == (passenger == destination)
+        assert Taxi.location(state) == (row, column)
+        assert Passenger.location(state) is Passenger(passenger)
+        assert Destination.location(state) is Destination(destination)
+    assert Passenger.location(16, absolute=True) == (-1, -1)
+    assert Destination.location(3, absolute=True) == (4, 3)
+
+
+def test_legal_actions_are_interned():
+    env = gym.make("Taxi-v3")
+    index = StateIndex.shared(env)  # type: ignore
+    for state in range(500):
+        mask = env.unwrapped.action_mask(state)  # type: ignore
+        expected = tuple(action for action in Action if mask[action.value] == 1)
+        assert index.legal_actions[state] == expected  # type: ignore
+        assert index.action_mask[state] == sum(  # type: ignore
+            1 << a.value for a in expected
+        )
+        legal_actions = Action.legal_actions(
+            EnvironmentInfo(prob=1.0, action_mask=mask)
+        )
+        assert legal_actions is index.legal_actions[state]  # type: ignore
+        assert Action.legal_actions(mask) is legal_actions
+
+
+def test_game_environment_uses_state_index():
+    game_env = GameEnvironment(gym.make("Taxi-v3"), seed=3)  # type: ignore
+    assert game_env.index is StateIndex.shared(game_env.env)
+    game_env.back_to(328)
+    assert game_env.current_taxi_location() == (4, 2)
+    assert game_env.passenger_pickedup(16) is True
+    assert game_env.passenger_droppedoff(0) is True
+    assert game_env.passenger_droppedoff(328) is False
+
+
+def test_environment_info_is_interned_and_read_only():
+    env = gym.make("Taxi-v3")
+    index = StateIndex.shared(env)  # type: ignore
+    for state in range(500):
+        info = index.info[state]  # type: ignore
+        assert info is ENVIRONMENT_INFO[index.action_mask[state]]  # type: ignore
+        assert np.array_equal(
+            info.action_mask, env.unwrapped.action_mask(state)  # type: ignore
+        )
+        assert info.prob == 1.0
+    with pytest.raises(ValueError):
+        index.info[0].action_mask[0] = 1  # type: ignore
+
+
+@pytest.mark.parametrize("engine", [Engine.GYM, Engine.TABLE])
+def test_game_environment_info_follows_the_state(engine):
+    game_env = GameEnvironment(
+        gym.make("Taxi-v3"), seed=3, engine=engine  # type: ignore
+    )
+    assert game_env.initial_info is game_env.index.info[game_env.state]  # type: ignore
+    for action in (Action.NORTH, Action.WEST, Action.SOUTH, Action.EAST):
+        _, _, _, _, info = game_env.step(action.value)
+        assert game_env.info is game_env.index.info[game_env.state]  # type: ignore
+        assert np.array_equal(game_env.info.action_mask, info["action_mask"])
+    game_env.back_to(328)
+    assert game_env.info is game_env.index.info[328]  # type: ignore
@@ -0,0 +1,93 @@
+import numpy as np
+import gymnasium as gym
+from lib.environment.environment import GameEnvironment
+from lib.environment.transition_table import TransitionTable
+from lib.models.Engine import Engine
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+
+def play(game_env: GameEnvironment, actions: np.ndarray) -> list:
+    trajectory = []
+    for action in actions:
+        state, reward, term, trunc, info = game_env.step(int(action))
+        trajectory.append(
+            (state, float(reward), term, trunc, tuple(info["action_mask"]))
+        )
+        if term or trunc:
+            trajectory.append(game_env.reset()[0])
+    return trajectory
+
+
+def test_transition_table_matches_gym_transitions():
+    env = gym.make("Taxi-v3")
+    table = TransitionTable.from_env(env)
+    for state in range(500):
+        assert (table.action_mask[state] == env.unwrapped.action_mask(state)).all()  # type: ignore
+        for action in range(6):
+            _, next_state, reward, term = env.unwrapped.P[state][action][0]  # type: ignore
+            assert table.next_state[state, action] == next_state
+            assert table.reward[state, action] == reward
+            assert table.terminated[state, action] == term
+
+
+def test_transition_table_is_shared_and_read_only():
+    first = TransitionTable.shared(gym.make("Taxi-v3"))
+    second = TransitionTable.shared(gym.make("Taxi-v3"))
+    assert first is second
+    assert not first.next_state.flags.writeable
+
+
+def test_table_engine_step_from_every_state():
+    gym_env = GameEnvironment(gym.make("Taxi-v3"), seed=42)  # type: ignore
+    table_env = GameEnvironment(
+        gym.make("Taxi-v3"), seed=42, engine=Engine.TABLE  # type: ignore
+    )
+    for state in range(500):
+        for action in range(6):
+            gym_env.back_to(state)
+            table_env.back_to(state)
+            expected = gym_env.step(action)
+            result = table_env.step(action)
+            assert result[:3] == expected[:3]
+            assert (result[4]["action_mask"] == expected[4]["action_mask"]).all()
+
+
+def test_table_engine_trajectory_matches_gym():
+    actions = np.random.default_rng(0).integers(0, 6, size=2000)
+    expected = play(
+        GameEnvironment(gym.make("Taxi-v3"), seed=7), actions  # type: ignore
+    )
+    result = play(
+        GameEnvironment(
+            gym.make("Taxi-v3"), seed=7, engine=Engine.TABLE  # type: ignore
+        ),
+        actions
+    )
+    assert any(type(step) is tuple and step[3] for step in expected)
+    assert result == expected
+
+
+def test_table_engine_truncation_ignores_back_to():
+    game_env = GameEnvironment(
+        gym.make("Taxi-v3"), seed=42, engine=Engine.TABLE  # type: ignore
+    )
+    for _ in range(199):
+        game_env.back_to(game_env.initial_state)
+        *_, trunc, _ = game_env.step(1)
+        assert trunc is False
+    *_, trunc, _ = game_env.step(1)
+    assert trunc is True
+
+
+def test_legal_sample_policy_table_engine_matches_gym():
+    trajectories = []
+    for engine in Engine:
+        np.random.seed(3)
+        policy = LegalSamplePolicy(
+            game_env=gym.make("Taxi-v3"), seed=3, engine=engine  # type: ignore
+        )
+        trajectories.append([
+            (policy.next_action().action, policy.game_env.state)
+            for _ in range(100)
+        ])
+    assert trajectories[0] == trajectories[1]
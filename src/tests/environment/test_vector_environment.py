@@ -0,0 +1,63 @@
+import numpy as np
+import gymnasium as gym
+import pytest
+from lib.environment.environment import GameEnvironment
+from lib.environment.vector_environment import VectorGameEnvironment
+from lib.models.Engine import Engine
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+
+def test_vector_environment_initial_states_match_seeds():
+    vector_env = VectorGameEnvironment(gym.make("Taxi-v3"), 3, seed=[42, 10, 25])  # type: ignore
+    expected = [
+        GameEnvironment(gym.make("Taxi-v3"), seed=seed).state  # type: ignore
+        for seed in (42, 10, 25)
+    ]
+    assert list(vector_env.states) == expected
+
+
+def test_vector_environment_numpy_integer_seed():
+    seeds = np.array([7, 3])
+    result = VectorGameEnvironment(gym.make("Taxi-v3"), 3, seed=seeds[0])  # type: ignore
+    expected = VectorGameEnvironment(gym.make("Taxi-v3"), 3, seed=7)  # type: ignore
+    assert list(result.states) == list(expected.states)
+
+
+def test_vector_environment_wrong_number_of_actions():
+    vector_env = VectorGameEnvironment(gym.make("Taxi-v3"), 4, seed=0)  # type: ignore
+    with pytest.raises(ValueError, match="one action per environment"):
+        vector_env.step(np.zeros(3, dtype=np.int64))
+
+
+def test_vector_environment_slots_match_game_environment():
+    seeds = [3, 4, 5]
+    vector_env = VectorGameEnvironment(gym.make("Taxi-v3"), 3, seed=seeds)  # type: ignore
+    game_envs = [
+        GameEnvironment(gym.make("Taxi-v3"), seed=seed, engine=Engine.TABLE)  # type: ignore
+        for seed in seeds
+    ]
+    actions = np.random.default_rng(0).integers(0, 6, size=(1000, 3))
+    truncated_once = False
+    for step_actions in actions:
+        states, rewards, term, trunc, masks = vector_env.step(step_actions)
+        truncated_once |= bool(trunc.any())
+        for slot, game_env in enumerate(game_envs):
+            state, reward, t, tr, info = game_env.step(int(step_actions[slot]))
+            assert (states[slot], rewards[slot]) == (state, reward)
+            assert (term[slot], trunc[slot]) == (t, tr)
+            assert (masks[slot] == info["action_mask"]).all()
+            if t or tr:
+                game_env.reset()
+            assert vector_env.states[slot] == game_env.state
+    assert truncated_once
+
+
+def test_vector_environment_with_legal_sample_policy():
+    np.random.seed(0)
+    policy = LegalSamplePolicy(game_env=gym.make("Taxi-v3"), seed=0)  # type: ignore
+    vector_env = VectorGameEnvironment(gym.make("Taxi-v3"), 64, seed=0)  # type: ignore
+    for _ in range(50):
+        masks = vector_env.action_masks
+        actions = policy.next_actions(vector_env.states, masks)
+        assert (masks[np.arange(64), actions] == 1).all()
+        vector_env.step(actions)
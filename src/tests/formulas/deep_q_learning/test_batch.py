@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+import torch
+import gymnasium as gym
+from lib.data.memory import Memory, PrioritizedMemory
+from lib.formulas.deep_q_learning import DeepQLearning
+from lib.models.Engine import Engine
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+
+def deep_q_learning() -> DeepQLearning:
+    torch.manual_seed(0)
+    policy = LegalSamplePolicy(
+        game_env=gym.make("Taxi-v3"), seed=1, engine=Engine.TABLE  # type: ignore
+    )
+    model = DeepQLearning(
+        policy=policy,  # type: ignore
+        loss_function=torch.nn.SmoothL1Loss(),
+        optimizer=None,  # type: ignore
+        data=Memory(1000),
+        gamma=0.9,
+        batch_size=16
+    )
+    model.optimizer = torch.optim.SGD(
+        model.policy_network.model.parameters(), lr=0.01
+    )
+    return model
+
+
+def legacy_loss(model: DeepQLearning, batch: list) -> torch.Tensor:
+    states, actions, rewards, n_states = Memory.prepare_batch(batch)
+    actions = Memory.action_to_index(actions)
+    q_values = model.policy_network.model(
+        torch.stack(states)
+    ).gather(1, actions.unsqueeze(1))
+    non_final_mask = torch.tensor([s is not None for s in n_states])
+    vs = torch.zeros(len(batch))
+    with torch.no_grad():
+        vs[non_final_mask] = model.target_network.model(
+            torch.stack([s for s in n_states if s is not None])
+        ).max(1).values
+    target_q_values = model._target_q(
+        torch.tensor(np.array(rewards, dtype="float32")), vs
+    )
+    return model.loss_function(q_values, target_q_values.unsqueeze(1))
+
+
+def test_batch_loss_matches_legacy_batch_preparation():
+    model = deep_q_learning()
+    rng = np.random.default_rng(0)
+    model.data.push_many(
+        rng.integers(0, 500, size=64),
+        rng.integers(0, 6, size=64),
+        rng.normal(size=64).astype(np.float32),
+        rng.integers(0, 500, size=64),
+        rng.random(64) < 0.2
+    )
+    indices = rng.integers(0, 64, size=16)
+    batch = model.data.gather(indices)
+    transitions = Memory._to_transitions(batch)
+    expected = legacy_loss(model, transitions)
+    result, _ = model._loss(batch)
+    assert torch.allclose(result, expected)
+
+
+def test_do_episode_optimizes_the_policy_network():
+    model = deep_q_learning()
+    before = [p.clone() for p in model.policy_network.model.parameters()]
+    metrics = model.do_episode()
+    assert metrics.steps == 50
+    assert len(model.data) == 50
+    after = list(model.policy_network.model.parameters())
+    assert any((b != a).any() for b, a in zip(before, after))
+
+
+def test_prioritized_replay_updates_priorities():
+    model = deep_q_learning()
+    model.data = PrioritizedMemory(1000)
+    model.train(1)
+    priorities = model.data.tree.priorities[:len(model.data)]
+    assert len(model.data) == 50
+    assert (priorities > 0).all()
+    assert (priorities != 1.0).any()
+
+
+def test_target_cache_matches_target_network():
+    model = deep_q_learning()
+    model.do_episode()
+    batch = model.data.gather(np.arange(len(model.data)))
+    expected, _ = model._loss(batch)
+    model.cache_targets = True
+    result, _ = model._loss(batch)
+    assert torch.allclose(result, expected)
+
+
+def test_target_cache_invalidated_by_target_update():
+    model = deep_q_learning()
+    model.cache_targets = True
+    cached = model._max_target_values()
+    assert model._max_target_values() is cached
+    with torch.no_grad():
+        for parameter in model.policy_network.model.parameters():
+            parameter.add_(1.0)
+    model._update_target_network()
+    assert model._max_target_values() is not cached
+
+
+def test_target_network_update_loads_the_policy_weights():
+    model = deep_q_learning()
+    with torch.no_grad():
+        for parameter in model.policy_network.model.parameters():
+            parameter.add_(1.0)
+    model._update_target_network()
+    states = torch.eye(500)
+    with torch.no_grad():
+        assert torch.allclose(
+            model.target_network.model(states),
+            model.policy_network.model(states)
+        )
+
+
+def test_weighted_loss_leaves_the_loss_function_unchanged():
+    model = deep_q_learning()
+    model.loss_function = torch.nn.SmoothL1Loss(beta=0.5)
+    model.do_episode()
+    batch = model.data.gather(np.arange(len(model.data)))
+    weights = torch.ones(len(model.data))
+    result, _ = model._loss(batch, weights)
+    expected, _ = model._loss(batch)
+    assert torch.allclose(result, expected)
+    assert model.loss_function.reduction == "mean"
+    model.loss_function = lambda x, y: ((x - y) ** 2).mean()  # type: ignore
+    with pytest.raises(TypeError):
+        model._loss(batch, weights)
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+import gymnasium as gym
+from lib.data.neural_network import Model
+from lib.formulas.distillation import Distillation
+from lib.formulas.dynamic_programming import DynamicProgramming
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.policies.DQNPolicy import DQNPolicy
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+from lib.policies.ShortestPathPolicy import ShortestPathPolicy
+
+
+def initial_states(env) -> np.ndarray:
+    return np.flatnonzero(env.unwrapped.initial_state_distrib)
+
+
+def test_reachable_states():
+    env = gym.make("Taxi-v3")
+    states = Distillation(env).reachable_states()  # type: ignore
+    # The passenger is never at its destination before being dropped off
+    assert len(states) == 400
+    assert set(initial_states(env)) <= set(states)
+
+
+def test_distill_q_table_and_model():
+    env = gym.make("Taxi-v3")
+    distillation = Distillation(env)  # type: ignore
+    solver = DynamicProgramming(env)  # type: ignore
+    solver.value_iteration()
+    policy = distillation.from_q_table(solver.data)
+    assert policy.actions.dtype == np.uint8
+    assert policy.actions.shape == (500,)
+    assert np.array_equal(policy.actions, solver.data.values.argmax(axis=1))
+    assert policy.data.values is not solver.data.values  # type: ignore
+    model = Model(500, 6, 16)
+    policy = distillation.from_model(model)
+    assert policy.data.values.shape == (500, 6)  # type: ignore
+    assert np.array_equal(policy.actions, policy.data.values.argmax(axis=1))  # type: ignore
+
+
+def test_distill_policy_values_and_play():
+    env = gym.make("Taxi-v3")
+    distillation = Distillation(env, engine=Engine.TABLE)  # type: ignore
+    teacher = ShortestPathPolicy(env, engine=Engine.TABLE)  # type: ignore
+    policy = distillation.from_policy(teacher)
+    states = distillation.reachable_states()
+    assert np.array_equal(
+        policy.actions[states], teacher.shortest_paths.optimal_action[states]
+    )
+    values = policy.data.values[states, policy.actions[states]]  # type: ignore
+    assert np.allclose(values, 21 - teacher.shortest_paths.steps_to_go[states])
+    policy.seed = 3
+    policy.reset_hyperparameters(reset_env=True)
+    for _ in range(30):
+        if policy.next_action().game_status is GameStatus.TERMINATED:
+            break
+    else:
+        assert False, "The passenger should be dropped off."
+
+
+def test_distill_monte_carlo_policy_in_parallel():
+    env = gym.make("Taxi-v3")
+    distillation = Distillation(env, engine=Engine.TABLE)  # type: ignore
+    teacher = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=10, engine=Engine.TABLE  # type: ignore
+    )
+    sequential = distillation.from_policy(teacher, seed=1)
+    parallel = distillation.from_policy(teacher, workers=2, seed=1)
+    states = initial_states(env)
+    optimal = DynamicProgramming(env)  # type: ignore
+    optimal.value_iteration()
+    for policy in (sequential, parallel):
+        # Deep enough to always find the next pickup or dropoff
+        assert np.allclose(
+            policy.data.values[states, policy.actions[states]],  # type: ignore
+            optimal.data.values[states].max(axis=1)
+        )
+
+
+def test_distill_looping_policy():
+    env = gym.make("Taxi-v3")
+    distillation = Distillation(env, engine=Engine.TABLE)  # type: ignore
+    teacher = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=4, engine=Engine.TABLE  # type: ignore
+    )
+    with pytest.raises(ValueError, match="never ends the game"):
+        distillation.from_policy(teacher, seed=1)
+    policy = distillation.from_policy(teacher, seed=1, check=False)
+    looping = distillation.looping_states(policy.actions)
+    assert len(looping) != 0
+    assert set(looping) <= set(initial_states(env))
+    # A looping trajectory is truncated with the lowest values
+    values = policy.data.values[looping, policy.actions[looping]]  # type: ignore
+    assert np.all(values < -100)
+    optimal = distillation.from_policy(ShortestPathPolicy(env))  # type: ignore
+    assert len(distillation.looping_states(optimal.actions)) == 0
+
+
+def test_distilled_policy_probabilities_match_the_teacher():
+    env = gym.make("Taxi-v3")
+    model = Model(500, 6, 16)
+    teacher = DQNPolicy(env, policy_network=model, seed=3)  # type: ignore
+    policy = Distillation(env).from_model(model)  # type: ignore
+    states = np.arange(500).reshape(4, 125)
+    result = policy.probabilities(states)
+    assert result.shape == (4, 125, 6)
+    assert np.array_equal(result, teacher.probabilities(states))
+    assert np.array_equal(policy.probabilities(7), np.eye(6)[policy.actions[7]])
+
+
+def test_distilled_search_matches_its_probabilities():
+    env = gym.make("Taxi-v3")
+    distillation = Distillation(env)  # type: ignore
+    search = MonteCarloPolicy(env, depth=10, seed=3, engine=Engine.TABLE)  # type: ignore
+    policy = distillation.from_policy(search)
+    states = distillation.reachable_states()[:40]
+    result = search.probabilities(states)
+    decided = result.max(axis=1) == 1.0
+    assert decided.any()
+    assert np.array_equal(result[decided].argmax(axis=1), policy.actions[states][decided])
@@ -0,0 +1,67 @@
+import numpy as np
+import gymnasium as gym
+from lib.data.q_table import QTable
+from lib.environment.environment import GameEnvironment
+from lib.formulas.dynamic_programming import DynamicProgramming
+from lib.formulas.q_learning import QLearning
+from lib.models.Engine import Engine
+from lib.policies.GreedyPolicy import GreedyPolicy
+
+
+def test_value_iteration_converges():
+    solver = DynamicProgramming(gym.make("Taxi-v3"), gamma=0.9)  # type: ignore
+    result = solver.value_iteration()
+    assert result.converged
+    assert result.delta <= solver.tolerance
+    assert type(solver.data) is QTable
+
+
+def test_value_and_policy_iteration_agree():
+    env = gym.make("Taxi-v3")
+    value = DynamicProgramming(env, gamma=0.9)  # type: ignore
+    value.value_iteration()
+    policy = DynamicProgramming(env, gamma=0.9)  # type: ignore
+    result = policy.policy_iteration()
+    assert result.converged
+    assert np.allclose(value.data.values, policy.data.values, atol=1e-6)
+
+
+def test_value_iteration_iteration_cap():
+    solver = DynamicProgramming(
+        gym.make("Taxi-v3"), gamma=0.9, max_iterations=3  # type: ignore
+    )
+    result = solver.value_iteration()
+    assert result.iterations == 3
+    assert not result.converged
+
+
+def test_optimal_q_table_predicts_greedy_return():
+    env = gym.make("Taxi-v3")
+    solver = DynamicProgramming(env, gamma=1.0)  # type: ignore
+    assert solver.policy_iteration().converged
+    game_env = GameEnvironment(env, seed=42, engine=Engine.TABLE)  # type: ignore
+    expected = solver.data.values[game_env.state].max()
+    result = 0.0
+    term = False
+    while not term:
+        action = int(solver.data.values[game_env.state].argmax())
+        _, reward, term, _, _ = game_env.step(action)
+        result += reward
+    assert result == expected
+
+
+def test_optimal_q_table_warm_starts_q_learning():
+    env = gym.make("Taxi-v3")
+    solver = DynamicProgramming(env, gamma=1.0)  # type: ignore
+    solver.value_iteration()
+    policy = GreedyPolicy(game_env=env, seed=42)  # type: ignore
+    q_learning = QLearning(
+        observation_space=500,
+        action_space=6,
+        policy=policy,
+        data=solver.data
+    )
+    metrics = q_learning.do_episode()
+    assert metrics.cumulative_reward == solver.data.values[
+        policy.game_env.initial_state
+    ].max()
@@ -1,5 +1,7 @@
 import gymnasium as gym
 import numpy as np
+from lib.data.q_table import QTable
+from lib.policies.EpsilonGreedyPolicy import EpsilonGreedyPolicy
 from lib.policies.LegalSamplePolicy import LegalSamplePolicy
 from lib.policies.RandomSamplePolicy import RandomSamplePolicy
 from lib.formulas.q_learning import QLearning
@@ -35,3 +37,37 @@ def test_j_legal_sample_policy():
     expected = (q_values * probs).sum()
     result = q_learning.j()
     assert result == expected
+
+
+def test_j_does_not_step():
+    env = gym.make("Taxi-v3")
+    policy = LegalSamplePolicy(game_env=env, seed=42)  # type: ignore
+    values = np.random.default_rng(0).normal(size=(500, 6))
+    q_learning = QLearning(
+        observation_space=500,
+        action_space=6,
+        policy=policy,
+        data=QTable(500, 6, data=values)
+    )
+    state = policy.game_env.state
+    mask = env.unwrapped.action_mask(state)  # type: ignore
+    expected = values[state][mask == 1].mean()
+    assert np.isclose(q_learning.j(), expected)
+    assert policy.game_env.state == state
+
+
+def test_expected_values_of_many_states():
+    env = gym.make("Taxi-v3")
+    policy = EpsilonGreedyPolicy(game_env=env, epsilon=0.2, seed=42)  # type: ignore
+    values = np.random.default_rng(0).normal(size=(500, 6))
+    q_learning = QLearning(
+        observation_space=500,
+        action_space=6,
+        policy=policy,
+        data=QTable(500, 6, data=values)
+    )
+    states = np.arange(500).reshape(20, 25)
+    result = q_learning.expected_values(states)
+    assert result.shape == (20, 25)
+    expected = 0.8 * values.max(axis=1) + 0.2 * values.mean(axis=1)
+    assert np.allclose(result.reshape(-1), expected)
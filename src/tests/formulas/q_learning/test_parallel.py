@@ -0,0 +1,47 @@
+import numpy as np
+import gymnasium as gym
+from lib.formulas.q_learning import QLearning
+from lib.models.Engine import Engine
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+
+def q_learning() -> QLearning:
+    env = gym.make("Taxi-v3")
+    policy = LegalSamplePolicy(game_env=env, engine=Engine.TABLE)  # type: ignore
+    return QLearning(
+        observation_space=500,
+        action_space=6,
+        policy=policy,
+        max_steps=20,
+        gamma=0.9,
+        lr=0.5
+    )
+
+
+def test_parallel_train_single_worker_is_reproducible():
+    first = q_learning()
+    first_metrics = first.train(20, workers=1, seed=3)
+    second = q_learning()
+    second_metrics = second.train(20, workers=1, seed=3)
+    assert first_metrics == second_metrics
+    assert (first.data.values == second.data.values).all()
+    assert (first.data.values != 0).any()
+
+
+def test_parallel_train_merges_metrics_in_episode_order():
+    model = q_learning()
+    metrics = model.train(10, workers=3, seed=0)
+    assert [metric.worker for metric in metrics] == [
+        0, 1, 2, 0, 1, 2, 0, 1, 2, 0
+    ]
+
+
+def test_parallel_train_striped_locking_updates_q_table():
+    model = q_learning()
+    values = model.data.values
+    metrics = model.train(
+        10, workers=2, seed=0, locking=QLearning.Locking.STRIPED, stripes=4
+    )
+    assert len(metrics) == 10
+    assert model.data.values is values
+    assert np.count_nonzero(values) > 0
@@ -0,0 +1,84 @@
+import numpy as np
+import gymnasium as gym
+from lib.data.q_table import QTable
+from lib.formulas.q_learning import QLearning
+from lib.models.Metrics import EpisodeMetrics
+from lib.policies.EpsilonGreedyPolicy import EpsilonGreedyPolicy
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+
+
+def q_learning(gamma: float = 0.9, lr: float = 0.5) -> QLearning:
+    env = gym.make("Taxi-v3")
+    policy = LegalSamplePolicy(game_env=env, seed=42)  # type: ignore
+    rng = np.random.default_rng(0)
+    return QLearning(
+        observation_space=500,
+        action_space=6,
+        policy=policy,
+        data=QTable(500, 6, data=rng.normal(size=(500, 6))),
+        gamma=gamma,
+        lr=lr
+    )
+
+
+def batch(size: int = 2000):
+    # Few states so that the batch holds many duplicates
+    rng = np.random.default_rng(1)
+    states = rng.integers(0, 10, size=size)
+    actions = rng.integers(0, 6, size=size)
+    rewards = rng.normal(size=size)
+    next_states = rng.integers(0, 10, size=size)
+    return states, actions, rewards, next_states
+
+
+def test_batch_update_sequential_matches_loop():
+    states, actions, rewards, next_states = batch()
+    expected = q_learning()
+    for s, a, r, n in zip(states, actions, rewards, next_states):
+        expected.data.values[s, a] += expected.lr * (
+            r + expected.gamma * expected.data.values[n].max()
+            - expected.data.values[s, a]
+        )
+    result = q_learning()
+    result.do_batch_update(states, actions, rewards, next_states)
+    assert np.allclose(result.data.values, expected.data.values)
+
+
+def test_batch_update_average():
+    result = q_learning(gamma=0.0, lr=1.0)
+    result.do_batch_update(
+        np.array([0, 0, 1]),
+        np.array([2, 2, 3]),
+        np.array([1.0, 3.0, -1.0]),
+        np.array([5, 6, 7]),
+        duplicates=QLearning.Duplicates.AVERAGE
+    )
+    assert result.data.values[0, 2] == 2.0
+    assert result.data.values[1, 3] == -1.0
+
+
+def test_train_vectorized_metrics():
+    np.random.seed(0)
+    model = q_learning()
+    metrics = model.train_vectorized(num_episodes=300, num_envs=32, seed=0)
+    assert len(metrics) == 300
+    assert all(type(metric) is EpisodeMetrics for metric in metrics)
+    assert all(1 <= metric.steps <= model.max_steps for metric in metrics)
+
+
+def test_train_vectorized_epsilon_greedy_learns():
+    np.random.seed(0)
+    env = gym.make("Taxi-v3")
+    policy = EpsilonGreedyPolicy(
+        game_env=env, legal=True, epsilon=1.0, decay_rate=0.05, seed=42  # type: ignore
+    )
+    model = QLearning(
+        observation_space=500,
+        action_space=6,
+        policy=policy,
+        gamma=0.95,
+        lr=0.5
+    )
+    metrics = model.train_vectorized(num_episodes=6000, num_envs=256, seed=0)
+    last = [metric.cumulative_reward for metric in metrics[-500:]]
+    assert np.mean(last) > 0
@@ -0,0 +1,71 @@
+import pickle
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from lib.data.memory import Transition
+from lib.models.Action import Action, ActionWithReward
+from lib.models.GameStatus import GameStatus
+from lib.models.Metrics import EpisodeMetrics
+from lib.models.Record import FAST_MODE, Record, record_of
+
+
+def model_of(model):
+    # The names are bound to records when the tests run in fast mode
+    return model._model if FAST_MODE else model
+
+
+def test_record_keeps_fields_and_defaults():
+    Fast = record_of(model_of(ActionWithReward))
+    result = Fast(action=Action.SOUTH, reward=-1.0, game_status=GameStatus.RUNNING)
+    assert result.probability is None
+    assert result.reward == -1.0
+    assert not hasattr(result, "__dict__")
+    with pytest.raises(TypeError):
+        Fast(action=Action.SOUTH, reward=-1.0)
+
+
+def test_record_equals_its_model():
+    model = model_of(EpisodeMetrics)
+    values = {"steps": 12, "cumulative_reward": 9.0}
+    record = record_of(model)(**values)
+    assert record == model(**values)
+    assert record == record_of(model)(**values)
+    assert record != record_of(model)(steps=13, cumulative_reward=9.0)
+    assert record.model_dump() == model(**values).model_dump()
+    assert record.model_copy(update={"steps": 13}).steps == 13
+    assert type(record).__name__ == "EpisodeMetrics"
+    assert isinstance(record, Record)
+
+
+def test_record_keeps_model_methods():
+    Fast = record_of(model_of(ActionWithReward))
+    records = [
+        Fast(action=Action.SOUTH, reward=-1.0, probability=0.5,
+             game_status=GameStatus.RUNNING),
+        Fast(action=Action.NORTH, reward=20.0, probability=1.0,
+             game_status=GameStatus.TERMINATED),
+    ]
+    np.testing.assert_array_equal(
+        Fast.flatten(records), [[-1.0, 20.0], [0.5, 1.0]]
+    )
+
+
+def test_record_is_validated_at_the_boundary():
+    model = model_of(Transition)
+    record = record_of(model)(state=1, action=Action.SOUTH, next_state=None, reward=-1)
+    validated = record.to_model()
+    assert type(validated) is model
+    assert validated.reward == -1.0
+    with pytest.raises(ValidationError):
+        record.model_copy(update={"state": "north"}).to_model()
+
+
+def test_record_is_built_once_per_model():
+    model = model_of(Transition)
+    assert record_of(model) is record_of(model)
+
+
+@pytest.mark.skipif(not FAST_MODE, reason="records are bound in fast mode")
+def test_fast_mode_records_can_be_pickled():
+    record = EpisodeMetrics(steps=12, cumulative_reward=9.0)
+    assert pickle.loads(pickle.dumps(record)) == record
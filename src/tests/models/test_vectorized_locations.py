@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from lib.environment.state_index import decode, encode, IN_TAXI
+from lib.models.Destination import Destination
+from lib.models.Passenger import Passenger
+from lib.models.Taxi import Taxi
+
+STATES = np.arange(500)
+
+
+def test_taxi_locations():
+    result = Taxi.locations(STATES)
+    expected = np.array([Taxi.location(int(state)) for state in STATES])
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_passenger_locations():
+    result = Passenger.locations(STATES)
+    expected = [Passenger.location(int(state)).value for state in STATES]
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_passenger_absolute_locations():
+    result = Passenger.locations(STATES, absolute=True)
+    expected = [
+        Passenger.location(int(state), absolute=True) for state in STATES
+    ]
+    np.testing.assert_array_equal(result, expected)
+    assert (result[STATES // 4 % 5 == IN_TAXI] == -1).all()
+
+
+def test_destination_locations():
+    result = Destination.locations(STATES)
+    expected = [Destination.location(int(state)).value for state in STATES]
+    np.testing.assert_array_equal(result, expected)
+    absolute = Destination.locations(STATES, absolute=True)
+    expected = [
+        Destination.location(int(state), absolute=True) for state in STATES
+    ]
+    np.testing.assert_array_equal(absolute, expected)
+
+
+def test_locations_keep_the_shape():
+    states = STATES.reshape(5, 10, 10)
+    assert Taxi.locations(states).shape == (5, 10, 10, 2)
+    assert Passenger.locations(states).shape == (5, 10, 10)
+    assert Passenger.locations(states, absolute=True).shape == (5, 10, 10, 2)
+    assert Destination.locations(states).shape == (5, 10, 10)
+    assert Taxi.locations(np.int64(7)).shape == (2,)
+
+
+def test_encode_is_the_inverse_of_decode():
+    decoded = decode(STATES.reshape(20, 25))
+    result = encode(*np.moveaxis(decoded, -1, 0))
+    np.testing.assert_array_equal(result, STATES.reshape(20, 25))
+
+
+def test_encode_broadcasts():
+    result = encode(np.arange(5)[:, None], np.arange(5), IN_TAXI, 0)
+    assert result.shape == (5, 5)
+    assert (Passenger.locations(result) == IN_TAXI).all()
+    assert encode(4, 3, 0, 2) == 4 * 100 + 3 * 20 + 0 * 4 + 2
+
+
+def test_decode_out_of_range_state():
+    with pytest.raises(ValueError):
+        decode(np.array([0, 500]))
+    with pytest.raises(ValueError):
+        Taxi.locations(np.array([-1]))
+
+
+@pytest.mark.parametrize("values", [
+    (5, 0, 0, 0),
+    (0, -1, 0, 0),
+    (0, 0, 5, 0),
+    (0, 0, 0, 4),
+    (np.arange(6), 0, 0, 0),
+])
+def test_encode_out_of_range(values):
+    with pytest.raises(ValueError):
+        encode(*values)
@@ -0,0 +1,26 @@
+import numpy as np
+import gymnasium as gym
+from lib.policies.EpsilonGreedyPolicy import EpsilonGreedyPolicy
+
+
+def test_epsilon_greedy_policy_next_actions_exploit():
+    env = gym.make("Taxi-v3")
+    policy = EpsilonGreedyPolicy(game_env=env, epsilon=0.0, seed=42)  # type: ignore
+    masks = np.ones((100, 6), dtype="int8")
+    greedy = np.full(100, 4)
+    result = policy.next_actions(np.zeros(100, dtype=np.int64), masks, greedy)
+    assert (result == greedy).all()
+
+
+def test_epsilon_greedy_policy_next_actions_explore_legal():
+    env = gym.make("Taxi-v3")
+    policy = EpsilonGreedyPolicy(
+        game_env=env, epsilon=1.0, decay_rate=0.0, legal=True, seed=42  # type: ignore
+    )
+    masks = np.zeros((100, 6), dtype="int8")
+    masks[:, 1] = 1
+    result = policy.next_actions(
+        np.zeros(100, dtype=np.int64), masks, np.full(100, 4)
+    )
+    assert (result == 1).all()
+    assert policy._steps == 1
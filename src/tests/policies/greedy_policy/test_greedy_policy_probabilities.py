@@ -0,0 +1,62 @@
+import numpy as np
+import gymnasium as gym
+import pytest
+from lib.data.q_table import QTable
+from lib.formulas.q_learning import QLearning
+from lib.policies.EpsilonGreedyPolicy import EpsilonGreedyPolicy
+from lib.policies.GreedyPolicy import GreedyPolicy
+
+
+def test_greedy_policy_probabilities():
+    env = gym.make("Taxi-v3")
+    policy = GreedyPolicy(game_env=env, seed=42)  # type: ignore
+    values = np.eye(6)[[0, 5, 2]]
+    result = policy.probabilities(np.array([1, 2, 3]), values)
+    assert np.array_equal(result, np.eye(6)[[0, 5, 2]])
+    assert np.array_equal(policy.probabilities(1, np.eye(6)[4]), np.eye(6)[4])
+    with pytest.raises(ValueError):
+        policy.probabilities(1)
+
+
+def test_greedy_policy_probabilities_from_q_table():
+    env = gym.make("Taxi-v3")
+    data = QTable(500, 6, data=np.random.default_rng(1).normal(size=(500, 6)))
+    policy = GreedyPolicy(game_env=env, seed=42, data=data)  # type: ignore
+    states = np.arange(500)
+    result = policy.probabilities(states)
+    assert np.array_equal(result, np.eye(6)[data.values.argmax(axis=1)])
+    assert np.array_equal(policy.probabilities(7), result[7])
+
+
+def test_q_learning_binds_its_q_table():
+    env = gym.make("Taxi-v3")
+    policy = GreedyPolicy(game_env=env, seed=42)  # type: ignore
+    model = QLearning(observation_space=500, action_space=6, policy=policy)
+    assert policy.data is model.data
+    model.data = QTable(500, 6, data=np.eye(6)[np.zeros(500, dtype=int)])
+    assert policy.data is model.data
+    assert np.array_equal(policy.probabilities(3), np.eye(6)[0])
+
+
+def test_epsilon_greedy_policy_probabilities():
+    env = gym.make("Taxi-v3")
+    policy = EpsilonGreedyPolicy(game_env=env, epsilon=0.3, seed=42)  # type: ignore
+    result = policy.probabilities(np.array([0, 328]), np.eye(6)[[1, 3]])
+    assert np.allclose(result.sum(axis=1), 1.0)
+    assert np.isclose(result[0, 1], 0.7 + 0.3 / 6)
+    assert np.isclose(result[1, 0], 0.3 / 6)
+
+
+def test_epsilon_greedy_legal_policy_probabilities():
+    env = gym.make("Taxi-v3")
+    policy = EpsilonGreedyPolicy(  # type: ignore
+        game_env=env, legal=True, epsilon=0.3, seed=42,
+        data=QTable(500, 6, data=np.eye(6)[np.zeros(500, dtype=int)])
+    )
+    states = np.arange(500)
+    result = policy.probabilities(states)
+    assert np.allclose(result.sum(axis=1), 1.0)
+    masks = np.array([env.unwrapped.action_mask(s) for s in states])  # type: ignore
+    # Only the greedy action can be taken besides the legal ones
+    illegal = (masks == 0) & (np.arange(6) != 0)
+    assert np.all(result[illegal] == 0.0)
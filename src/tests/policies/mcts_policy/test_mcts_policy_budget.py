@@ -0,0 +1,91 @@
+import random
+import gymnasium as gym
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+
+
+def play(policy: MonteCarloPolicy, seed: int) -> list:
+    random.seed(seed)
+    policy.seed = seed
+    policy.reset_hyperparameters(reset_env=True)
+    trajectory = []
+    for _ in range(200):
+        result = policy.next_action()
+        trajectory.append((result.action, policy.game_env.state))
+        if result.game_status == GameStatus.TERMINATED:
+            return trajectory
+    assert False, "The passenger should be dropped off."
+
+
+def test_search_metrics_without_budget():
+    policy = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=4, seed=3, engine=Engine.TABLE  # type: ignore
+    )
+    policy.next_action()
+    metrics = policy.search_metrics
+    assert metrics is not None
+    assert metrics.interrupted is False
+    assert metrics.visited_node == policy.pick_tree.visited_node
+    assert 1 <= metrics.depth <= 4
+
+
+def test_large_budget_does_not_change_decisions():
+    for seed in range(1, 4):
+        unbounded = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=6, engine=Engine.TABLE  # type: ignore
+        )
+        bounded = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=6, engine=Engine.TABLE,  # type: ignore
+            node_budget=10**6
+        )
+        assert play(bounded, seed) == play(unbounded, seed)
+
+
+def test_node_budget_stops_at_last_complete_layer():
+    policy = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=30, seed=3, engine=Engine.TABLE,  # type: ignore
+        node_budget=50
+    )
+    policy.next_action()
+    metrics = policy.search_metrics
+    tree = policy.pick_tree
+    assert metrics is not None
+    if tree.winning is None:
+        assert metrics.interrupted is True
+        assert metrics.depth < 30
+        # The layer being searched when the budget ran out is abandoned
+        assert all(tree.store.depth[i] == metrics.depth for i in tree.deepest_layer)
+        assert 50 <= metrics.visited_node < 50 + len(tree.queue)
+
+
+def test_node_budget_plays_the_game():
+    for search in MonteCarloPolicy.Search:
+        policy = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=30, engine=Engine.TABLE,  # type: ignore
+            search=search, node_budget=200
+        )
+        play(policy, 7)
+        assert policy.search_metrics is not None
+        assert policy.search_metrics.visited_node < 200 + 6 * 200
+
+
+def test_node_budget_with_reused_tree_plays_the_game():
+    policy = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=30, engine=Engine.TABLE,  # type: ignore
+        reuse_tree=True, node_budget=200
+    )
+    play(policy, 7)
+
+
+def test_time_budget_interrupts_the_search():
+    policy = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=30, seed=3, engine=Engine.TABLE,  # type: ignore
+        time_budget=0.0
+    )
+    result = policy.next_action()
+    metrics = policy.search_metrics
+    assert metrics is not None
+    assert metrics.interrupted is True
+    assert metrics.depth == 1
+    assert result.game_status is GameStatus.RUNNING
@@ -0,0 +1,71 @@
+import random
+import gymnasium as gym
+from lib.data.decision_cache import DecisionCache
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+
+
+def play(policy: MonteCarloPolicy, seed: int) -> list:
+    random.seed(seed)
+    policy.seed = seed
+    policy.reset_hyperparameters(reset_env=True)
+    trajectory = []
+    for _ in range(100):
+        result = policy.next_action()
+        trajectory.append((result.action, result.reward, policy.game_env.state))
+        if result.game_status == GameStatus.TERMINATED:
+            return trajectory
+    assert False, "The passenger should be dropped off."
+
+
+def test_cached_decisions_are_replayed():
+    for search in MonteCarloPolicy.Search:
+        cache = DecisionCache(500)
+        policy = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=8, engine=Engine.TABLE,  # type: ignore
+            search=search, decision_cache=cache
+        )
+        first = play(policy, 3)
+        assert cache.hits == 0
+        assert cache.misses == len(first)
+        assert policy.search_metrics.cached is False  # type: ignore
+        assert play(policy, 3) == first
+        assert cache.hits == len(first)
+        assert policy.search_metrics.cached is True  # type: ignore
+
+
+def test_cache_is_shared_between_policies():
+    cache = DecisionCache(500)
+    uncached = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=8, engine=Engine.TABLE  # type: ignore
+    )
+    for seed in range(1, 6):
+        policy = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=8, engine=Engine.TABLE,  # type: ignore
+            decision_cache=cache
+        )
+        # The cache does not change the decisions of a first run
+        assert play(policy, seed) == play(uncached, seed)
+    misses = cache.misses
+    for seed in range(1, 6):
+        policy = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=8, engine=Engine.TABLE,  # type: ignore
+            decision_cache=cache
+        )
+        play(policy, seed)
+    assert cache.misses == misses
+
+
+def test_shallow_cached_search_does_not_loop():
+    # At depth 4 most decisions are tie-breaks, which are not cached
+    for search in MonteCarloPolicy.Search:
+        for reuse_tree in (False, True):
+            cache = DecisionCache(500)
+            policy = MonteCarloPolicy(
+                gym.make("Taxi-v3"), depth=4, engine=Engine.TABLE,  # type: ignore
+                search=search, reuse_tree=reuse_tree, decision_cache=cache
+            )
+            for seed in range(1, 16):
+                play(policy, seed)
+            assert cache.hits > 0
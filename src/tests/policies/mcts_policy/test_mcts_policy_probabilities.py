@@ -0,0 +1,66 @@
+import random
+import numpy as np
+import pytest
+import gymnasium as gym
+from lib.errors.GameAlreadyWonException import GameAlreadyWonException
+from lib.formulas.distillation import Distillation
+from lib.models.Engine import Engine
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+from lib.policies.MonteCarloTreeSearchPolicy import MonteCarloTreeSearchPolicy
+
+
+def test_mcts_policy_probabilities():
+    env = gym.make("Taxi-v3")
+    states = Distillation(env).reachable_states()[:60]  # type: ignore
+    for search in MonteCarloPolicy.Search:
+        policy = MonteCarloPolicy(
+            env, depth=2, seed=3, engine=Engine.TABLE, search=search  # type: ignore
+        )
+        result = policy.probabilities(states)
+        assert result.shape == (60, 6)
+        assert np.allclose(result.sum(axis=1), 1.0)
+        # Each decision is either taken or a tie-break between its actions
+        for row in result:
+            assert np.allclose(row[row > 0], row.max())
+        assert (result.max(axis=1) < 1.0).any()
+        assert np.array_equal(policy.probabilities(int(states[5])), result[5])
+
+
+def test_mcts_policy_probabilities_restore_the_search():
+    states = np.array([[1, 17], [328, 401]])
+    trajectories = []
+    for query in (False, True):
+        random.seed(2)
+        policy = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=6, seed=2, engine=Engine.TABLE  # type: ignore
+        )
+        policy.next_action()
+        if query:
+            assert policy.probabilities(states).shape == (2, 2, 6)
+        trajectories.append([
+            (policy.next_action().action, policy.game_env.state)
+            for _ in range(5)
+        ])
+    assert trajectories[0] == trajectories[1]
+
+
+def test_mcts_policy_probabilities_after_drop_off():
+    env = gym.make("Taxi-v3")
+    policy = MonteCarloPolicy(env, depth=2, seed=3, engine=Engine.TABLE)  # type: ignore
+    # Passenger at the destination, both at R
+    with pytest.raises(GameAlreadyWonException):
+        policy.probabilities(0)
+
+
+def test_monte_carlo_tree_search_policy_probabilities():
+    random.seed(1)
+    env = gym.make("Taxi-v3")
+    policy = MonteCarloTreeSearchPolicy(
+        env, iterations=50, rollout_depth=20, seed=1, engine=Engine.TABLE  # type: ignore
+    )
+    states = np.array([17, 328, 401])
+    result = policy.probabilities(states)
+    assert result.shape == (3, 6)
+    assert np.array_equal(result.sum(axis=1), np.ones(3))
+    assert set(np.unique(result)) <= {0.0, 1.0}
+    assert policy.probabilities(17).shape == (6,)
@@ -0,0 +1,62 @@
+import random
+import gymnasium as gym
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.models.Stage import Stage
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+
+
+def play(policy: MonteCarloPolicy, seed: int) -> list:
+    random.seed(seed)
+    policy.seed = seed
+    policy.reset_hyperparameters(reset_env=True)
+    trajectory = []
+    for _ in range(100):
+        result = policy.next_action()
+        trajectory.append((result.action, policy.game_env.state))
+        if result.game_status == GameStatus.TERMINATED:
+            return trajectory
+    assert False, "The passenger should be dropped off."
+
+
+def test_reuse_tree_keeps_explored_subtree():
+    policy = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=12, seed=3, engine=Engine.TABLE,  # type: ignore
+        reuse_tree=True
+    )
+    policy.next_action()
+    tree = policy.pick_tree
+    chosen = policy.current_node
+    explored = [child.state for child in chosen.children if child.state is not None]
+    policy.next_action()
+    assert policy.current_stage is Stage.PICK
+    assert policy.pick_tree is tree
+    assert tree.root_node.state == chosen.state
+    assert tree.root_node.parent is None
+    assert policy.current_node.parent == tree.root_node
+    assert policy.current_node.state in explored
+
+
+def test_reuse_tree_matches_fresh_tree_when_winning():
+    for seed in range(1, 11):
+        fresh = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=12, engine=Engine.TABLE  # type: ignore
+        )
+        reused = MonteCarloPolicy(
+            gym.make("Taxi-v3"), depth=12, engine=Engine.TABLE,  # type: ignore
+            reuse_tree=True
+        )
+        assert play(reused, seed) == play(fresh, seed)
+
+
+def test_reset_hyperparameters_keeps_game_environment():
+    policy = MonteCarloPolicy(
+        gym.make("Taxi-v3"), depth=4, seed=5, engine=Engine.TABLE  # type: ignore
+    )
+    game_env = policy.game_env
+    policy.next_action()
+    policy.reset_hyperparameters(reset_env=True)
+    assert policy.game_env is game_env
+    assert policy.current_stage is Stage.PICK
+    assert policy.current_node.state == game_env.initial_state
+    assert policy.pick_tree.root_node.state == policy.current_node.state
@@ -0,0 +1,48 @@
+import random
+import gymnasium as gym
+from lib.data.transposition_table import TranspositionTable
+from lib.environment.transition_table import TransitionTable
+from lib.models.Action import Action
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.policies.MonteCarloPolicy import MonteCarloPolicy
+
+
+def test_transposition_table_search_is_bounded_by_states():
+    env = gym.make("Taxi-v3")
+    table = TransitionTable.shared(env)
+    transposition_table = TranspositionTable(500)
+    actions = [a for a in Action if a is not Action.DROP_OFF]
+    transposition_table.search(
+        table, root_state=328, actions=actions, max_depth=50,
+        is_winning=lambda state: False
+    )
+    assert transposition_table.winning_state is None
+    assert transposition_table.visited_node <= 500 * len(actions)
+    assert transposition_table.depth[328] == 0
+    # Every taxi location is reached, the passenger being picked up or not
+    reached = transposition_table.depth >= 0
+    assert reached.sum() == 50
+
+
+def test_transposition_search_matches_tree_search_when_winning():
+    for seed in range(1, 11):
+        policies = [
+            MonteCarloPolicy(
+                gym.make("Taxi-v3"), depth=12, seed=seed,  # type: ignore
+                engine=Engine.TABLE, search=search
+            )
+            for search in MonteCarloPolicy.Search
+        ]
+        for _ in range(30):
+            random.seed(seed)
+            expected = policies[0].next_action()
+            result = policies[1].next_action()
+            assert result.action == expected.action
+            assert policies[1].game_env.state == policies[0].game_env.state
+            assert policies[1].current_stage == policies[0].current_stage
+            if expected.game_status == GameStatus.TERMINATED:
+                assert result.game_status == GameStatus.TERMINATED
+                break
+        else:
+            assert False, "The passenger should be dropped off."
@@ -0,0 +1,148 @@
+import gc
+import random
+import pytest
+import numpy as np
+import gymnasium as gym
+from lib.data.neural_network import Model
+from lib.formulas.dynamic_programming import DynamicProgramming
+from lib.formulas.monte_carlo_tree_seach import MonteCarloTreeSearchFormula
+from lib.models.Action import Action
+from lib.models.Engine import Engine
+from lib.models.GameStatus import GameStatus
+from lib.policies.MonteCarloTreeSearchPolicy import MonteCarloTreeSearchPolicy
+
+
+def test_uct_finds_winning_drop_off():
+    random.seed(1)
+    env = gym.make("Taxi-v3")
+    # Taxi on the passenger destination (0, 0) with the passenger inside
+    state = env.unwrapped.encode(0, 0, 4, 0)  # type: ignore
+    formula = MonteCarloTreeSearchFormula(env)  # type: ignore
+    metrics = formula.train(root_state=state, iterations=200)
+    assert formula.best_action() is Action.DROP_OFF
+    assert metrics.visited_node > 0
+    assert metrics.interrupted is False
+
+
+def test_root_statistics_count_every_iteration():
+    random.seed(2)
+    formula = MonteCarloTreeSearchFormula(gym.make("Taxi-v3"))  # type: ignore
+    formula.train(root_state=328, iterations=300)
+    statistics = formula.root_statistics()
+    assert statistics.shape == (6, 2)
+    assert statistics[:, 0].sum() == 300
+    assert np.all(statistics[formula.table.action_mask[328] == 0] == 0)
+
+
+def test_rollout_without_data_is_rejected():
+    with pytest.raises(ValueError):
+        MonteCarloTreeSearchFormula(
+            gym.make("Taxi-v3"),  # type: ignore
+            rollout=MonteCarloTreeSearchFormula.Rollout.VALUE
+        )
+
+
+def _optimal_steps(solver: DynamicProgramming, state: int) -> int:
+    table = solver.table
+    steps = 0
+    while True:
+        action = int(solver.data.values[state].argmax())
+        steps += 1
+        if table.terminated[state, action]:
+            return steps
+        state = int(table.next_state[state, action])
+
+
+def test_puct_with_q_table_prior_plays_optimally():
+    env = gym.make("Taxi-v3")
+    solver = DynamicProgramming(env, gamma=0.95)  # type: ignore
+    solver.value_iteration()
+    for seed in range(1, 6):
+        random.seed(seed)
+        policy = MonteCarloTreeSearchPolicy(
+            env, iterations=50, data=solver.data,  # type: ignore
+            rollout=MonteCarloTreeSearchFormula.Rollout.VALUE,
+            seed=seed, engine=Engine.TABLE
+        )
+        state = policy.game_env.state
+        steps = 0
+        while True:
+            result = policy.next_action()
+            steps += 1
+            if result.game_status is GameStatus.TERMINATED:
+                break
+        assert steps == _optimal_steps(solver, state)
+        assert policy.search_metrics is not None
+
+
+def test_greedy_rollout_with_model_prior():
+    random.seed(3)
+    env = gym.make("Taxi-v3")
+    model = Model(500, 6, 16)
+    policy = MonteCarloTreeSearchPolicy(
+        env, iterations=20, data=model,  # type: ignore
+        rollout=MonteCarloTreeSearchFormula.Rollout.GREEDY,
+        rollout_depth=5, seed=3, engine=Engine.TABLE
+    )
+    result = policy.next_action()
+    assert result.action in Action
+    assert policy.search_metrics.visited_node > 0  # type: ignore
+
+
+def test_merge_root_statistics():
+    first = np.array([[2, 1.0], [0, 0.0], [6, -1.0]])
+    second = np.array([[2, 3.0], [4, 0.5], [0, 0.0]])
+    merged = MonteCarloTreeSearchFormula.merge_root_statistics([first, second])
+    assert np.allclose(merged, [[4, 2.0], [4, 0.5], [6, -1.0]])
+    assert MonteCarloTreeSearchFormula.best_root_action(merged) is Action(2)
+    merged[2, 0] = 4
+    # Ties on visits are broken by the mean return
+    assert MonteCarloTreeSearchFormula.best_root_action(merged) is Action(0)
+
+
+def test_root_parallel_search_reuses_workers():
+    policy = MonteCarloTreeSearchPolicy(
+        gym.make("Taxi-v3"), iterations=30, workers=2,  # type: ignore
+        rollout_depth=20, seed=4, engine=Engine.TABLE
+    )
+    try:
+        policy.next_action()
+        pool = policy._pool
+        assert pool is not None
+        processes = [process.pid for process in pool._pool]  # type: ignore
+        assert policy.root_statistics[:, 0].sum() == 60  # type: ignore
+        policy.next_action()
+        assert policy._pool is pool
+        assert [process.pid for process in pool._pool] == processes  # type: ignore
+        assert policy.search_metrics.visited_node > 0  # type: ignore
+    finally:
+        policy.close()
+    assert policy._pool is None
+
+
+def test_root_parallel_search_is_seeded():
+    statistics = []
+    for _ in range(2):
+        with MonteCarloTreeSearchPolicy(
+            gym.make("Taxi-v3"), iterations=30, workers=2,  # type: ignore
+            rollout_depth=20, seed=4, engine=Engine.TABLE
+        ) as policy:
+            policy.next_action()
+            pool = policy._pool
+            assert pool is not None
+            statistics.append(policy.root_statistics)
+        assert policy._pool is None
+        assert all(not process.is_alive() for process in pool._pool)  # type: ignore
+    assert np.array_equal(statistics[0], statistics[1])
+
+
+def test_root_parallel_pool_closed_when_collected():
+    policy = MonteCarloTreeSearchPolicy(
+        gym.make("Taxi-v3"), iterations=30, workers=2,  # type: ignore
+        rollout_depth=20, seed=4, engine=Engine.TABLE
+    )
+    policy.next_action()
+    processes = list(policy._pool._pool)  # type: ignore
+    del policy
+    gc.collect()
+    assert all(not process.is_alive() for process in processes)
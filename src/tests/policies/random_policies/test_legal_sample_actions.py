@@ -33,3 +33,14 @@ def test_random_sample_policy_four_legal_actions():
     result = policy.possible_actions()
     expected = (Action.SOUTH, Action.NORTH, Action.EAST, Action.WEST)
     assert result == expected
+
+
+def test_legal_sample_policy_actions_follow_the_state():
+    env = gym.make("Taxi-v3")
+    policy = LegalSamplePolicy(game_env=env, seed=42)  # type: ignore
+    for _ in range(20):
+        policy.next_action()
+        state = policy.game_env.state
+        mask = env.unwrapped.action_mask(state)  # type: ignore
+        expected = tuple(action for action in Action if mask[action.value] == 1)
+        assert policy.possible_actions() == expected
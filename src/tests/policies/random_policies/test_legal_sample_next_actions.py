@@ -0,0 +1,27 @@
+import numpy as np
+import gymnasium as gym
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+from lib.policies.RandomSamplePolicy import RandomSamplePolicy
+
+
+def test_legal_sample_policy_next_actions_are_legal():
+    env = gym.make("Taxi-v3")
+    policy = LegalSamplePolicy(game_env=env, seed=42)  # type: ignore
+    masks = np.array([
+        [0, 0, 1, 1, 0, 1],
+        [1, 0, 0, 0, 0, 0],
+        [1, 1, 1, 1, 1, 1],
+    ] * 1000, dtype="int8")
+    result = policy.next_actions(np.zeros(len(masks), dtype=np.int64), masks)
+    assert (masks[np.arange(len(masks)), result] == 1).all()
+    assert set(result[0::3]) == {2, 3, 5}
+    assert set(result[1::3]) == {0}
+    assert set(result[2::3]) == {0, 1, 2, 3, 4, 5}
+
+
+def test_random_sample_policy_next_actions():
+    env = gym.make("Taxi-v3")
+    policy = RandomSamplePolicy(game_env=env, seed=42)  # type: ignore
+    result = policy.next_actions(np.zeros(1000, dtype=np.int64))
+    assert result.shape == (1000,)
+    assert set(result) == {0, 1, 2, 3, 4, 5}
@@ -0,0 +1,36 @@
+import numpy as np
+import gymnasium as gym
+from lib.models.Action import ActionProbabilities
+from lib.policies.LegalSamplePolicy import LegalSamplePolicy
+from lib.policies.RandomSamplePolicy import RandomSamplePolicy
+
+
+def test_random_sample_policy_probabilities():
+    env = gym.make("Taxi-v3")
+    policy = RandomSamplePolicy(game_env=env, seed=42)  # type: ignore
+    assert np.array_equal(policy.probabilities(3), np.full(6, 1/6))
+    result = policy.probabilities(np.arange(12).reshape(3, 4))
+    assert result.shape == (3, 4, 6)
+    assert np.allclose(result.sum(axis=-1), 1.0)
+
+
+def test_legal_sample_policy_probabilities():
+    env = gym.make("Taxi-v3")
+    policy = LegalSamplePolicy(game_env=env, seed=42)  # type: ignore
+    states = np.arange(500)
+    result = policy.probabilities(states)
+    assert result.shape == (500, 6)
+    for state in states:
+        mask = env.unwrapped.action_mask(state)  # type: ignore
+        assert np.array_equal(result[state], mask / mask.sum())
+        assert np.array_equal(policy.probabilities(state), result[state])
+
+
+def test_legal_sample_policy_actions_probability_is_derived():
+    env = gym.make("Taxi-v3")
+    policy = LegalSamplePolicy(game_env=env, seed=42)  # type: ignore
+    for _ in range(10):
+        policy.next_action()
+        assert policy.actions_probability() == ActionProbabilities.from_array(
+            policy.probabilities(policy.game_env.state)
+        )